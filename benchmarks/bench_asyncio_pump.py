@@ -0,0 +1,89 @@
+# benchmarks/bench_asyncio_pump.py
+#
+# Integração asyncio ↔ frame: uma iteração do loop por frame (esquema antigo)
+# × AsyncioPump com orçamento. Cada frame simula trabalho de render e depois
+# roda o TaskManager; mede a latência de ponta a ponta dos jobs de geração, o
+# RTT de requisições simples e o jitter do tempo de frame.
+#
+#   FAKE_LATENCY=fixed:1 FAKE_WORKERS=64 uvicorn fake_server.test_endpoint:app --port 8000
+#   python -m benchmarks.bench_asyncio_pump [--jobs 32] [--frame-ms 10]
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+import aiohttp
+from direct.task.TaskManagerGlobal import taskMgr
+
+from config.settings import DEFAULT_API_URL
+from core.asyncio_pump import AsyncioPump
+from fake_server.load_test import percentile
+from prompt.scheduler import GenerationScheduler
+
+
+def busy_wait(ms: float) -> None:
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+async def probe_rtt(url: str, rtts: list[float], stop: asyncio.Event) -> None:
+    async with aiohttp.ClientSession() as session:
+        while not stop.is_set():
+            start = time.perf_counter()
+            async with session.get(f"{url}/stats") as resp:
+                await resp.read()
+            rtts.append(time.perf_counter() - start)
+
+
+async def submit_jobs(scheduler: GenerationScheduler, jobs: int, tag: str) -> list[float]:
+    async def one(i: int) -> float:
+        start = time.perf_counter()
+        await scheduler.submit(f"{tag} {i}").wait()
+        return time.perf_counter() - start
+    return await asyncio.gather(*(one(i) for i in range(jobs)))
+
+
+def run(mode: str, url: str, jobs: int, frame_ms: float) -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    app = SimpleNamespace(taskMgr=taskMgr)
+    if mode == "antigo":
+        pump = AsyncioPump(app, loop, budget_ms=0, max_iterations=1)
+    else:
+        pump = AsyncioPump(app, loop, budget_ms=4.0)
+
+    scheduler = GenerationScheduler(url, max_in_flight=jobs)
+    stop, rtts = asyncio.Event(), []
+    probe = loop.create_task(probe_rtt(url, rtts, stop))
+    work = loop.create_task(submit_jobs(scheduler, jobs, f"{mode} {time.time()}"))
+
+    frames = []
+    while not work.done():
+        start = time.perf_counter()
+        busy_wait(frame_ms)                 # "render" do frame
+        taskMgr.step()
+        frames.append((time.perf_counter() - start) * 1000)
+
+    stop.set()
+    latencies = work.result()
+    loop.run_until_complete(asyncio.gather(probe, scheduler.close(), return_exceptions=True))
+    taskMgr.remove(pump.task)
+    loop.close()
+
+    print(f"{mode:8s} | jobs p50 {percentile(latencies, 50):5.2f}s p99 {percentile(latencies, 99):5.2f}s | "
+          f"RTT p50 {percentile(rtts, 50) * 1000:6.1f}ms p99 {percentile(rtts, 99) * 1000:6.1f}ms | "
+          f"frame p50 {percentile(frames, 50):5.1f}ms p99 {percentile(frames, 99):5.1f}ms "
+          f"σ {statistics.pstdev(frames):4.2f}ms | {pump.stats()['iterations_per_frame']:.1f} it/frame")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=DEFAULT_API_URL)
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--frame-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    for mode in ("antigo", "orçamento"):
+        run(mode, args.url, args.jobs, args.frame_ms)
@@ -0,0 +1,113 @@
+# benchmarks/bench_instancing.py
+#
+# Decoração com um nó por cópia (esquema antigo de `_scatter_decor`) ×
+# InstancedProps, com 1000+ cópias dos mesmos modelos espalhadas numa grade de
+# salas, todas no campo de visão. Mede Geoms enviados por frame (chamadas de
+# desenho), tempo de cull + draw e tempo de frame. Roda offscreen.
+#
+#   python -m benchmarks.bench_instancing [--count 1200] [--frames 60] [--lowpoly]
+#
+# --lowpoly usa um cubo no lugar dos .obj: isola o custo por chamada de desenho
+# do custo de vértices (num renderizador de software os vértices dominam).
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+from panda3d.core import loadPrcFileData
+
+ROOM = 20.0
+ROOMS_PER_SIDE = 8
+
+
+def placements(count: int, models: list[str]) -> list[tuple[str, tuple, float, float]]:
+    rng = random.Random(0)
+    out = []
+    for i in range(count):
+        room = i % (ROOMS_PER_SIDE * ROOMS_PER_SIDE)
+        rx, ry = room % ROOMS_PER_SIDE, room // ROOMS_PER_SIDE
+        pos = (rx * ROOM + rng.uniform(-8, 8), ry * ROOM + rng.uniform(-8, 8), 0.2)
+        out.append((rng.choice(models), pos, rng.uniform(2.2, 3.2), rng.uniform(0, 360)))
+    return out
+
+
+def run(mode: str, count: int, frames: int, models: list[str]) -> dict:
+    from direct.showbase.ShowBase import ShowBase
+    from panda3d.core import SceneGraphAnalyzer
+
+    from core.async_loader import AsyncModelLoader
+    from core.instancing import InstancedProps
+    from core.load_wrapper import load_model_with_default_material
+
+    base = ShowBase()
+    base.async_loader = AsyncModelLoader(base)
+    base.disableMouse()
+    center = ROOM * (ROOMS_PER_SIDE - 1) / 2
+    base.camera.setPos(center, -ROOM * 4, ROOM * 6)
+    base.camera.lookAt(center, center, 0)
+    base.camLens.setFar(2000)
+
+    items = placements(count, models)
+    rooms = [base.render.attachNewNode(f"Room-{i}") for i in range(ROOMS_PER_SIDE ** 2)]
+
+    if mode == "nodes":
+        # Um modelo carregado por cópia, como o `_place_decor` antigo
+        for k, (path, pos, scale, heading) in enumerate(items):
+            model = load_model_with_default_material(base.loader, path)
+            model.setPos(*pos)
+            model.setScale(scale)
+            model.setH(heading)
+            model.reparentTo(rooms[k % len(rooms)])
+    else:
+        props = InstancedProps(base)
+        for k, (path, pos, scale, heading) in enumerate(items):
+            props.place(rooms[k % len(rooms)], path, pos, scale, heading, group=k % len(rooms))
+        while base.async_loader.pending:
+            base.taskMgr.step()
+
+    for _ in range(5):                       # aquece: texturas, shaders, buffers na GPU
+        base.taskMgr.step()
+
+    analyzer = SceneGraphAnalyzer()
+    analyzer.addNode(base.render.node())
+    geoms = analyzer.getNumGeoms()
+
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        base.taskMgr.step()                     # igLoop: cull + draw do frame
+        times.append((time.perf_counter() - start) * 1000)
+
+    base.destroy()
+    return {"mode": mode, "geoms": geoms, "frame_ms": statistics.median(times),
+            "frame_ms_max": max(times), "fps": 1000 / statistics.median(times)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1200)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--mode", choices=("nodes", "instanced", "both"), default="both")
+    parser.add_argument("--lowpoly", action="store_true")
+    args = parser.parse_args()
+
+    loadPrcFileData("", "window-type offscreen")
+    loadPrcFileData("", "audio-library-name null")
+    loadPrcFileData("", "sync-video false")
+
+    models = (["models/misc/rgbCube"] if args.lowpoly
+              else sorted(str(p) for p in Path("assets/models/objects").glob("*.obj")))
+
+    modes = ("nodes", "instanced") if args.mode == "both" else (args.mode,)
+    results = [run(mode, args.count, args.frames, models) for mode in modes]
+
+    print(f"\n{args.count} cópias de {len(models)} modelo(s), {args.frames} frames")
+    print(f"{'modo':>10s} {'geoms/frame':>12s} {'frame p50':>10s} {'frame máx':>10s} {'fps':>7s}")
+    for r in results:
+        print(f"{r['mode']:>10s} {r['geoms']:12d} {r['frame_ms']:8.2f}ms {r['frame_ms_max']:8.2f}ms {r['fps']:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_mesh_transport.py
+#
+# Compara OBJ texto × .pjm (cru e zlib): bytes trafegados e tempo até ter um
+# nó renderizável (OBJ pelo loader do Panda3D; .pjm por decode + memoryview).
+#
+#   python -m benchmarks.bench_mesh_transport [arquivos.obj ...]
+
+import sys
+import tempfile
+import time
+from glob import glob
+from pathlib import Path
+
+from panda3d.core import Filename, Loader, LoaderOptions, NodePath
+
+from core.geom_builder import build_geom_node
+from core.mesh_codec import decode_mesh, encode_mesh
+from core.mesh_processing import read_obj
+
+REPEAT = 3
+
+
+def best_of(fn, repeat: int = REPEAT) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def load_obj_with_panda(path: Path) -> NodePath:
+    options = LoaderOptions(LoaderOptions.LF_no_cache | LoaderOptions.LF_report_errors)
+    return NodePath(Loader.getGlobalPtr().loadSync(Filename.fromOsSpecific(str(path)), options))
+
+
+def main(paths: list[str]) -> None:
+    print(f"{'malha':24s} {'tris':>8s} | {'obj KB':>8s} {'pjm KB':>8s} {'pjmz KB':>8s} | "
+          f"{'obj ms':>8s} {'pjm ms':>8s} {'pjmz ms':>8s}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for p in map(Path, paths):
+            positions, colors, faces = read_obj(p)
+            raw = encode_mesh(positions, faces, colors, compress=False)
+            packed = encode_mesh(positions, faces, colors, compress=True)
+            raw_path, packed_path = Path(tmp) / "m.pjm", Path(tmp) / "mz.pjm"
+            raw_path.write_bytes(raw)
+            packed_path.write_bytes(packed)
+
+            t_obj = best_of(lambda: load_obj_with_panda(p))
+            t_raw = best_of(lambda: build_geom_node(decode_mesh(raw_path.read_bytes())))
+            t_packed = best_of(lambda: build_geom_node(decode_mesh(packed_path.read_bytes())))
+
+            print(f"{p.name[:24]:24s} {len(faces):8d} | {p.stat().st_size / 1024:8.0f} "
+                  f"{len(raw) / 1024:8.0f} {len(packed) / 1024:8.0f} | "
+                  f"{t_obj:8.1f} {t_raw:8.1f} {t_packed:8.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or sorted(glob("assets/models/objects/*.obj")))
@@ -0,0 +1,127 @@
+# benchmarks/bench_npc_system.py
+#
+# Custo por frame das atualizações de NPC: duas tasks por NPC (respiração +
+# balão, o esquema antigo) × NPCSystem + SpatialRegistry, com 10, 100 e 1000 NPCs.
+# Também compara a busca do NPC alvo de um prompt: varredura linear × grade.
+# Roda sem janela: só o TaskManager e um grafo de cena.
+#
+#   python -m benchmarks.bench_npc_system [--counts 10 100 1000] [--frames 300]
+
+import argparse
+import random
+import time
+from math import sin
+from types import SimpleNamespace
+
+from direct.showbase.MessengerGlobal import messenger
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+from panda3d.core import NodePath, Point3
+
+from core.spatial import SpatialRegistry
+from npc.npc_system import NPCSystem
+
+QUERIES = 2000
+
+
+def make_scene(count: int) -> tuple[SimpleNamespace, list[tuple[NodePath, NodePath, NodePath]]]:
+    render = NodePath("render")
+    player = render.attachNewNode("player")
+    app = SimpleNamespace(render=render, taskMgr=taskMgr, messenger=messenger,
+                          player_controller=SimpleNamespace(node=player))
+
+    rng = random.Random(0)
+    npcs = []
+    for _ in range(count):
+        npc = render.attachNewNode("npc")
+        npc.setPos(rng.uniform(-200, 200), rng.uniform(-200, 200), 0)
+        model = npc.attachNewNode("model_node")
+        speech = npc.attachNewNode("speech_node")
+        speech.hide()
+        npcs.append((npc, model, speech))
+    return app, npcs
+
+
+def add_legacy_tasks(app, npcs) -> None:
+    """Cópia das tasks que o NPCManager registrava por NPC."""
+    for npc, model, speech in npcs:
+        def breathing_task(task, node=model, npc_scale=3.0):
+            node.setScale(npc_scale + 0.01 * npc_scale * sin(task.time * 2))
+            return Task.cont
+
+        def update_speech(task, npc=npc, node=speech):
+            player_node = app.player_controller.node
+            distance = (npc.getPos(app.render) - player_node.getPos(app.render)).length()
+            node.show() if distance < 10.0 else node.hide()
+            return Task.cont
+
+        taskMgr.add(breathing_task, f"breathing-task-{id(npc)}")
+        taskMgr.add(update_speech, f"text-follow-{id(npc)}")
+
+
+def add_system(app, npcs) -> NPCSystem:
+    app.spatial = SpatialRegistry(app)
+    system = NPCSystem(app, speech_distance=10.0)
+    for npc, model, speech in npcs:
+        system.register(npc, speech)
+        system.set_model(npc, model, 3.0)
+        app.spatial.add(npc, "npc")
+    return system
+
+
+def time_target_lookup(app, npcs, radius: float = 5.0) -> tuple[float, float]:
+    """µs por busca de NPCs a até `radius` de um ponto: lista inteira × grade."""
+    rng = random.Random(1)
+    points = [Point3(rng.uniform(-200, 200), rng.uniform(-200, 200), 0) for _ in range(QUERIES)]
+
+    start = time.perf_counter()
+    for p in points:
+        [npc for npc, _, _ in npcs if (npc.getPos(app.render).getXy() - p.getXy()).length() <= radius]
+    linear = (time.perf_counter() - start) / QUERIES * 1e6
+
+    start = time.perf_counter()
+    for p in points:
+        app.spatial.query_radius(p, radius, kind="npc")
+    grid = (time.perf_counter() - start) / QUERIES * 1e6
+    return linear, grid
+
+
+def run_frames(app, frames: int) -> float:
+    """ms médios por frame, com o jogador andando em círculo pela cena."""
+    player = app.player_controller.node
+    taskMgr.step()      # aquecimento (posições iniciais, primeiras trocas)
+    start = time.perf_counter()
+    for i in range(frames):
+        player.setPos(100 * sin(i * 0.01), 100 * sin(i * 0.013 + 1), 0)
+        taskMgr.step()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main(counts: list[int], frames: int) -> None:
+    print(f"{'NPCs':>6s} | {'tasks/NPC ms':>12s} {'NPCSystem ms':>12s} {'ganho':>6s} | "
+          f"{'linear µs':>10s} {'grade µs':>10s}")
+    for count in counts:
+        app, npcs = make_scene(count)
+        add_legacy_tasks(app, npcs)
+        legacy = run_frames(app, frames)
+        taskMgr.removeTasksMatching("breathing-task-*")
+        taskMgr.removeTasksMatching("text-follow-*")
+
+        app, npcs = make_scene(count)
+        system = add_system(app, npcs)
+        central = run_frames(app, frames)
+        linear, grid = time_target_lookup(app, npcs)
+        taskMgr.remove(system.task)
+        taskMgr.remove(app.spatial.task)
+        system.ignoreAll()
+
+        print(f"{count:6d} | {legacy:12.3f} {central:12.3f} {legacy / central:5.1f}x | "
+              f"{linear:10.1f} {grid:10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    main(args.counts, args.frames)
@@ -0,0 +1,108 @@
+# benchmarks/bench_obj_parser.py
+#
+# Parser NumPy (core.obj_parser + geom_builder) × loader de OBJ do Panda3D
+# em malhas sintéticas com cor por vértice de 10k a 1M triângulos. Antes de
+# cronometrar, confere o parser num OBJ pequeno com os casos chatos da sintaxe.
+#
+#   python -m benchmarks.bench_obj_parser [--sizes 10000 100000 1000000]
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from panda3d.core import Filename, Loader, LoaderOptions, NodePath
+
+from core import geom_builder
+from core.mesh_processing import write_obj
+from core.obj_parser import parse_obj
+
+EDGE_CASES = b"""# quad com comentarios no meio e no fim das linhas
+v 0 0 0   # origem
+v 1 0 0
+v 1 1 0 1 0 0
+v 0 1 0
+vt 0 0
+vn 0 0 1
+f 1/1/1 2/1/1 3/1/1 4/1/1  # quad -> 2 triangulos
+f -4 -3 -2 # indices negativos
+"""
+NO_FACES = b"v 0 0 0\nv 1 0 0\nv 1 1 0\n"
+BAD_INDEX = b"v 0 0 0\nv 1 0 0\nv 1 1 0\nf 1 2 9\n"
+
+
+def make_grid_obj(path: Path, triangles: int) -> None:
+    """Grade n×n ondulada com cor por vértice: 2·(n-1)² triângulos."""
+    n = int(np.sqrt(triangles / 2)) + 1
+    xs, ys = np.meshgrid(np.linspace(-1, 1, n), np.linspace(-1, 1, n))
+    zs = 0.1 * np.sin(xs * 6) * np.cos(ys * 6)
+    positions = np.stack([xs, ys, zs], axis=-1).reshape(-1, 3).astype(np.float32)
+    colors = (positions * 0.5 + 0.5).clip(0, 1)
+
+    idx = np.arange(n * n).reshape(n, n)
+    a, b, c, d = idx[:-1, :-1], idx[:-1, 1:], idx[1:, :-1], idx[1:, 1:]
+    faces = np.concatenate([np.stack([a, b, d], -1).reshape(-1, 3),
+                            np.stack([a, d, c], -1).reshape(-1, 3)])
+    write_obj(path, positions, colors, faces)
+
+
+def time_panda(path: Path) -> float:
+    options = LoaderOptions(LoaderOptions.LF_no_cache | LoaderOptions.LF_report_errors)
+    start = time.perf_counter()
+    NodePath(Loader.getGlobalPtr().loadSync(Filename.fromOsSpecific(str(path)), options))
+    return time.perf_counter() - start
+
+
+def time_numpy(path: Path) -> float:
+    geom_builder._obj_cache.clear()
+    start = time.perf_counter()
+    geom_builder.load_obj_fast(path)
+    return time.perf_counter() - start
+
+
+def check_edge_cases(tmp: str) -> None:
+    path = Path(tmp) / "edge_cases.obj"
+    path.write_bytes(EDGE_CASES)
+    mesh = parse_obj(path)
+    assert mesh.positions.shape == (4, 3), mesh.positions
+    assert mesh.faces.tolist() == [[0, 1, 2], [0, 2, 3], [0, 1, 2]], mesh.faces
+
+    # Sem faces (e vazio): malha sem triângulos, não exceção no Geom
+    for name, data in (("no_faces.obj", NO_FACES), ("empty.obj", b"")):
+        path = Path(tmp) / name
+        path.write_bytes(data)
+        node = geom_builder.load_obj_fast(path)
+        assert node.node().getGeom(0).getPrimitive(0).getNumVertices() == 0, name
+
+    path = Path(tmp) / "bad_index.obj"
+    path.write_bytes(BAD_INDEX)
+    try:
+        parse_obj(path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("índice de face fora do intervalo passou sem erro")
+    print("✅ [OBJ] Casos de borda: comentários no fim da linha, quads, v/vt/vn, índices negativos, "
+          "OBJ sem faces ou vazio, índice fora do intervalo")
+
+
+def main(sizes: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        check_edge_cases(tmp)
+
+    print(f"{'tris':>9s} {'MB':>7s} | {'panda s':>8s} {'numpy s':>8s} {'ganho':>6s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = Path(tmp) / f"grid_{size}.obj"
+            make_grid_obj(path, size)
+            t_panda = min(time_panda(path) for _ in range(2))
+            t_numpy = min(time_numpy(path) for _ in range(2))
+            print(f"{size:9d} {path.stat().st_size / 2**20:7.1f} | {t_panda:8.3f} {t_numpy:8.3f} "
+                  f"{t_panda / t_numpy:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    main(parser.parse_args().sizes)
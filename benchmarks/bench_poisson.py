@@ -0,0 +1,65 @@
+# benchmarks/bench_poisson.py
+#
+# Espalhar decoração numa sala: rejeição com 10 tentativas por peça, cada
+# candidato comparado com todas as já colocadas (esquema antigo de
+# `_scatter_decor`) × Poisson-disk com grade (core/poisson.py). Para cada
+# distância mínima mede quantas peças couberam e peças por milissegundo; a
+# rejeição recebe como meta a mesma quantidade que o Poisson-disk conseguiu.
+#
+#   python -m benchmarks.bench_poisson [--size 17] [--repeat 20]
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+from core.poisson import Capsule, Circle, poisson_disk
+
+SPACINGS = (4.5, 3.0, 2.0, 1.5, 1.0, .75, .5)
+
+
+def rejection(rng: random.Random, half: float, spacing: float, target: int, keep_out) -> list[tuple[float, float]]:
+    placed: list[tuple[float, float]] = []
+    for _ in range(target):
+        for _attempt in range(10):
+            x, y = rng.uniform(-half, half), rng.uniform(-half, half)
+            if any(shape.contains(x, y) for shape in keep_out):
+                continue
+            if all(math.hypot(x - px, y - py) >= spacing for px, py in placed):
+                placed.append((x, y))
+                break
+    return placed
+
+
+def timed(fn, repeat: int) -> tuple[float, int]:
+    times, count = [], 0
+    for seed in range(repeat):
+        start = time.perf_counter()
+        count = len(fn(random.Random(seed)))
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=float, default=17.0, help="lado da área livre da sala")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    half = args.size / 2
+    # corredor norte → centro → sul e um NPC, como numa sala do jogo
+    keep_out = [Circle(0, 0, 2), Capsule(0, 10, 0, 0, 2), Capsule(0, -10, 0, 0, 2), Circle(3.5, 6.5, 2.5)]
+
+    print(f"área {args.size:.0f}×{args.size:.0f}, mediana de {args.repeat} sementes")
+    print(f"{'espaço':>7s} │ {'poisson':>8s} {'ms':>8s} {'peças/ms':>9s} │ {'rejeição':>8s} {'ms':>8s} {'peças/ms':>9s}")
+    for spacing in SPACINGS:
+        bounds = (-half, -half, half, half)
+        p_ms, p_count = timed(lambda rng: poisson_disk(rng, bounds, spacing, keep_out=keep_out), args.repeat)
+        r_ms, r_count = timed(lambda rng: rejection(rng, half, spacing, p_count, keep_out), args.repeat)
+        print(f"{spacing:7.2f} │ {p_count:8d} {p_ms:8.2f} {p_count / p_ms:9.1f} │ "
+              f"{r_count:8d} {r_ms:8.2f} {r_count / r_ms:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
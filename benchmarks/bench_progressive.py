@@ -0,0 +1,70 @@
+# benchmarks/bench_progressive.py
+#
+# Tempo até a primeira geometria visível: prévia grosseira (exibição progressiva)
+# × fluxo antigo (esperar a malha final). Precisa do fake_server rodando:
+#
+#   FAKE_LATENCY=fixed:3 uvicorn fake_server.test_endpoint:app --port 8000
+#   python -m benchmarks.bench_progressive [--jobs 5]
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from config.settings import DEFAULT_API_URL
+from core.geom_builder import load_obj_fast, load_pjm
+from core.mesh_codec import SUFFIX
+from prompt.scheduler import GenerationScheduler
+
+
+def build_node(path: str):
+    return load_pjm(path) if Path(path).suffix == SUFFIX else load_obj_fast(path)
+
+
+async def measure(scheduler: GenerationScheduler, prompt: str) -> tuple[float | None, float | None]:
+    """Segundos desde o submit até ter o nó da prévia e o nó final montados."""
+    start = time.perf_counter()
+    ticket = scheduler.submit(prompt)
+    preview_at = None
+
+    waiter = asyncio.ensure_future(ticket.wait())
+    while not waiter.done():
+        if preview_at is None and ticket.job.preview_path:
+            build_node(ticket.job.preview_path)
+            preview_at = time.perf_counter() - start
+        await asyncio.sleep(0.01)
+
+    path = waiter.result()
+    if not path:
+        return preview_at, None
+    build_node(path)
+    return preview_at, time.perf_counter() - start
+
+
+async def main(api_url: str, jobs: int) -> None:
+    scheduler = GenerationScheduler(api_url, max_in_flight=1)
+    previews, finals = [], []
+    try:
+        for i in range(jobs):
+            preview, final = await measure(scheduler, f"objeto de teste {i}")
+            fmt = lambda t: f"{t:.2f}s" if t is not None else "-"
+            print(f"job {i}: prévia {fmt(preview)}, final {fmt(final)}")
+            if preview is not None:
+                previews.append(preview)
+            if final is not None:
+                finals.append(final)
+    finally:
+        await scheduler.close()
+
+    if finals:
+        print(f"\nprimeira geometria (fluxo antigo, só a final): {sum(finals) / len(finals):.2f}s")
+    if previews:
+        print(f"primeira geometria (prévia progressiva):       {sum(previews) / len(previews):.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=DEFAULT_API_URL)
+    parser.add_argument("--jobs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.jobs))
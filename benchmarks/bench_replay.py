@@ -0,0 +1,136 @@
+# benchmarks/bench_replay.py
+#
+# Reproduz uma sessão gravada (PROJETAO_RECORD) num Game offscreen, contra o
+# fake_server e com semente fixa, e mede:
+#   • tempo de frame (p50/p90/p99/máx);
+#   • tempo de montagem de cada sala;
+#   • tempo do prompt até a porta abrir.
+#
+#   python -m benchmarks.bench_replay sessao.jsonl [--out run.json] [--baseline anterior.json]
+#
+# Sobe o fake_server (uvicorn) sozinho, a menos que --no-server seja passado.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from panda3d.core import Filename, loadPrcFileData
+
+from fake_server.load_test import percentile
+from core.replay import ReplayDriver, load_session
+
+SERVER_PORT = 8000
+ROOT = Path(__file__).resolve().parent.parent      # "assets/..." é relativo à raiz, não a benchmarks/
+
+
+def start_server(seed: int, latency: str) -> subprocess.Popen:
+    env = {**os.environ, "FAKE_SEED": str(seed), "FAKE_LATENCY": latency}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "fake_server.test_endpoint:app",
+         "--port", str(SERVER_PORT), "--log-level", "warning"],
+        env=env,
+    )
+    time.sleep(2.0)
+    return proc
+
+
+def run_replay(events: list[dict], seed: int, tail: float) -> dict:
+    os.environ["PROJETAO_SEED"] = str(seed)
+    loadPrcFileData("", "window-type offscreen")
+    loadPrcFileData("", "audio-library-name null")
+    loadPrcFileData("", "sync-video false")
+    loadPrcFileData("", f"model-path {Filename.fromOsSpecific(str(ROOT)).getFullpath()}")
+
+    from main import Game       # depois do PRC: a janela nasce offscreen
+    game = Game()
+    driver = ReplayDriver(game, events, tail=tail)
+
+    prompts: list[float] = []
+    doors: list[tuple[str, float]] = []
+    game.accept("prompt-submitted", lambda text: prompts.append(driver.elapsed()))
+    game.accept("door-opened", lambda name: doors.append((name, driver.elapsed())))
+
+    frames = []
+    last = time.perf_counter()
+    while not driver.finished:
+        game.taskMgr.step()
+        now = time.perf_counter()
+        frames.append((now - last) * 1000)
+        last = now
+
+    # Porta aberta ↔ último prompt enviado antes dela
+    door_times = []
+    for name, t in doors:
+        before = [p for p in prompts if p <= t]
+        if before:
+            door_times.append({"door": name, "seconds": t - before[-1]})
+
+    result = {
+        "seed": seed,
+        "frames": len(frames),
+        "frame_ms": {f"p{p}": percentile(frames[1:], p) for p in (50, 90, 99)},
+        "frame_ms_max": max(frames[1:], default=0.0),
+        "room_build_ms": [t * 1000 for t in game.scene_manager.build_times],
+        "time_to_door_open_s": door_times,
+    }
+    game.mesh_processor.shutdown()
+    game.destroy()
+    return result
+
+
+def print_result(result: dict, baseline: dict | None) -> None:
+    def delta(key: str, value: float, ref: float | None) -> str:
+        return f"  ({value - ref:+.2f})" if ref is not None else ""
+
+    print(f"\nframes: {result['frames']}")
+    for key, value in result["frame_ms"].items():
+        ref = baseline["frame_ms"].get(key) if baseline else None
+        print(f"  frame {key}: {value:7.2f} ms{delta(key, value, ref)}")
+    ref = baseline["frame_ms_max"] if baseline else None
+    print(f"  frame máx: {result['frame_ms_max']:7.2f} ms{delta('max', result['frame_ms_max'], ref)}")
+
+    builds = result["room_build_ms"]
+    if builds:
+        mean = sum(builds) / len(builds)
+        ref = sum(baseline["room_build_ms"]) / len(baseline["room_build_ms"]) if baseline and baseline["room_build_ms"] else None
+        print(f"salas: {len(builds)}, média {mean:.1f} ms, máx {max(builds):.1f} ms{delta('build', mean, ref)}")
+
+    for entry in result["time_to_door_open_s"]:
+        print(f"porta {entry['door']}: {entry['seconds']:.2f} s após o prompt")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("session")
+    parser.add_argument("--seed", type=int, help="padrão: a semente gravada na sessão")
+    parser.add_argument("--latency", default="fixed:3", help="FAKE_LATENCY do fake_server")
+    parser.add_argument("--tail", type=float, default=5.0, help="segundos após o último evento")
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--no-server", action="store_true")
+    args = parser.parse_args()
+
+    meta, events = load_session(args.session)
+    seed = args.seed if args.seed is not None else (meta.get("seed") or 0)
+
+    server = None if args.no_server else start_server(seed, args.latency)
+    try:
+        result = run_replay(events, seed, args.tail)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_result(result, baseline)
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1), encoding="utf-8")
+        print(f"\n💾 resultado em {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# benchmarks/bench_room_shell.py
+#
+# Montagem da casca de uma sala (chão, teto, 3 paredes sólidas e 1 com porta):
+# um rgbCube escalado por peça + CardMaker + TexGen (esquema antigo de
+# SceneManager) × RoomShellBuilder, que escreve tudo num GeomNode a partir dos
+# gabaritos NumPy. Só a parte visual: os colisores são os mesmos nos dois casos.
+# Também conta nós e Geoms por sala, e o tempo de cull de um frame com N salas.
+#
+#   python -m benchmarks.bench_room_shell [--rooms 200]
+
+import argparse
+import statistics
+import time
+from glob import glob
+
+from panda3d.core import loadPrcFileData
+
+from core.room_geometry import RoomShellBuilder
+
+CELL, WALL_LEN, WALL_ALT, WALL_THK, DOOR_W = 20, 10, 5, 2, 2
+DIRS = ("north", "south", "east", "west")
+
+
+def wall_pieces(door_dir: str) -> list[tuple[tuple, tuple]]:
+    """(centro, tamanho) de cada bloco de parede, como em SceneManager."""
+    pieces = []
+    frame_half = WALL_LEN - DOOR_W / 2
+    for d in DIRS:
+        offset = WALL_LEN + WALL_THK / 2
+        center = {"north": (0, offset), "south": (0, -offset), "east": (offset, 0), "west": (-offset, 0)}[d]
+        horizontal = d in ("north", "south")
+        if d != door_dir:
+            size = (CELL, WALL_THK, WALL_ALT) if horizontal else (WALL_THK, CELL, WALL_ALT)
+            pieces.append(((*center, WALL_ALT / 2), size))
+            continue
+        for side in (-1, 1):
+            along = side * (WALL_LEN - frame_half / 2)
+            if horizontal:
+                pieces.append(((along, center[1], WALL_ALT / 2), (frame_half, WALL_THK, WALL_ALT + .5)))
+            else:
+                pieces.append(((center[0], along, WALL_ALT / 2), (WALL_THK, frame_half, WALL_ALT + .5)))
+    return pieces
+
+
+def build_legacy(base, room, textures: dict[str, str]) -> None:
+    from panda3d.core import CardMaker, LMatrix4f, LVecBase3f, TexGenAttrib, TextureStage, TransformState
+
+    def apply_texture(node, path):
+        node.setColor(1, 1, 1, 1)
+        ts = TextureStage.getDefault()
+        node.setTexture(ts, base.loader.loadTexture(path))
+        node.setTexGen(ts, TexGenAttrib.MWorldPosition)
+        matrix = LMatrix4f.rotateMat(90, LVecBase3f(0, 0, 1)) * LMatrix4f.scaleMat(.2, .4, 1)
+        node.setTexTransform(ts, TransformState.makeMat(matrix))
+
+    for name, z, p in (("floor", 0, -90), ("ceiling", WALL_ALT, 90)):
+        cm = CardMaker(name)
+        cm.setFrame(-WALL_LEN, WALL_LEN, -WALL_LEN, WALL_LEN)
+        card = room.attachNewNode(cm.generate())
+        card.setPos(0, 0, z)
+        card.setHpr(0, p, 0)
+        apply_texture(card, textures[name])
+
+    for center, size in wall_pieces("north"):
+        piece = base.loader.loadModel("models/misc/rgbCube")
+        piece.setScale(*size)
+        piece.setPos(*center)
+        apply_texture(piece, textures["wall"])
+        piece.reparentTo(room)
+        piece.setTexScale(TextureStage.getDefault(), 1, 1)
+
+
+def build_shell(base, room, textures: dict[str, str]) -> None:
+    shell = RoomShellBuilder()
+    size = 2 * WALL_LEN
+    shell.add_face(textures["floor"], (0, 0, 0), (size, size, 0), axis=2, sign=1)
+    shell.add_face(textures["ceiling"], (0, 0, WALL_ALT), (size, size, 0), axis=2, sign=-1)
+    for center, piece_size in wall_pieces("north"):
+        shell.add_box(textures["wall"], center, piece_size)
+    room.attachNewNode(shell.build(base.loader))
+
+
+def run(base, build, rooms: int, textures: dict[str, str]) -> dict:
+    from panda3d.core import SceneGraphAnalyzer
+
+    root = base.render.attachNewNode("rooms")
+    build(base, root.attachNewNode("warmup"), textures)       # ModelPool / TexturePool quentes
+
+    times = []
+    for i in range(rooms):
+        room = root.attachNewNode(f"Room-{i}")
+        room.setPos((i % 16) * CELL, (i // 16) * CELL, 0)
+        start = time.perf_counter()
+        build(base, room, textures)
+        times.append((time.perf_counter() - start) * 1000)
+
+    analyzer = SceneGraphAnalyzer()
+    analyzer.addNode(root.node())
+    nodes, geoms = analyzer.getNumNodes() / (rooms + 1), analyzer.getNumGeoms() / (rooms + 1)
+
+    frames = []
+    for _ in range(20):
+        start = time.perf_counter()
+        base.graphicsEngine.renderFrame()
+        frames.append((time.perf_counter() - start) * 1000)
+
+    root.removeNode()
+    return {"build_ms": statistics.median(times), "build_ms_max": max(times),
+            "nodes": nodes, "geoms": geoms, "frame_ms": statistics.median(frames)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=200)
+    args = parser.parse_args()
+
+    loadPrcFileData("", "window-type offscreen")
+    loadPrcFileData("", "audio-library-name null")
+    loadPrcFileData("", "sync-video false")
+    from direct.showbase.ShowBase import ShowBase
+    base = ShowBase()
+    base.disableMouse()
+    base.camera.setPos(8 * CELL, -6 * CELL, 12 * CELL)
+    base.camera.lookAt(8 * CELL, 6 * CELL, 0)
+    base.camLens.setFar(5000)
+
+    textures = {kind: sorted(glob(f"assets/textures/{folder}/*"))[0]
+                for kind, folder in (("floor", "floor"), ("ceiling", "ceiling"), ("wall", "walls"))}
+
+    print(f"{args.rooms} salas")
+    print(f"{'modo':>9s} {'montagem p50':>13s} {'máx':>9s} {'nós/sala':>9s} {'geoms/sala':>11s} {'frame':>9s}")
+    for name, build in (("rgbCube", build_legacy), ("builder", build_shell)):
+        r = run(base, build, args.rooms, textures)
+        print(f"{name:>9s} {r['build_ms']:11.3f}ms {r['build_ms_max']:7.2f}ms {r['nodes']:9.0f} "
+              f"{r['geoms']:11.0f} {r['frame_ms']:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
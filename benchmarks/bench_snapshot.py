@@ -0,0 +1,81 @@
+# benchmarks/bench_snapshot.py
+#
+# Geração do zero × snapshot (core/snapshot.py) para a mesma semente:
+#   • fresh: gera a masmorra, espera a decoração e os NPCs carregarem e grava o snapshot;
+#   • load:  monta a masmorra a partir do snapshot e espera os modelos dos NPCs.
+# Cada fase roda num processo próprio, para que o TexturePool e o cache de
+# modelos de uma não aqueçam a outra.
+#
+#   python -m benchmarks.bench_snapshot [--seed 42] [--dir snapshots-bench]
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent      # "assets/..." é relativo à raiz, não a benchmarks/
+
+def run_phase(phase: str, seed: int, root: Path) -> dict:
+    from panda3d.core import Filename, loadPrcFileData
+    os.environ["PROJETAO_SEED"] = str(seed)
+    os.environ["PROJETAO_SNAPSHOT"] = "1"
+    os.environ["PROJETAO_SNAPSHOT_DIR"] = str(root)
+    loadPrcFileData("", "window-type offscreen")
+    loadPrcFileData("", "audio-library-name null")
+    loadPrcFileData("", "sync-video false")
+    loadPrcFileData("", f"model-path {Filename.fromOsSpecific(str(ROOT)).getFullpath()}")
+
+    from main import Game
+    start = time.perf_counter()
+    game = Game()
+    # pronto = nada pendente no loader (e, na fase fresh, o snapshot já gravado)
+    while game.async_loader.pending or game.taskMgr.hasTaskNamed("snapshot-save-rooms"):
+        game.taskMgr.step()
+    ready_ms = (time.perf_counter() - start) * 1000
+
+    result = {"phase": phase, "ready_ms": ready_ms, **game.snapshots.stats}
+    if phase == "fresh":
+        result["room_build_ms"] = sum(game.scene_manager.build_times) * 1000
+    game.mesh_processor.shutdown()
+    game.destroy()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dir", type=Path, default=Path("snapshots-bench"))
+    parser.add_argument("--phase", choices=("fresh", "load"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase:
+        print(json.dumps(run_phase(args.phase, args.seed, args.dir)))
+        return
+
+    shutil.rmtree(args.dir / str(args.seed), ignore_errors=True)
+    results = {}
+    for phase in ("fresh", "load"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_snapshot", "--phase", phase,
+             "--seed", str(args.seed), "--dir", str(args.dir)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results[phase] = json.loads(out.strip().splitlines()[-1])
+
+    fresh, load = results["fresh"], results["load"]
+    print(f"semente {args.seed}")
+    print(f"  geração do zero:  {fresh['ready_ms']:8.0f} ms até tudo carregado "
+          f"(montagem das salas {fresh['room_build_ms']:.0f} ms)")
+    print(f"  gravação:         {fresh['write_ms']:8.0f} ms, {fresh['bytes'] / 1024 / 1024:.1f} MiB "
+          f"(uma sala por frame, pior {fresh['worst_room_ms']:.0f} ms)")
+    print(f"  snapshot:         {load['ready_ms']:8.0f} ms até tudo carregado "
+          f"(leitura dos .bam {load['load_ms']:.0f} ms)")
+    print(f"  ganho:            {fresh['ready_ms'] / load['ready_ms']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# benchmarks/bench_threading.py
+#
+# Thread única × pipeline multithread (core/threads.py) na mesma cena offscreen:
+#   • render:  --nodes cubos soltos (um Geom cada) no campo de visão: cull e draw caros;
+#   • NPCs:    --npcs modelos respirando no NPCSystem, todos dentro do raio;
+#   • asyncio: --jobs corrotinas no AsyncioPump imitando o scheduler (a cada 50 ms
+#              um status JSON para decodificar e um bloco baixado para o SHA-256).
+#
+# Modos:
+#   single    tudo na thread principal (o padrão do jogo)
+#   pipeline  threading-model Cull/Draw, tasks na thread principal
+#   threaded  Cull/Draw + task chains "npc" e "io" (perfil "threaded")
+#
+# Cada modo roda num processo próprio (o modelo de threads só vale ao abrir a
+# janela). Mede tempo de frame (p50/p90) e uso de CPU do processo: tempo de CPU
+# somado de todas as threads ÷ tempo de parede, então passa de 100% quando há
+# trabalho de verdade em paralelo.
+#
+#   python -m benchmarks.bench_threading [--frames 300] [--nodes 1500] [--npcs 500] [--jobs 16]
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+from fake_server.load_test import percentile
+
+MODES = {
+    "single":   ("", False),
+    "pipeline": ("Cull/Draw", False),
+    "threaded": ("Cull/Draw", True),
+}
+
+STATUS = json.dumps({"status": "running", "progress": 0.5, "message": "gerando malha",
+                     "log": [{"step": i, "t": i * .1, "detail": "x" * 40} for i in range(200)]})
+CHUNK = os.urandom(256 * 1024)
+
+
+async def fake_job(stop: asyncio.Event, counter: list[int]) -> None:
+    """Consulta de status + verificação do bloco baixado, como o scheduler e o downloader."""
+    while not stop.is_set():
+        json.loads(STATUS)
+        hashlib.sha256(CHUNK).digest()
+        counter[0] += 1
+        await asyncio.sleep(.05)
+
+
+def run_mode(mode: str, frames: int, nodes: int, npcs: int, jobs: int) -> dict:
+    from panda3d.core import loadPrcFileData
+    loadPrcFileData("", "window-type offscreen")
+    loadPrcFileData("", "audio-library-name null")
+    loadPrcFileData("", "sync-video false")
+
+    from core.threads import configure_pipeline, setup_task_chains
+    threading_model, chains = MODES[mode]
+    configure_pipeline(threading_model)
+
+    from direct.showbase.ShowBase import ShowBase
+    from core.asyncio_pump import AsyncioPump
+    from core.spatial import SpatialRegistry
+    from npc.npc_system import NPCSystem
+
+    base = ShowBase()
+    base.disableMouse()
+    if chains:
+        setup_task_chains(base)
+    base.camera.setPos(0, -60, 40)
+    base.camera.lookAt(0, 0, 0)
+    base.player_controller = SimpleNamespace(node=base.camera)
+
+    cube = base.loader.loadModel("models/misc/rgbCube")
+    rng = random.Random(0)
+    for _ in range(nodes):
+        copy = cube.copyTo(base.render)
+        copy.setPos(rng.uniform(-30, 30), rng.uniform(-30, 30), rng.uniform(0, 4))
+        copy.setH(rng.uniform(0, 360))
+
+    base.spatial = SpatialRegistry(base)
+    system = NPCSystem(base, breathing_distance=1000.0, task_chain="npc" if chains else None)
+    for _ in range(npcs):
+        npc = base.render.attachNewNode("npc")
+        npc.setPos(rng.uniform(-30, 30), rng.uniform(-30, 30), 0)
+        model = cube.copyTo(npc)
+        system.register(npc)
+        system.set_model(npc, model, .5)
+        base.spatial.add(npc, "npc")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    pump = AsyncioPump(base, loop, task_chain="io" if chains else None)
+    stop, polls = asyncio.Event(), [0]
+    for _ in range(jobs):
+        pump.spawn(fake_job(stop, polls))
+
+    for _ in range(30):                  # aquece: contexto GL, vértices na GPU, threads de pé
+        base.taskMgr.step()
+
+    times = []
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(frames):
+        start = time.perf_counter()
+        base.taskMgr.step()
+        times.append((time.perf_counter() - start) * 1000)
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    pump.call(stop.set)
+    base.taskMgr.step()
+    gsg = base.win.getGsg()
+    result = {
+        "mode": mode, "p50_ms": percentile(times, 50), "p90_ms": percentile(times, 90),
+        "fps": frames / wall, "cpu_pct": cpu / wall * 100, "polls_per_s": polls[0] / wall,
+        "renderer": gsg.getDriverRenderer(), "gl": gsg.getDriverVersion(),
+    }
+    base.destroy()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--nodes", type=int, default=1500)
+    parser.add_argument("--npcs", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=16)
+    parser.add_argument("--modes", nargs="+", choices=tuple(MODES), default=list(MODES))
+    parser.add_argument("--mode", choices=tuple(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.frames, args.nodes, args.npcs, args.jobs)))
+        return
+
+    results = []
+    for mode in args.modes:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_threading", "--mode", mode,
+             "--frames", str(args.frames), "--nodes", str(args.nodes),
+             "--npcs", str(args.npcs), "--jobs", str(args.jobs)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"\n{args.nodes} cubos, {args.npcs} NPCs, {args.jobs} jobs asyncio, {args.frames} frames, "
+          f"{os.cpu_count()} CPU(s) · {results[0]['renderer']}")
+    print(f"{'modo':>9s} {'p50':>9s} {'p90':>9s} {'fps':>7s} {'CPU':>6s} {'polls/s':>8s}  contexto GL")
+    for r in results:
+        print(f"{r['mode']:>9s} {r['p50_ms']:7.2f}ms {r['p90_ms']:7.2f}ms {r['fps']:7.1f} "
+              f"{r['cpu_pct']:5.0f}% {r['polls_per_s']:8.0f}  {r['gl']}")
+    single = next((r for r in results if r["mode"] == "single"), None)
+    for r in results:
+        if single and r is not single:
+            print(f"  {r['mode']}: {single['p50_ms'] / r['p50_ms']:.2f}x no p50 em relação a single")
+    if (os.cpu_count() or 1) < 3:
+        print("⚠️ Menos de 3 CPUs: App, Cull e Draw disputam os mesmos núcleos e as threads só somam troca de contexto")
+
+
+if __name__ == "__main__":
+    main()
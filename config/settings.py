@@ -0,0 +1,259 @@
+# config/settings.py
+#
+# Todos os números que mexem em desempenho, num lugar só, com perfis nomeados.
+# Ordem de aplicação (o último ganha):
+#
+#   1. padrões das dataclasses abaixo
+#   2. perfil: PROFILES[nome]                 PROJETAO_CONFIG=low | default | server-bench | threaded
+#   3. arquivo JSON (pode trazer "profile")   PROJETAO_CONFIG_FILE=meu-pc.json
+#   4. variáveis de ambiente:
+#        • as flags de sempre (PROJETAO_SEED, PROJETAO_PROFILE, ... ver ENV_FLAGS)
+#        • qualquer campo como PROJETAO_<SEÇÃO>__<CAMPO>, ex. PROJETAO_MESH__WORKERS=4
+#
+# Arquivo de exemplo:
+#   {"profile": "low", "mesh": {"triangle_budget": 4000}, "network": {"api_url": "http://gpu:8000"}}
+
+import json
+import os
+import tempfile
+import types
+import typing
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_API_URL = "http://127.0.0.1:8000"
+QUALITY_MODES = ("auto", "low", "medium", "high", "off")
+
+
+# ───────────────────────── SEÇÕES ─────────────────────────
+@dataclass
+class WorldSettings:
+    cell: float = 20            # distância entre centros de salas
+    wall_len: float = 10        # meia-largura da sala
+    wall_alt: float = 5         # altura da parede
+    wall_thk: float = 2         # espessura da parede
+    door_w: float = 2           # largura da abertura da porta
+    door_thk: float = .4        # profundidade da porta
+    rooms: int = 6              # salas geradas antes da sala final
+
+
+@dataclass
+class DecorSettings:
+    spacing: float = 4.5        # distância mínima entre peças (Poisson-disk)
+    wall_margin: float = 1.5    # folga das paredes
+    door_clearance: float = 2.0 # meia-largura do corredor porta → centro
+    npc_clearance: float = 2.5
+    max_per_room: int | None = 12
+
+
+@dataclass
+class RunSettings:
+    seed: int | None = None     # fixa layout, decoração e enigmas
+    record: str | None = None   # grava a sessão (JSONL) para benchmarks/bench_replay.py
+    snapshot: bool = False      # reaproveita a masmorra gerada com a semente
+    snapshot_dir: str = "snapshots"
+
+
+@dataclass
+class NetworkSettings:
+    api_url: str = DEFAULT_API_URL
+    poll_interval: float = .1   # segundos entre consultas ao status de um job
+    max_polls: int = 300        # consultas antes de desistir do job
+    download_cache_dir: str = str(Path(tempfile.gettempdir()) / "projetao_cache")
+    download_chunk_size: int = 64 * 1024
+    download_retries: int = 3
+
+
+@dataclass
+class GenerationSettings:
+    max_in_flight: int = 2      # jobs no servidor ao mesmo tempo
+    background_slots: int = 1   # vagas que jobs especulativos podem ocupar
+    max_cached_results: int = 64
+    prefer_binary: bool = True  # .pjm quando o servidor oferece
+    speculative: bool = False   # pré-gera as respostas dos enigmas próximos
+    speculative_lookahead: int = 1
+
+
+@dataclass
+class MeshSettings:
+    triangle_budget: int = 20_000   # teto; a qualidade adaptativa usa o menor entre este e o do nível
+    workers: int = 2            # processos de decimação
+    loader_threads: int = 1     # threads que decodificam .pjm/.obj fora do frame
+
+
+@dataclass
+class FrameSettings:
+    asyncio_budget_ms: float = 4.0
+    spatial_cell: float = 10.0
+    max_voices: int = 16
+    # pipeline de render do Panda3D: "" (tudo numa thread), "/Draw" ou "Cull/Draw"
+    threading_model: str = ""
+    task_chains: bool = False   # NPCs e loop asyncio em task chains com thread própria
+
+
+@dataclass
+class NPCSettings:
+    speech_distance: float = 10.0   # teto, como mesh.triangle_budget
+    breathing_distance: float = 25.0
+
+
+@dataclass
+class QualitySettings:
+    mode: str = "auto"          # auto | low | medium | high | off
+    target_ms: float = 1000 / 60
+    log_path: str = "profiles/quality.jsonl"
+    # janela de salas residentes por nível (None = todas)
+    resident_rooms: dict[str, int | None] = field(default_factory=lambda: {"low": 1, "medium": 2, "high": None})
+
+
+@dataclass
+class InferenceSettings:
+    quiz_model: str = "all-MiniLM-L6-v2"
+    device: str | None = None   # backend do sentence-transformers: None (automático), "cpu", "cuda", "mps"
+
+
+@dataclass
+class ProfilingSettings:
+    enabled: bool = False
+    hitch_ms: float = 50.0
+    history: int = 300
+    pstats: bool = False
+
+
+@dataclass
+class Settings:
+    profile: str = "default"
+    world: WorldSettings = field(default_factory=WorldSettings)
+    decor: DecorSettings = field(default_factory=DecorSettings)
+    run: RunSettings = field(default_factory=RunSettings)
+    network: NetworkSettings = field(default_factory=NetworkSettings)
+    generation: GenerationSettings = field(default_factory=GenerationSettings)
+    mesh: MeshSettings = field(default_factory=MeshSettings)
+    frame: FrameSettings = field(default_factory=FrameSettings)
+    npc: NPCSettings = field(default_factory=NPCSettings)
+    quality: QualitySettings = field(default_factory=QualitySettings)
+    inference: InferenceSettings = field(default_factory=InferenceSettings)
+    profiling: ProfilingSettings = field(default_factory=ProfilingSettings)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# ───────────────────────── PERFIS ─────────────────────────
+PROFILES: dict[str, dict] = {
+    "default": {},
+    # máquina fraca: menos processos, menos vozes, qualidade baixa fixa
+    "low": {
+        "mesh": {"workers": 1},
+        "decor": {"max_per_room": 6},
+        "generation": {"max_in_flight": 1, "max_cached_results": 32},
+        "frame": {"asyncio_budget_ms": 3.0, "max_voices": 8},
+        "npc": {"breathing_distance": 15.0},
+        "quality": {"mode": "low"},
+        "inference": {"device": "cpu"},
+    },
+    # medir o caminho de geração: fila larga, consulta rápida, frame estável e profiler ligado
+    "server-bench": {
+        "network": {"poll_interval": .05, "max_polls": 1200},
+        "generation": {"max_in_flight": 8, "background_slots": 4, "speculative": True},
+        "mesh": {"workers": 4, "loader_threads": 2},
+        "quality": {"mode": "high"},
+        "profiling": {"enabled": True},
+    },
+    # App | Cull | Draw em threads separadas, NPCs e asyncio fora da thread principal.
+    # Contexto de Draw sem GLSL (EGL sem janela): decoração com uma instância por cópia
+    "threaded": {
+        "frame": {"threading_model": "Cull/Draw", "task_chains": True},
+    },
+}
+
+# Flags de ambiente já usadas no projeto → campo
+ENV_FLAGS = {
+    "PROJETAO_SEED": "run.seed",
+    "PROJETAO_RECORD": "run.record",
+    "PROJETAO_SNAPSHOT": "run.snapshot",
+    "PROJETAO_SNAPSHOT_DIR": "run.snapshot_dir",
+    "PROJETAO_API_URL": "network.api_url",
+    "PROJETAO_SPECULATIVE": "generation.speculative",
+    "PROJETAO_PROFILE": "profiling.enabled",
+    "PROJETAO_HITCH_MS": "profiling.hitch_ms",
+    "PROJETAO_PSTATS": "profiling.pstats",
+    "PROJETAO_QUALITY": "quality.mode",
+    "PROJETAO_TARGET_MS": "quality.target_ms",
+    "PROJETAO_QUALITY_LOG": "quality.log_path",
+    "PROJETAO_THREADING": "frame.threading_model",
+    "PROJETAO_TASK_CHAINS": "frame.task_chains",
+}
+
+
+# ───────────────────────── CARGA ─────────────────────────
+def load_settings(profile: str | None = None, path: str | Path | None = None,
+                  env: typing.Mapping[str, str] | None = None) -> Settings:
+    env = os.environ if env is None else env
+    path = path or env.get("PROJETAO_CONFIG_FILE")
+    data = json.loads(Path(path).read_text(encoding="utf-8")) if path else {}
+
+    profile = profile or env.get("PROJETAO_CONFIG") or data.pop("profile", None) or "default"
+    data.pop("profile", None)
+    if profile not in PROFILES:
+        raise ValueError(f"Perfil de configuração desconhecido: {profile!r} (opções: {', '.join(PROFILES)})")
+
+    settings = Settings(profile=profile)
+    _merge(settings, PROFILES[profile])
+    _merge(settings, data)
+
+    for name, value in env.items():
+        if name in ENV_FLAGS:
+            _set_path(settings, ENV_FLAGS[name], value)
+        elif name.startswith("PROJETAO_") and "__" in name:
+            section, key = name[len("PROJETAO_"):].lower().split("__", 1)
+            _set_path(settings, f"{section}.{key}", value)
+
+    if settings.quality.mode not in QUALITY_MODES:
+        raise ValueError(f"Modo de qualidade desconhecido: {settings.quality.mode!r} "
+                         f"(PROJETAO_QUALITY / quality.mode; opções: {', '.join(QUALITY_MODES)})")
+    return settings
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Configuração do processo, lida uma vez do ambiente."""
+    return load_settings()
+
+
+def _merge(target, data: dict) -> None:
+    names = {f.name for f in fields(target)}
+    for key, value in data.items():
+        if key not in names:
+            raise ValueError(f"Campo desconhecido em {type(target).__name__}: {key!r}")
+        current = getattr(target, key)
+        if is_dataclass(current) and isinstance(value, dict):
+            _merge(current, value)
+        else:
+            setattr(target, key, value)
+
+
+def _set_path(settings: Settings, dotted: str, raw: str) -> None:
+    section_name, key = dotted.split(".", 1)
+    section = getattr(settings, section_name, None)
+    if not is_dataclass(section):
+        raise ValueError(f"Seção de configuração desconhecida: {section_name!r}")
+    hints = typing.get_type_hints(type(section))
+    if key not in hints:
+        raise ValueError(f"Campo desconhecido em {section_name}: {key!r}")
+    setattr(section, key, _coerce(raw, hints[key]))
+
+
+def _coerce(raw: str, hint):
+    """Texto do ambiente → tipo do campo ("", "none" viram None quando o campo aceita)."""
+    args = typing.get_args(hint)
+    if isinstance(hint, types.UnionType) or typing.get_origin(hint) is typing.Union:
+        if raw.strip().lower() in ("", "none", "null"):
+            return None
+        hint = next(a for a in args if a is not type(None))
+    if hint is bool:
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    if hint in (int, float, str):
+        return hint(raw)
+    return json.loads(raw)          # dicts e listas em JSON
@@ -0,0 +1,103 @@
+# core/async_loader.py
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from direct.showbase.ShowBaseGlobal import globalClock
+from direct.task import Task
+from panda3d.core import NodePath, Filename
+
+from core.geom_builder import load_pjm, load_obj_fast
+from core.mesh_codec import SUFFIX
+
+
+class AsyncModelLoader:
+    """
+    Carrega modelos pelo loader assíncrono (thread) do Panda3D. O parse do arquivo
+    acontece fora do frame; `callback(model, *args)` roda no thread principal,
+    então pode mexer no scene graph à vontade.
+
+    Arquivos .pjm (formato binário) — e .obj, com `fast_obj` — não passam pelo
+    loader do Panda3D: são lidos e montados com NumPy em um thread próprio e
+    entregues no frame seguinte ao término.
+
+    Enquanto houver cargas pendentes, registra o pior tempo de frame para provar
+    que a carga não trava o jogo.
+    """
+
+    def __init__(self, app, fast_obj: bool = True, mesh_threads: int = 1):
+        self.app = app
+        self._custom_loaders = {SUFFIX.lstrip("."): load_pjm}
+        if fast_obj:
+            self._custom_loaders["obj"] = load_obj_fast
+        self.pending = 0
+        self.loaded = 0
+        self.worst_frame_during_load = 0.0     # segundos
+        self._current_worst = 0.0
+        self._mesh_pool = ThreadPoolExecutor(max_workers=mesh_threads, thread_name_prefix="mesh-loader")
+        self._mesh_pending: list[tuple[Future, Callable[..., None]]] = []
+        self.app.taskMgr.add(self._watch_frames, "async-loader-watch", sort=-50)
+
+    def load(self, path: str | Filename, callback: Callable[..., None], *extra_args,
+             priority: int | None = None):
+        """Agenda a carga de `path`; devolve o request (tem `.cancel()`)."""
+        if isinstance(path, str):
+            path = Filename.fromOsSpecific(path)
+
+        self.pending += 1
+        start = time.perf_counter()
+
+        def on_loaded(model: NodePath | None, *args):
+            self.pending -= 1
+            self.loaded += 1
+            if model is None:
+                print(f"⚠️ [AsyncLoader] Falha ao carregar {path}")
+            else:
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"📦 [AsyncLoader] {path.getBasename()} em {elapsed:.0f} ms "
+                      f"(pior frame durante cargas: {self._current_worst * 1000:.1f} ms)")
+            if self.pending == 0:
+                self._current_worst = 0.0
+            callback(model, *args)
+
+        custom = self._custom_loaders.get(path.getExtension())
+        if custom and path.exists():
+            future = self._mesh_pool.submit(self._load_custom, custom, path.toOsSpecific())
+            self._mesh_pending.append((future, lambda model: on_loaded(model, *extra_args)))
+            return future
+
+        return self.app.loader.loadModel(path, callback=on_loaded, extraArgs=list(extra_args),
+                                         priority=priority, okMissing=True)
+
+    @staticmethod
+    def _load_custom(load_fn, os_path: str) -> NodePath | None:
+        # Arquivo ruim vira modelo None (como o okMissing do loader), nunca exceção no frame
+        try:
+            return load_fn(os_path)
+        except Exception as e:
+            print(f"⚠️ [AsyncLoader] {os_path}: {type(e).__name__}: {e}")
+            return None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "loaded": self.loaded,
+            "worst_frame_ms": self.worst_frame_during_load * 1000,
+        }
+
+    def _watch_frames(self, task):
+        if self._mesh_pending:
+            still_pending = []
+            for future, deliver in self._mesh_pending:
+                if future.done():
+                    deliver(None if future.cancelled() or future.exception() else future.result())
+                else:
+                    still_pending.append((future, deliver))
+            self._mesh_pending = still_pending
+
+        if self.pending:
+            dt = globalClock.getDt()
+            self._current_worst = max(self._current_worst, dt)
+            self.worst_frame_during_load = max(self.worst_frame_during_load, dt)
+        return Task.cont
@@ -0,0 +1,75 @@
+# core/asyncio_pump.py
+
+import asyncio
+import threading
+import time
+
+from direct.task import Task
+
+
+class AsyncioPump:
+    """
+    Roda o loop asyncio dentro do frame do Panda3D: até `max_iterations` iterações
+    por frame, parando quando `budget_ms` acaba. O orçamento limita iterações, não
+    os callbacks dentro de uma (ver `overruns`). Com `task_chain` o loop roda na
+    thread da chain; de fora, entre por `call`/`spawn`.
+    """
+
+    def __init__(self, app, loop: asyncio.AbstractEventLoop | None = None,
+                 budget_ms: float = 4.0, max_iterations: int = 16, sort: int = 0,
+                 task_chain: str | None = None):
+        self.app = app
+        self.loop = loop or asyncio.get_event_loop()
+        self.budget = budget_ms / 1000
+        self.max_iterations = max_iterations
+        self.task_chain = task_chain
+        self._thread_id = threading.get_ident() if task_chain is None else None
+
+        self.frames = 0
+        self.iterations = 0
+        self.overruns = 0            # frames em que o pump passou do orçamento
+        self.worst_ms = 0.0
+
+        self.task = self.app.taskMgr.add(self._step, "asyncioPump", sort=sort, taskChain=task_chain)
+
+    # ───────────────────────── API ─────────────────────────
+    def call(self, fn, *args) -> None:
+        """`fn(*args)` na thread do loop: na hora se já estamos nela, senão na próxima iteração."""
+        if threading.get_ident() == self._thread_id:
+            fn(*args)
+        else:
+            self.loop.call_soon_threadsafe(fn, *args)
+
+    def spawn(self, coro):
+        """Agenda a corrotina no loop, de qualquer thread."""
+        if threading.get_ident() == self._thread_id:
+            return self.loop.create_task(coro)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "iterations_per_frame": self.iterations / self.frames if self.frames else 0.0,
+            "overruns": self.overruns,
+            "worst_ms": self.worst_ms,
+        }
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _step(self, task):
+        self._thread_id = threading.get_ident()
+        start = time.perf_counter()
+        deadline = start + self.budget
+
+        for i in range(self.max_iterations):
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+            if time.perf_counter() >= deadline:
+                break
+
+        elapsed = time.perf_counter() - start
+        self.frames += 1
+        self.iterations += i + 1
+        self.worst_ms = max(self.worst_ms, elapsed * 1000)
+        if self.budget and elapsed > self.budget:
+            self.overruns += 1
+        return Task.cont
@@ -0,0 +1,97 @@
+# core/audio.py
+
+from direct.showbase.Audio3DManager import Audio3DManager
+from panda3d.core import AudioManager, AudioSound, Filename, NodePath
+
+# Efeitos curtos: decodificados na inicialização, várias vozes por efeito
+EFFECTS = {
+    #  nome      arquivo                              vozes  posicional
+    "passo": ("assets/sounds/passo.wav",            2,     False),
+    "porta": ("assets/sounds/porta-abrindo.wav",    2,     True),
+}
+
+# Trilhas longas: lidas do disco aos poucos (stream), só o handle é preparado antes
+STREAMS = {
+    "epilogo": "assets/sounds/epilogo.wav",
+}
+
+
+class AudioSystem:
+    """
+    Um único subsistema de áudio: efeitos curtos pré-carregados em pools de
+    vozes, trilhas longas em stream, limite global de vozes simultâneas e um
+    só Audio3DManager (ouvinte na câmera) para todos os sons posicionais.
+    Tocar um efeito durante o jogo não lê disco nem cria decodificador.
+    """
+
+    def __init__(self, app, max_voices: int = 16):
+        self.app = app
+        self.sfx_manager: AudioManager = app.sfxManagerList[0]
+        self.music_manager: AudioManager = app.musicManager
+        self.sfx_manager.setConcurrentSoundLimit(max_voices)
+
+        self.audio3d = Audio3DManager(self.sfx_manager, app.camera)
+        self._pools: dict[str, list[AudioSound]] = {}
+        self._next: dict[str, int] = {}
+        self._streams: dict[str, AudioSound] = {}
+        self.plays = 0
+        self.steals = 0          # vozes interrompidas porque o pool estava todo tocando
+
+        for name, (path, voices, positional) in EFFECTS.items():
+            self.preload(name, path, voices, positional)
+        for name, path in STREAMS.items():
+            self.prepare_stream(name, path)
+
+    # ───────────────────────── CARGA ─────────────────────────
+    def preload(self, name: str, path: str, voices: int = 2, positional: bool = False) -> None:
+        """Cria `voices` instâncias do efeito; o OpenAL decodifica o arquivo uma vez só."""
+        load = self.audio3d.loadSfx if positional else self.app.loader.loadSfx
+        self._pools[name] = [load(path) for _ in range(voices)]
+        self._next[name] = 0
+
+    def prepare_stream(self, name: str, path: str) -> None:
+        self._streams[name] = self.music_manager.getSound(
+            Filename.fromOsSpecific(path), False, AudioManager.SM_stream)
+
+    # ───────────────────────── REPRODUÇÃO ─────────────────────────
+    def play(self, name: str, volume: float = 1.0, node: NodePath | None = None) -> AudioSound | None:
+        """Toca uma voz livre do pool `name`; com `node`, o som segue esse nó no espaço."""
+        pool = self._pools.get(name)
+        if not pool:
+            return None
+
+        sound = self._free_voice(name, pool)
+        if node is not None and not node.isEmpty():
+            self.audio3d.attachSoundToObject(sound, node)
+        sound.setVolume(volume)
+        sound.play()
+        self.plays += 1
+        return sound
+
+    def play_stream(self, name: str, loop: bool = False, volume: float = 1.0) -> AudioSound | None:
+        sound = self._streams.get(name)
+        if sound is None:
+            return None
+        sound.setLoop(loop)
+        sound.setVolume(volume)
+        sound.play()
+        return sound
+
+    def stats(self) -> dict:
+        return {"plays": self.plays, "steals": self.steals,
+                "voices": sum(len(p) for p in self._pools.values())}
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _free_voice(self, name: str, pool: list[AudioSound]) -> AudioSound:
+        """Primeira voz parada a partir do cursor; se todas tocam, rouba a do cursor (a mais antiga)."""
+        start = self._next[name]
+        for i in range(len(pool)):
+            idx = (start + i) % len(pool)
+            if pool[idx].status() != AudioSound.PLAYING:
+                self._next[name] = (idx + 1) % len(pool)
+                return pool[idx]
+
+        self.steals += 1
+        self._next[name] = (start + 1) % len(pool)
+        pool[start].stop()
+        return pool[start]
@@ -0,0 +1,107 @@
+# core/geom_builder.py
+#
+# Monta Geoms do Panda3D direto de buffers binários: cada seção é copiada de uma
+# vez para o GeomVertexArrayData via memoryview, sem laço Python por vértice.
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexArrayFormat, GeomVertexData,
+                          GeomVertexFormat, GeomEnums, InternalName, NodePath)
+
+from core.mesh_codec import MeshBuffers, decode_mesh, buffers_from_arrays, compute_normals
+from core.obj_parser import parse_obj
+
+
+@lru_cache(maxsize=None)
+def vertex_format(has_normals: bool, has_colors: bool) -> GeomVertexFormat:
+    """Um array por atributo (não intercalado), no mesmo layout das seções do .pjm."""
+    fmt = GeomVertexFormat()
+
+    arr = GeomVertexArrayFormat()
+    arr.addColumn(InternalName.getVertex(), 3, GeomEnums.NT_float32, GeomEnums.C_point)
+    fmt.addArray(arr)
+
+    if has_normals:
+        arr = GeomVertexArrayFormat()
+        arr.addColumn(InternalName.getNormal(), 3, GeomEnums.NT_float32, GeomEnums.C_normal)
+        fmt.addArray(arr)
+
+    if has_colors:
+        arr = GeomVertexArrayFormat()
+        arr.addColumn(InternalName.getColor(), 4, GeomEnums.NT_uint8, GeomEnums.C_color)
+        fmt.addArray(arr)
+
+    return GeomVertexFormat.registerFormat(fmt)
+
+
+def _fill(array_data, buffer) -> None:
+    if array_data.getNumRows() == 0:      # memoryview não faz cast de buffer vazio
+        return
+    memoryview(array_data).cast("B")[:] = buffer
+
+
+def build_geom(buffers: MeshBuffers, name: str = "mesh") -> Geom:
+    has_normals = buffers.normals is not None
+    has_colors = buffers.colors is not None
+
+    vdata = GeomVertexData(name, vertex_format(has_normals, has_colors), Geom.UHStatic)
+    vdata.uncleanSetNumRows(buffers.vertex_count)
+
+    sections = [buffers.positions]
+    if has_normals:
+        sections.append(buffers.normals)
+    if has_colors:
+        sections.append(buffers.colors)
+    for i, section in enumerate(sections):
+        _fill(vdata.modifyArray(i), section)
+
+    prim = GeomTriangles(Geom.UHStatic)
+    prim.setIndexType(GeomEnums.NT_uint32)
+    indices = prim.modifyVertices()
+    indices.uncleanSetNumRows(buffers.index_count)
+    _fill(indices, buffers.indices)
+
+    geom = Geom(vdata)
+    geom.addPrimitive(prim)
+    return geom
+
+
+def build_geom_node(buffers: MeshBuffers, name: str = "mesh") -> GeomNode:
+    node = GeomNode(name)
+    node.addGeom(build_geom(buffers, name))
+    return node
+
+
+def load_pjm(path: str | Path) -> NodePath:
+    """Lê um .pjm do disco e devolve um NodePath pronto para renderizar."""
+    path = Path(path)
+    return NodePath(build_geom_node(decode_mesh(path.read_bytes()), path.stem))
+
+
+# Como o ModelPool do loader: cada arquivo é lido uma vez e as cargas seguintes
+# devolvem cópias do nó que compartilham os mesmos Geoms.
+_obj_cache: dict[tuple[str, float, bool], GeomNode] = {}
+_obj_cache_lock = threading.Lock()
+
+
+def load_obj_fast(path: str | Path, with_normals: bool = False) -> NodePath:
+    """
+    Alternativa ao `loader.loadModel` para .obj: parser NumPy + memoryview.
+    Mantém a cor por vértice (para `ColorAttrib.makeVertex()`); normais só se pedidas.
+    """
+    path = Path(path)
+    key = (str(path.resolve()), path.stat().st_mtime, with_normals)
+
+    with _obj_cache_lock:
+        cached = _obj_cache.get(key)
+    if cached is None:
+        mesh = parse_obj(path)
+        normals = compute_normals(mesh.positions, mesh.faces) if with_normals and len(mesh.faces) else None
+        buffers = buffers_from_arrays(mesh.positions, mesh.faces, mesh.colors, normals)
+        cached = build_geom_node(buffers, path.stem)
+        with _obj_cache_lock:
+            _obj_cache[key] = cached
+
+    return NodePath(cached).copyTo(NodePath())
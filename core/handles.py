@@ -0,0 +1,119 @@
+# core/handles.py
+#
+# Referências diretas para o que o jogo precisa achar depois de criado: salas,
+# portas (com o colisor), NPCs (com o balão e o modelo). Cada handle é
+# registrado no momento da criação e fica também na tag Python "handle" do
+# próprio nó, então ir de um NodePath para o handle é O(1) e nenhum caminho de
+# jogo precisa de `find("**/...")` nem de percorrer listas.
+
+from dataclasses import dataclass, field
+
+from panda3d.core import NodePath
+
+
+@dataclass(eq=False)
+class RoomHandle:
+    index: int
+    node: NodePath
+    doors: dict[str, "DoorHandle"] = field(default_factory=dict)   # direção → porta
+    npcs: list["NPCHandle"] = field(default_factory=list)
+    exit_door: "DoorHandle | None" = None
+
+
+@dataclass(eq=False)
+class DoorHandle:
+    node: NodePath
+    direction: str
+    room: RoomHandle
+    collider: NodePath | None = None
+    npc: "NPCHandle | None" = None           # quem guarda a porta
+    name: str = field(init=False)            # guardado: o nó some antes do handle
+
+    def __post_init__(self):
+        self.name = self.node.getName()
+
+
+@dataclass(eq=False)
+class NPCHandle:
+    node: NodePath
+    room: RoomHandle | None = None
+    door: DoorHandle | None = None           # None depois que a porta abre
+    speech: NodePath | None = None
+    model: NodePath | None = None
+
+    @property
+    def solved(self) -> bool:
+        return self.door is None
+
+
+class HandleRegistry:
+    """Dono das relações sala ↔ porta ↔ NPC; `remove_room` vai no release da sala."""
+
+    def __init__(self, app):
+        self.app = app
+        self.rooms: dict[int, RoomHandle] = {}
+        self.doors: set[DoorHandle] = set()          # portas ainda fechadas
+
+    # ───────────────────────── REGISTRO ─────────────────────────
+    def add_room(self, index: int, node: NodePath) -> RoomHandle:
+        room = self.rooms[index] = RoomHandle(index, node)
+        node.setPythonTag("handle", room)
+        return room
+
+    def add_door(self, room_index: int, node: NodePath, direction: str,
+                 collider: NodePath | None = None) -> DoorHandle:
+        """Só a saída da sala tem porta; a entrada é a saída da sala anterior."""
+        room = self.rooms[room_index]
+        door = DoorHandle(node, direction, room, collider)
+        room.doors[direction] = door
+        room.exit_door = door
+        self.doors.add(door)
+        node.setPythonTag("handle", door)
+        return door
+
+    def add_npc(self, room_index: int | None, node: NodePath, door: DoorHandle | None = None,
+                speech: NodePath | None = None) -> NPCHandle:
+        room = self.rooms.get(room_index)
+        npc = NPCHandle(node, room, door, speech)
+        if room is not None:
+            room.npcs.append(npc)
+        if door is not None:
+            door.npc = npc
+        node.setPythonTag("handle", npc)
+        return npc
+
+    # ───────────────────────── CONSULTA ─────────────────────────
+    @staticmethod
+    def of(node: NodePath | None):
+        """Handle registrado no nó (sala, porta ou NPC), ou None."""
+        if node is None or node.isEmpty() or not node.hasPythonTag("handle"):
+            return None
+        return node.getPythonTag("handle")
+
+    def npcs(self, room_indices=None):
+        rooms = self.rooms.values() if room_indices is None else (
+            self.rooms[i] for i in room_indices if i in self.rooms)
+        for room in rooms:
+            yield from room.npcs
+
+    # ───────────────────────── REMOÇÃO ─────────────────────────
+    def remove_door(self, door: DoorHandle) -> None:
+        """Porta aberta: some do registro e o NPC passa a contar como resolvido."""
+        self.doors.discard(door)
+        if door.room.doors.get(door.direction) is door:
+            del door.room.doors[door.direction]
+        if door.room.exit_door is door:
+            door.room.exit_door = None
+        if door.npc is not None:
+            door.npc.door = None
+        door.collider = None
+
+    def remove_room(self, index: int) -> None:
+        room = self.rooms.pop(index, None)
+        if room is None:
+            return
+        for door in list(room.doors.values()):
+            self.remove_door(door)
+        for npc in room.npcs:
+            npc.room = npc.door = npc.speech = npc.model = None
+        room.npcs.clear()
@@ -0,0 +1,254 @@
+# core/instancing.py
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from direct.task import Task
+from panda3d.core import (BoundingBox, CollisionNode, GeomEnums, GraphicsStateGuardian, NodePath,
+                          OmniBoundingVolume, Point3, Shader, Texture)
+
+from core.load_wrapper import load_model_with_default_material_async
+
+_VERTEX = """
+#version 330
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform samplerBuffer instances;        // 4 texels por instância: as linhas da matriz
+in vec4 p3d_Vertex;
+in vec4 p3d_Color;
+out vec4 color;
+
+void main() {
+    int base = gl_InstanceID * 4;
+    mat4 model = mat4(texelFetch(instances, base),     texelFetch(instances, base + 1),
+                      texelFetch(instances, base + 2), texelFetch(instances, base + 3));
+    gl_Position = p3d_ModelViewProjectionMatrix * model * p3d_Vertex;
+    color = p3d_Color;
+}
+"""
+
+_FRAGMENT = """
+#version 330
+uniform vec4 p3d_ColorScale;
+in vec4 color;
+out vec4 p3d_FragColor;
+
+void main() {
+    p3d_FragColor = color * p3d_ColorScale;
+}
+"""
+
+
+@dataclass(eq=False)
+class _PropBatch:
+    path: str
+    anchors: list[tuple[NodePath, object, float]] = field(default_factory=list)   # (âncora, grupo, ordem)
+    pending: list[NodePath] = field(default_factory=list)                  # à espera do protótipo
+    node: NodePath | None = None            # geometria desenhada N vezes, direto no render
+    collider: CollisionNode | None = None
+    min_z: float = 0.0
+    radius: float = 0.0                     # alcance do protótipo a partir da origem, em escala 1
+    texture: Texture | None = None
+    capacity: int = 0
+    drawn: int = 0
+    dirty: bool = False
+
+
+class InstancedProps:
+    """
+    Decoração repetida com instancing de hardware: cada modelo é carregado uma
+    vez e todas as cópias, em todas as salas, saem numa única chamada de desenho.
+
+    Na sala fica só uma âncora por cópia: um nó vazio com a transformação, a tag
+    "decor_model" e o colisor. As matrizes das âncoras vão para uma buffer
+    texture lida pelo vertex shader (`gl_InstanceID`), refeita só quando uma
+    âncora entra ou sai.
+
+    A densidade (fração das cópias desenhadas) e os grupos residentes filtram o
+    que vai para o buffer; as âncoras de fora são "stashed", então também deixam
+    de colidir. Cada cópia tem uma ordem fixa (sequência de razão áurea), para
+    que baixar a densidade tire sempre as mesmas, bem espalhadas.
+
+    Sem GLSL 3.30 (drivers antigos, contexto GLES 1 do pipeline multithread em
+    EGL) cada âncora recebe uma instância (`instanceTo`) do protótipo: uma
+    chamada de desenho por cópia, mas a decoração continua visível onde colide.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.hardware = self.supports_hardware_instancing(app)
+        self.shader = Shader.make(Shader.SL_GLSL, _VERTEX, _FRAGMENT) if self.hardware else None
+        self._batches: dict[str, _PropBatch] = {}
+        self._placed = 0
+        self.density = 1.0
+        self.resident_groups: set | None = None      # None = todos
+        # Depois das tasks de jogo, antes do render (igLoop tem sort 50)
+        self.task = self.app.taskMgr.add(self._update, "instanced-props", sort=45)
+        if not self.hardware:
+            print("⚠️ [Decor] GPU/contexto sem GLSL 3.30: uma instância por cópia, sem instancing de hardware")
+
+    @staticmethod
+    def supports_hardware_instancing(app) -> bool:
+        gsg = app.win.getGsg() if app.win is not None else None
+        return (gsg is not None and gsg.getSupportsGlsl() and gsg.getSupportsGeometryInstancing()
+                and gsg.getShaderModel() >= GraphicsStateGuardian.SM_40)
+
+    # ───────────────────────── API ─────────────────────────
+    def place(self, parent: NodePath, path: str | Path, pos, scale: float, heading: float,
+              group=None) -> NodePath:
+        """Nova cópia de `path` em `parent`; a base encosta no chão quando o protótipo chegar."""
+        path = str(path)
+        anchor = parent.attachNewNode(f"decor-{Path(path).stem}")
+        anchor.setTag("decor_model", path)
+        anchor.setPos(pos)
+        anchor.setScale(scale)
+        anchor.setH(heading)
+
+        batch = self._batch(path)
+        if batch.node is None:
+            batch.pending.append(anchor)
+        else:
+            self._settle(batch, anchor)
+        batch.anchors.append((anchor, group, self._next_rank()))
+        batch.dirty = True
+        return anchor
+
+    def adopt(self, anchor: NodePath, group=None) -> None:
+        """Âncora já assentada (vinda de um snapshot .bam)."""
+        anchor.unstash()
+        # Geometria gravada por um jogo sem instancing de hardware: refeita no rebuild
+        anchor.findAllMatches("decor-geom").detach()
+        batch = self._batch(anchor.getTag("decor_model"))
+        batch.anchors.append((anchor, group, self._next_rank()))
+        batch.dirty = True
+
+    def remove_group(self, group) -> None:
+        for batch in self._batches.values():
+            kept = [entry for entry in batch.anchors if entry[1] != group]
+            if len(kept) != len(batch.anchors):
+                batch.anchors = kept
+                batch.pending = [a for a in batch.pending if any(a is k for k, _, _ in kept)]
+                batch.dirty = True
+
+    def set_density(self, density: float) -> None:
+        self.density = density
+        self._mark_all_dirty()
+
+    def set_resident_groups(self, groups: set | None) -> None:
+        self.resident_groups = groups
+        self._mark_all_dirty()
+
+    def stats(self) -> dict:
+        return {
+            "props": len(self._batches),
+            "instances": sum(len(b.anchors) for b in self._batches.values()),
+            "drawn": sum(b.drawn for b in self._batches.values()),
+            "draws": sum((1 if self.hardware else b.drawn) for b in self._batches.values() if b.drawn),
+        }
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _next_rank(self) -> float:
+        self._placed += 1
+        return (self._placed * 0.6180339887) % 1.0
+
+    def _mark_all_dirty(self) -> None:
+        for batch in self._batches.values():
+            batch.dirty = True
+
+    def _visible(self, group, rank: float) -> bool:
+        return rank < self.density and (self.resident_groups is None or group in self.resident_groups)
+
+    def _batch(self, path: str) -> _PropBatch:
+        batch = self._batches.get(path)
+        if batch is None:
+            batch = self._batches[path] = _PropBatch(path)
+            load_model_with_default_material_async(self.app.async_loader, path, self._on_prototype, batch)
+        return batch
+
+    def _on_prototype(self, model: NodePath | None, batch: _PropBatch) -> None:
+        if model is None:
+            return
+
+        # O colisor vai para as âncoras; o protótipo fica só com a geometria
+        col = model.find("+CollisionNode")
+        if not col.isEmpty():
+            batch.collider = col.node()
+            col.detachNode()
+        model.flattenStrong()
+        min_bound, max_bound = model.getTightBounds() or (Point3(0), Point3(0))
+        batch.min_z = min_bound.getZ()
+        batch.radius = max((Point3(min_bound)).length(), Point3(max_bound).length())
+
+        if self.hardware:
+            # Quem decide o culling é a raiz (volume de todas as cópias); abaixo dela nada é descartado
+            for geom_np in model.findAllMatches("**/+GeomNode"):
+                geom_node = geom_np.node()
+                geom_node.setBounds(OmniBoundingVolume())
+                geom_node.setFinal(True)
+                for i in range(geom_node.getNumGeoms()):
+                    geom_node.modifyGeom(i).setBounds(OmniBoundingVolume())
+            model.setShader(self.shader)
+            model.reparentTo(self.app.render)
+        batch.node = model              # sem hardware fica fora da cena: só é instanciado nas âncoras
+
+        for anchor in batch.pending:
+            if not anchor.isEmpty():
+                self._settle(batch, anchor)
+        batch.pending.clear()
+        batch.dirty = True
+
+    def _settle(self, batch: _PropBatch, anchor: NodePath) -> None:
+        anchor.setZ(-batch.min_z * anchor.getSz() - .05)
+        if batch.collider is not None:
+            anchor.attachNewNode(batch.collider.makeCopy())
+
+    def _rebuild(self, batch: _PropBatch) -> None:
+        render = self.app.render
+        anchors = []
+        for anchor, group, rank in batch.anchors:
+            if anchor.isEmpty():
+                continue
+            if self._visible(group, rank):
+                anchor.unstash()
+                anchors.append(anchor)
+            else:
+                anchor.stash()
+        count = batch.drawn = len(anchors)
+        if not self.hardware:
+            # O stash da âncora já esconde a cópia; só falta a geometria nas que ainda não têm
+            for anchor in anchors:
+                if anchor.find("decor-geom").isEmpty():
+                    batch.node.instanceTo(anchor.attachNewNode("decor-geom"))
+            return
+
+        batch.node.setInstanceCount(count)
+        if count == 0:
+            batch.node.hide()
+            return
+        batch.node.show()
+
+        mats = np.array([a.getMat(render) for a in anchors], dtype=np.float32)
+        if count > batch.capacity:
+            # Cresce em potências de 2 para não recriar a textura a cada cópia nova
+            batch.capacity = 1 << (count - 1).bit_length()
+            batch.texture = Texture(f"instances-{Path(batch.path).stem}")
+            batch.texture.setupBufferTexture(batch.capacity * 4, Texture.T_float,
+                                             Texture.F_rgba32, GeomEnums.UH_dynamic)
+            batch.node.setShaderInput("instances", batch.texture)
+        image = np.zeros((batch.capacity, 4, 4), np.float32)
+        image[:count] = mats
+        batch.texture.setRamImage(image.tobytes())
+
+        # Um volume que cobre todas as cópias: o nó é um só para o culling
+        reach = batch.radius * float(np.linalg.norm(mats[:, :3, :3], axis=2).max())
+        corners_lo = mats[:, 3, :3].min(axis=0) - reach
+        corners_hi = mats[:, 3, :3].max(axis=0) + reach
+        batch.node.node().setBounds(BoundingBox(Point3(*corners_lo), Point3(*corners_hi)))
+        batch.node.node().setFinal(True)
+
+    def _update(self, task):
+        for batch in self._batches.values():
+            if batch.dirty and batch.node is not None:
+                batch.dirty = False
+                self._rebuild(batch)
+        return Task.cont
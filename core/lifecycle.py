@@ -0,0 +1,159 @@
+# core/lifecycle.py
+
+from typing import Callable
+
+from direct.interval.Interval import Interval
+from panda3d.core import AsyncTask, AudioSound, GeomNode, NodePath
+
+
+class Owner:
+    """
+    Tudo o que uma sala (ou um objeto colocado nela) criou: tasks, intervals,
+    sons, colisores, nós fora da raiz e callbacks de limpeza. `release()` libera
+    tudo junto, inclusive os filhos, e remove a raiz do grafo de cena.
+    """
+
+    def __init__(self, name: str, root: NodePath | None = None):
+        self.name = name
+        self.root = root
+        self.tasks: list[AsyncTask] = []
+        self.intervals: list[Interval] = []
+        self.sounds: list[AudioSound] = []
+        self.collision_nodes: list[NodePath] = []
+        self.nodes: list[NodePath] = []
+        self.callbacks: list[Callable[[], None]] = []
+        self.children: list["Owner"] = []
+        self.released = False
+
+    # ───────────────────────── REGISTRO ─────────────────────────
+    # Cada add_* devolve o próprio objeto, para encadear: `owner.add_task(taskMgr.add(...))`
+    def add_task(self, task: AsyncTask) -> AsyncTask:
+        self.tasks.append(task)
+        return task
+
+    def add_interval(self, interval: Interval) -> Interval:
+        self.intervals.append(interval)
+        return interval
+
+    def add_sound(self, sound: AudioSound | None) -> AudioSound | None:
+        if sound is not None:
+            self.sounds.append(sound)
+        return sound
+
+    def add_collision(self, node: NodePath) -> NodePath:
+        self.collision_nodes.append(node)
+        return node
+
+    def add_node(self, node: NodePath) -> NodePath:
+        """Nós que não ficam sob a raiz (ex.: OnscreenText em aspect2d)."""
+        self.nodes.append(node)
+        return node
+
+    def on_release(self, callback: Callable[[], None]) -> None:
+        self.callbacks.append(callback)
+
+    def child(self, name: str, root: NodePath | None = None) -> "Owner":
+        owner = Owner(f"{self.name}/{name}", root)
+        self.children.append(owner)
+        return owner
+
+    # ───────────────────────── LIBERAÇÃO ─────────────────────────
+    def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+
+        for child in self.children:
+            child.release()
+        for task in self.tasks:
+            task.remove()
+        for interval in self.intervals:
+            interval.pause()
+        for sound in self.sounds:
+            sound.stop()
+        for callback in self.callbacks:
+            callback()
+        for node in self.collision_nodes + self.nodes:
+            if not node.isEmpty():
+                node.removeNode()
+        if self.root is not None and not self.root.isEmpty():
+            self.root.removeNode()
+
+        self.tasks.clear()
+        self.intervals.clear()
+        self.sounds.clear()
+        self.collision_nodes.clear()
+        self.nodes.clear()
+        self.callbacks.clear()
+
+    # ───────────────────────── RELATÓRIO ─────────────────────────
+    def report(self) -> dict:
+        """Recursos ainda vivos; depois de `release()` tudo deveria estar zerado."""
+        root_alive = self.root is not None and not self.root.isEmpty()
+        textures = geoms = nodepaths = 0
+        if root_alive:
+            nodepaths = self.root.findAllMatches("**").getNumPaths() + 1
+            textures = self.root.findAllTextures().getNumTextures()
+            geom_nodes = self.root.findAllMatches("**/+GeomNode")
+            geoms = sum(np_.node().getNumGeoms() for np_ in geom_nodes)
+            if isinstance(self.root.node(), GeomNode):
+                geoms += self.root.node().getNumGeoms()
+
+        row = {
+            "owner": self.name,
+            "released": self.released,
+            "tasks": sum(1 for t in self.tasks if t.isAlive()),
+            "intervals": sum(1 for i in self.intervals if i.isPlaying()),
+            "sounds": sum(1 for s in self.sounds if s.status() == AudioSound.PLAYING),
+            "nodepaths": nodepaths,
+            "textures": textures,
+            "geoms": geoms,
+        }
+        for child in self.children:
+            for key, value in child.report().items():
+                if isinstance(value, int) and not isinstance(value, bool) and key != "owner":
+                    row[key] += value
+        return row
+
+
+class LifecycleManager:
+    """Um Owner por sala (chave = índice da sala) e o relatório de vazamentos."""
+
+    def __init__(self, app):
+        self.app = app
+        self.owners: dict[object, Owner] = {}
+
+    def owner(self, key, root: NodePath | None = None, name: str | None = None) -> Owner:
+        if key not in self.owners:
+            self.owners[key] = Owner(name or f"sala {key}", root)
+        elif root is not None and self.owners[key].root is None:
+            self.owners[key].root = root
+        return self.owners[key]
+
+    def owner_of(self, node: NodePath) -> Owner | None:
+        """Owner da sala que contém `node` (pela tag "room_index" de algum ancestral)."""
+        if node.isEmpty():
+            return None
+        room = node.findNetPythonTag("room_index")
+        if room.isEmpty():
+            return None
+        return self.owners.get(room.getPythonTag("room_index"))
+
+    def release(self, key) -> None:
+        owner = self.owners.get(key)
+        if owner is not None:
+            owner.release()
+
+    def leak_report(self) -> list[dict]:
+        return [owner.report() for owner in self.owners.values()]
+
+    def print_report(self) -> None:
+        mgr = self.app.taskMgr.mgr
+        print(f"🧹 [Lifecycle] tasks vivas no TaskManager: {mgr.getNumTasks()}, "
+              f"nós sob o render: {self.app.render.findAllMatches('**').getNumPaths()}")
+        print(f"   {'dono':28s} {'estado':>9s} {'tasks':>6s} {'ivals':>6s} {'sons':>5s} "
+              f"{'nós':>6s} {'texturas':>9s} {'geoms':>6s}")
+        for row in self.leak_report():
+            state = "liberado" if row["released"] else "ativo"
+            print(f"   {row['owner']:28s} {state:>9s} {row['tasks']:6d} {row['intervals']:6d} "
+                  f"{row['sounds']:5d} {row['nodepaths']:6d} {row['textures']:9d} {row['geoms']:6d}")
@@ -1,8 +1,28 @@
 from panda3d.core import Material, ColorAttrib, CollisionNode, CollisionSphere, BitMask32
 
+from core.geom_builder import load_obj_fast
 
-def load_model_with_default_material(loader, path: str):
-    model = loader.loadModel(path)
+
+def load_model_with_default_material(loader, path: str, fast: bool = True):
+    """`fast` usa o parser NumPy para .obj no lugar do loader do Panda3D."""
+    if fast and str(path).endswith(".obj"):
+        model = load_obj_fast(path)
+    else:
+        model = loader.loadModel(path)
+    return apply_default_material(model, path)
+
+
+def load_model_with_default_material_async(async_loader, path: str, callback, *extra_args):
+    """Versão assíncrona: `callback(model, *extra_args)` recebe o modelo já preparado."""
+    def on_loaded(model, *args):
+        if model is not None:
+            apply_default_material(model, path)
+        callback(model, *args)
+
+    return async_loader.load(path, on_loaded, *extra_args)
+
+
+def apply_default_material(model, path: str):
     model.setTwoSided(True)
 
     # Material leve, só para reflexão sem sobrescrever vertex color
@@ -0,0 +1,151 @@
+# core/mesh_codec.py
+#
+# Formato binário compacto das malhas geradas (".pjm"), compartilhado entre o
+# fake_server (codifica) e o cliente (decodifica direto para GeomVertexData).
+# Só depende de NumPy, para o servidor não precisar do Panda3D.
+#
+#   cabeçalho  <4s H H I I>  magic "PJMB", versão, flags, nº de vértices, nº de índices
+#   payload    posições float32[n·3] | normais float32[n·3] | cores uint8[n·4] | índices uint32[m]
+#
+# Com FLAG_ZLIB o payload inteiro vem comprimido.
+
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+MAGIC   = b"PJMB"
+VERSION = 1
+HEADER  = struct.Struct("<4sHHII")
+
+FLAG_ZLIB    = 1 << 0
+FLAG_NORMALS = 1 << 1
+FLAG_COLORS  = 1 << 2
+
+SUFFIX = ".pjm"
+
+
+class MeshFormatError(ValueError):
+    """Arquivo .pjm inválido ou de versão desconhecida."""
+
+
+@dataclass
+class MeshBuffers:
+    """Seções do payload como buffers prontos para copiar para a GPU (sem cópia extra)."""
+    vertex_count: int
+    index_count: int
+    positions: memoryview
+    normals: memoryview | None
+    colors: memoryview | None
+    indices: memoryview
+
+
+def compute_normals(positions: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Normais por vértice ponderadas pela área das faces."""
+    p = positions.astype(np.float64)
+    face_n = np.cross(p[faces[:, 1]] - p[faces[:, 0]], p[faces[:, 2]] - p[faces[:, 0]])
+    corners = faces.reshape(-1)
+    normals = np.stack([np.bincount(corners, np.repeat(face_n[:, k], 3), minlength=len(p))
+                        for k in range(3)], axis=1)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    length[length == 0] = 1.0
+    return (normals / length).astype(np.float32)
+
+
+def colors_to_rgba8(colors: np.ndarray, count: int) -> np.ndarray:
+    """Cores 0..1 (RGB ou RGBA) → uint8 RGBA, o layout da coluna C_color."""
+    rgba = np.ones((count, 4), np.float32)
+    rgba[:, :colors.shape[1]] = colors
+    return np.clip(rgba * 255 + 0.5, 0, 255).astype(np.uint8)
+
+
+def _bytes(arr: np.ndarray) -> memoryview:
+    """Bytes de um array contíguo, sem cópia; `cast` não aceita forma com zero (malha vazia)."""
+    return memoryview(arr.reshape(-1).view(np.uint8))
+
+
+def buffers_from_arrays(positions: np.ndarray, faces: np.ndarray, colors: np.ndarray | None = None,
+                        normals: np.ndarray | None = None) -> MeshBuffers:
+    """MeshBuffers direto de arrays NumPy (sem passar por bytes codificados)."""
+    positions = np.ascontiguousarray(positions, dtype="<f4")
+    return MeshBuffers(
+        vertex_count=len(positions),
+        index_count=faces.size,
+        positions=_bytes(positions),
+        normals=_bytes(np.ascontiguousarray(normals, dtype="<f4")) if normals is not None else None,
+        colors=_bytes(colors_to_rgba8(colors, len(positions))) if colors is not None else None,
+        indices=_bytes(np.ascontiguousarray(faces, dtype="<u4")),
+    )
+
+
+def encode_mesh(positions: np.ndarray, faces: np.ndarray, colors: np.ndarray | None = None,
+                normals: np.ndarray | None = None, compress: bool = True, level: int = 6) -> bytes:
+    """`colors` em 0..1 (RGB ou RGBA); normais são calculadas se não vierem."""
+    positions = np.ascontiguousarray(positions, dtype="<f4")
+    indices = np.ascontiguousarray(faces, dtype="<u4").reshape(-1)
+    if normals is None and len(faces):
+        normals = compute_normals(positions, faces)
+
+    flags = 0
+    parts = [positions.tobytes()]
+    if normals is not None:
+        flags |= FLAG_NORMALS
+        parts.append(np.ascontiguousarray(normals, dtype="<f4").tobytes())
+    if colors is not None:
+        flags |= FLAG_COLORS
+        parts.append(colors_to_rgba8(colors, len(positions)).tobytes())
+    parts.append(indices.tobytes())
+
+    payload = b"".join(parts)
+    if compress:
+        flags |= FLAG_ZLIB
+        payload = zlib.compress(payload, level)
+
+    return HEADER.pack(MAGIC, VERSION, flags, len(positions), len(indices)) + payload
+
+
+def decode_mesh(data: bytes) -> MeshBuffers:
+    if len(data) < HEADER.size:
+        raise MeshFormatError("arquivo truncado")
+    magic, version, flags, n, m = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise MeshFormatError(f"cabeçalho inválido: {magic!r} v{version}")
+
+    payload = memoryview(data)[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        payload = memoryview(zlib.decompress(payload))
+
+    sizes = [("positions", n * 12)]
+    if flags & FLAG_NORMALS:
+        sizes.append(("normals", n * 12))
+    if flags & FLAG_COLORS:
+        sizes.append(("colors", n * 4))
+    sizes.append(("indices", m * 4))
+
+    if sum(size for _, size in sizes) != len(payload):
+        raise MeshFormatError("tamanho do payload não confere com o cabeçalho")
+
+    sections, offset = {}, 0
+    for name, size in sizes:
+        sections[name] = payload[offset: offset + size]
+        offset += size
+
+    return MeshBuffers(n, m, sections["positions"], sections.get("normals"),
+                       sections.get("colors"), sections["indices"])
+
+
+def read_mesh_arrays(path: str | Path) -> tuple[np.ndarray, np.ndarray | None, np.ndarray]:
+    """Lê um .pjm como arrays (posições, cores RGB 0..1, faces) para o pós-processamento."""
+    buffers = decode_mesh(Path(path).read_bytes())
+    positions = np.frombuffer(buffers.positions, "<f4").reshape(-1, 3)
+    colors = None
+    if buffers.colors is not None:
+        colors = np.frombuffer(buffers.colors, np.uint8).reshape(-1, 4)[:, :3].astype(np.float32) / 255
+    faces = np.frombuffer(buffers.indices, "<u4").reshape(-1, 3).astype(np.int64)
+    return positions, colors, faces
+
+
+def write_mesh_arrays(path: str | Path, positions, colors, faces, compress: bool = False) -> None:
+    Path(path).write_bytes(encode_mesh(positions, faces, colors, compress=compress))
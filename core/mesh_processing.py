@@ -0,0 +1,211 @@
+# core/mesh_processing.py
+#
+# Pós-processamento das malhas geradas, antes do loader do Panda3D:
+# solda vértices, remove faces degeneradas e decima até um orçamento de triângulos.
+# As funções de topo são puras (NumPy) para poderem rodar em um ProcessPoolExecutor.
+
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from core import mesh_codec
+from core.obj_parser import parse_obj
+
+DEFAULT_TRIANGLE_BUDGET = 20_000
+DEFAULT_WELD_TOLERANCE  = 1e-5
+
+
+@dataclass
+class MeshStats:
+    name: str
+    vertices_before: int
+    vertices_after: int
+    triangles_before: int
+    triangles_after: int
+    seconds: float
+
+    def __str__(self) -> str:
+        return (f"{self.name}: {self.triangles_before} → {self.triangles_after} tris, "
+                f"{self.vertices_before} → {self.vertices_after} vértices em {self.seconds:.2f}s")
+
+
+# ───────────────────────────── OBJ I/O ─────────────────────────────
+def read_obj(path: str | Path) -> tuple[np.ndarray, np.ndarray | None, np.ndarray]:
+    """Posições, cores por vértice (se houver) e faces trianguladas; ver core.obj_parser."""
+    mesh = parse_obj(path)
+    return mesh.positions, mesh.colors, mesh.faces
+
+
+def write_obj(path: str | Path, positions: np.ndarray, colors: np.ndarray | None, faces: np.ndarray) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        if colors is not None:
+            np.savetxt(f, np.hstack([positions, colors]), fmt="v %.6f %.6f %.6f %.4f %.4f %.4f")
+        else:
+            np.savetxt(f, positions, fmt="v %.6f %.6f %.6f")
+        np.savetxt(f, faces + 1, fmt="f %d %d %d")
+
+
+# ─────────────────────────── OPERAÇÕES ────────────────────────────
+def _merge_by_key(keys: np.ndarray, positions: np.ndarray, colors: np.ndarray | None, faces: np.ndarray):
+    """Funde vértices com a mesma chave inteira (média de posição/cor) e reindexa as faces."""
+    _, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    n = len(counts)
+
+    merged_pos = np.zeros((n, 3), np.float64)
+    np.add.at(merged_pos, inverse, positions)
+    merged_pos = (merged_pos / counts[:, None]).astype(np.float32)
+
+    merged_col = None
+    if colors is not None:
+        merged_col = np.zeros((n, 3), np.float64)
+        np.add.at(merged_col, inverse, colors)
+        merged_col = (merged_col / counts[:, None]).astype(np.float32)
+
+    return merged_pos, merged_col, inverse[faces]
+
+
+def weld_vertices(positions, colors, faces, tolerance: float = DEFAULT_WELD_TOLERANCE):
+    """Une vértices a menos de `tolerance` de distância (grade quantizada)."""
+    if len(positions) == 0:
+        return positions, colors, faces
+    keys = np.round(positions / tolerance).astype(np.int64)
+    return _merge_by_key(keys, positions, colors, faces)
+
+
+def drop_degenerate_faces(positions, faces, area_eps: float = 1e-12) -> np.ndarray:
+    """Remove faces com índices repetidos, área nula e duplicatas."""
+    if len(faces) == 0:
+        return faces
+    a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+    keep = (a != b) & (b != c) & (a != c)
+
+    p = positions.astype(np.float64)
+    cross = np.cross(p[b] - p[a], p[c] - p[a])
+    keep &= np.einsum("ij,ij->i", cross, cross) > area_eps
+
+    faces = faces[keep]
+    _, first = np.unique(np.sort(faces, axis=1), axis=0, return_index=True)
+    return faces[np.sort(first)]
+
+
+def _cluster(positions, colors, faces, resolution: int):
+    lo = positions.min(axis=0)
+    extent = max(float((positions.max(axis=0) - lo).max()), 1e-9)
+    keys = np.floor((positions - lo) / extent * resolution).astype(np.int64)
+    pos, col, f = _merge_by_key(keys, positions, colors, faces)
+    return pos, col, drop_degenerate_faces(pos, f)
+
+
+def decimate(positions, colors, faces, triangle_budget: int):
+    """
+    Decimação por agrupamento de vértices em grade: busca binária a maior
+    resolução cuja malha resultante cabe em `triangle_budget`.
+    """
+    if len(faces) <= triangle_budget:
+        return positions, colors, faces
+
+    best = None
+    lo, hi = 1, 1024
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        candidate = _cluster(positions, colors, faces, mid)
+        if len(candidate[2]) <= triangle_budget:
+            best, lo = candidate, mid + 1
+        else:
+            hi = mid - 1
+
+    if best is None:
+        best = _cluster(positions, colors, faces, 1)
+
+    # Compacta: remove vértices que não são mais referenciados
+    pos, col, f = best
+    used, remap = np.unique(f, return_inverse=True)
+    return pos[used], (col[used] if col is not None else None), remap.reshape(-1, 3)
+
+
+def read_mesh(path: str | Path):
+    if Path(path).suffix == mesh_codec.SUFFIX:
+        return mesh_codec.read_mesh_arrays(path)
+    return read_obj(path)
+
+
+def write_mesh(path: str | Path, positions, colors, faces) -> None:
+    """Escreve num temporário ao lado e troca com `os.replace`: quem lê nunca pega metade."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=path.suffix)
+    os.close(fd)
+    try:
+        if path.suffix == mesh_codec.SUFFIX:
+            mesh_codec.write_mesh_arrays(tmp, positions, colors, faces, compress=False)
+        else:
+            write_obj(tmp, positions, colors, faces)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def simplify_mesh(src: str, dst: str, triangle_budget: int = DEFAULT_TRIANGLE_BUDGET,
+                  weld_tolerance: float = DEFAULT_WELD_TOLERANCE) -> MeshStats:
+    """Pipeline completo de um arquivo (.obj ou .pjm); roda dentro do processo worker."""
+    start = time.perf_counter()
+    positions, colors, faces = read_mesh(src)
+    v_before, t_before = len(positions), len(faces)
+
+    positions, colors, faces = weld_vertices(positions, colors, faces, weld_tolerance)
+    faces = drop_degenerate_faces(positions, faces)
+    positions, colors, faces = decimate(positions, colors, faces, triangle_budget)
+
+    write_mesh(dst, positions, colors, faces)
+    return MeshStats(Path(src).name, v_before, len(positions), t_before, len(faces),
+                     time.perf_counter() - start)
+
+
+# ─────────────────────────── WORKER POOL ───────────────────────────
+class MeshProcessor:
+    """Executa `simplify_mesh` em um pool de processos sem bloquear o loop asyncio."""
+
+    def __init__(self, triangle_budget: int = DEFAULT_TRIANGLE_BUDGET,
+                 weld_tolerance: float = DEFAULT_WELD_TOLERANCE, max_workers: int = 2):
+        self.triangle_budget = triangle_budget
+        self.weld_tolerance = weld_tolerance
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        self._in_flight: dict[Path, asyncio.Future] = {}    # destino → decimação em andamento
+        self.history: list[MeshStats] = []
+
+    def output_path(self, src: str | Path) -> Path:
+        src = Path(src)
+        return src.with_name(f"{src.stem}.t{self.triangle_budget}{src.suffix}")
+
+    async def process(self, src: str | Path) -> str:
+        dst = self.output_path(src)
+        if dst.exists() and dst.stat().st_mtime >= Path(src).stat().st_mtime:
+            return str(dst)
+
+        # Jobs com a mesma malha baixada (mesmo `src`) esperam a mesma decimação
+        pending = self._in_flight.get(dst)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = self._in_flight[dst] = loop.run_in_executor(
+                self._pool, simplify_mesh, str(src), str(dst), self.triangle_budget, self.weld_tolerance)
+            pending.add_done_callback(lambda _: self._in_flight.pop(dst, None))
+            pending.add_done_callback(self._log_stats)
+        await asyncio.shield(pending)
+        return str(dst)
+
+    def _log_stats(self, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        stats = future.result()
+        self.history.append(stats)
+        print(f"🔧 [MeshProcessor] {stats}")
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,93 @@
+# core/obj_parser.py
+#
+# Parser de OBJ vetorizado: as linhas "v" e "f" são extraídas em bloco (regex em C)
+# e convertidas com NumPy de uma vez, sem laço Python por vértice ou por face.
+# Só depende de NumPy; a montagem do Geom fica em core.geom_builder.
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# O grupo para antes de um "#": comentário no fim da linha ("f 1 2 3 # tampa") é válido
+_V_LINES    = re.compile(rb"^v[ \t]+([^\r\n#]*)", re.M)
+_F_LINES    = re.compile(rb"^f[ \t]+([^\r\n#]*)", re.M)
+_FACE_EXTRA = re.compile(rb"/[^\s]*")            # "7/3/2" → "7"
+
+_SPACE, _TAB, _NEWLINE = ord(" "), ord("\t"), ord("\n")
+
+
+@dataclass
+class ObjMesh:
+    positions: np.ndarray            # float32 (n, 3)
+    colors: np.ndarray | None        # float32 (n, 3) em 0..1, se o OBJ tiver cor por vértice
+    faces: np.ndarray                # int64 (m, 3), já triangulado
+
+
+def _parse_floats(lines: list[bytes]) -> np.ndarray:
+    width = len(lines[0].split())
+    flat = np.array(b" ".join(lines).split(), dtype=np.float32)
+    if flat.size == width * len(lines):
+        return flat.reshape(-1, width)
+
+    # Largura variável (ex.: algumas linhas com cor, outras sem): usa o mínimo comum
+    rows = [line.split() for line in lines]
+    width = min(len(r) for r in rows)
+    return np.array([r[:width] for r in rows], dtype=np.float32)
+
+
+def _tokens_per_line(blob: bytes) -> np.ndarray:
+    """Quantos tokens há em cada linha de `blob` (linhas separadas por '\\n')."""
+    arr = np.frombuffer(blob, dtype=np.uint8)
+    is_space = (arr == _SPACE) | (arr == _TAB) | (arr == _NEWLINE)
+    prev_space = np.concatenate(([True], is_space[:-1]))
+    starts = ~is_space & prev_space
+    line_of = np.concatenate(([0], np.cumsum(arr == _NEWLINE)[:-1]))
+    return np.bincount(line_of[starts], minlength=int(line_of[-1]) + 1 if len(arr) else 0)
+
+
+def _triangulate(flat: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Triangulação em leque de polígonos com `counts` vértices cada."""
+    counts = counts[counts > 0]
+    if np.all(counts == 3):
+        return flat.reshape(-1, 3)
+
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    valid = counts >= 3
+    n_tris = np.where(valid, counts - 2, 0)
+    poly = np.repeat(np.arange(len(counts)), n_tris)
+    # j = 1..k-2 dentro de cada polígono
+    j = np.arange(n_tris.sum()) - np.repeat(np.cumsum(n_tris) - n_tris, n_tris) + 1
+    base = offsets[poly]
+    return np.stack([flat[base], flat[base + j], flat[base + j + 1]], axis=1)
+
+
+def parse_obj(path: str | Path) -> ObjMesh:
+    """
+    Lê posições, cores por vértice (`v x y z r g b`) e faces de um OBJ.
+    UVs/normais são ignoradas; índices negativos são resolvidos contra o total de
+    vértices (o que vale para OBJs que declaram todos os vértices antes das faces).
+    """
+    data = Path(path).read_bytes()
+
+    v_lines = _V_LINES.findall(data)
+    if not v_lines:
+        return ObjMesh(np.zeros((0, 3), np.float32), None, np.zeros((0, 3), np.int64))
+
+    verts = _parse_floats(v_lines)
+    positions = np.ascontiguousarray(verts[:, :3])
+    colors = np.ascontiguousarray(verts[:, 3:6]) if verts.shape[1] >= 6 else None
+
+    f_lines = _F_LINES.findall(data)
+    if not f_lines:
+        return ObjMesh(positions, colors, np.zeros((0, 3), np.int64))
+
+    blob = _FACE_EXTRA.sub(b"", b"\n".join(f_lines))
+    flat = np.array(blob.split(), dtype=np.int64)
+    flat = np.where(flat > 0, flat - 1, len(positions) + flat)
+    if len(flat) and (flat.min() < 0 or flat.max() >= len(positions)):
+        raise ValueError(f"{path}: face com índice fora dos {len(positions)} vértices")
+
+    faces = _triangulate(flat, _tokens_per_line(blob))
+    return ObjMesh(positions, colors, faces)
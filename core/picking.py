@@ -0,0 +1,100 @@
+# core/picking.py
+
+from typing import Callable
+
+from direct.showbase.ShowBaseGlobal import globalClock
+from direct.task import Task
+from panda3d.core import (NodePath, Point3, BitMask32, CollisionTraverser, CollisionHandlerQueue,
+                          CollisionRay, CollisionNode)
+
+from core.profiler import region
+
+PickCallback = Callable[[Point3 | None], None]
+
+
+class PickingService:
+    """
+    Um único raio no centro da câmera, lançado no máximo uma vez por frame e só
+    contra as salas próximas do jogador. O resultado (ponto de contato em
+    coordenadas do render, ou None) é compartilhado com todos os inscritos.
+    """
+
+    def __init__(self, app, mask: BitMask32 = BitMask32.bit(1)):
+        self.app = app
+        self.traverser = CollisionTraverser("picking")
+        self.queue = CollisionHandlerQueue()
+
+        ray = CollisionRay()
+        ray.setFromLens(self.app.camNode, 0, 0)
+        ray_node = CollisionNode("pick_ray")
+        ray_node.addSolid(ray)
+        ray_node.setFromCollideMask(mask)
+        ray_node.setIntoCollideMask(BitMask32.allOff())
+        self.ray_np = self.app.camera.attachNewNode(ray_node)
+        self.traverser.addCollider(self.ray_np, self.queue)
+
+        self.hit: Point3 | None = None
+        self.hit_node: NodePath | None = None
+        self._frame = -1
+        self._subscribers: list[PickCallback] = []
+
+        # Roda antes das tasks de prévia (sort padrão 0)
+        self.app.taskMgr.add(self._update, "picking-update", sort=-10)
+
+    # ───────────────────────── API ─────────────────────────
+    def subscribe(self, callback: PickCallback) -> None:
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: PickCallback) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def pick_now(self) -> Point3 | None:
+        """Resultado do frame atual; lança o raio só se ainda não foi lançado neste frame."""
+        if self._frame != globalClock.getFrameCount():
+            self._cast()
+        return self.hit
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _pick_roots(self) -> list[NodePath]:
+        """Sala atual e vizinhas na sequência; o render inteiro só como último recurso."""
+        sm = getattr(self.app, "scene_manager", None)
+        if sm is None or not sm.rooms:
+            return [self.app.render]
+
+        i = sm.room_index
+        roots = [r for r in sm.rooms[max(0, i - 1): i + 2] if not r.isEmpty() and r.hasParent()]
+        return roots or [self.app.render]
+
+    def _cast(self) -> None:
+        self._frame = globalClock.getFrameCount()
+        best, best_dist = None, None
+
+        for root in self._pick_roots():
+            with region("collision-traverse"):
+                self.traverser.traverse(root)
+            if self.queue.getNumEntries() == 0:
+                continue
+            self.queue.sortEntries()
+            entry = self.queue.getEntry(0)
+            point = entry.getSurfacePoint(self.app.render)
+            dist = (point - self.ray_np.getPos(self.app.render)).lengthSquared()
+            if best_dist is None or dist < best_dist:
+                best, best_dist = entry, dist
+
+        if best is None:
+            self.hit = None
+            self.hit_node = None
+        else:
+            self.hit = best.getSurfacePoint(self.app.render)
+            self.hit_node = best.getIntoNodePath()
+
+    def _update(self, task):
+        if not self._subscribers:
+            return Task.cont
+
+        self._cast()
+        for callback in list(self._subscribers):
+            callback(self.hit)
+        return Task.cont
@@ -0,0 +1,178 @@
+# core/profiler.py
+#
+# Instrumentação por frame: tempo de cada task do TaskManager e de regiões
+# nomeadas do código ("room-build", "texture-load", ...), um buffer circular dos
+# últimos frames e um dump em JSON sempre que um frame passa do limite.
+#
+#   PROJETAO_PROFILE=1           liga o profiler
+#   PROJETAO_HITCH_MS=50         limite de um frame "engasgado"
+#   PROJETAO_PSTATS=1            também envia as regiões para o PStats
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from direct.task import Task
+from panda3d.core import PStatClient, PStatCollector
+
+_active: "FrameProfiler | None" = None
+
+_INSTANCE_SUFFIX = re.compile(r"-\d+$")      # "progress-task-1403" → "progress-task-*"
+
+
+def region(name: str):
+    """Cronometra um trecho no frame atual; sem profiler ativo não custa nada."""
+    return _active.region(name) if _active is not None else nullcontext()
+
+
+def task_group(name: str) -> str:
+    return _INSTANCE_SUFFIX.sub("-*", name)
+
+
+class FrameProfiler:
+    """
+    Envolve a função de cada task (inclusive as que o ShowBase registra, como
+    igLoop e collisionLoop) num cronômetro: as existentes ao ligar e as novas na
+    hora do `taskMgr.add`/`doMethodLater`. No início de cada frame fecha o frame
+    anterior: total, tempo por task e por região vão para o buffer circular; se o
+    total passou de `threshold_ms`, o buffer inteiro vai para um JSON em `dump_dir`.
+    Tasks das chains com thread própria somam no mesmo frame, sob `_lock`.
+    """
+
+    def __init__(self, app, threshold_ms: float = 50.0, history: int = 300,
+                 dump_dir: str | Path = "profiles", min_dump_interval: float = 1.0,
+                 pstats: bool = False):
+        global _active
+        self.app = app
+        self.threshold_ms = threshold_ms
+        self.frames: deque[dict] = deque(maxlen=history)
+        self.dump_dir = Path(dump_dir)
+        self.min_dump_interval = min_dump_interval
+        self.hitches = 0
+        self.dumps: list[Path] = []
+
+        self._frame = 0
+        self._frame_start = time.perf_counter()
+        self._tasks: dict[str, float] = {}
+        self._regions: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._last_dump = 0.0
+
+        self.pstats = pstats and PStatClient.connect()
+        self._collectors: dict[str, PStatCollector] = {}
+
+        self._wrap_tasks()
+        self._hook_task_manager()
+        self.app.taskMgr.add(self._begin_frame, "profiler-frame", sort=-10_000)
+        _active = self
+
+    # ───────────────────────── API ─────────────────────────
+    @contextmanager
+    def region(self, name: str):
+        collector = self._collector(name) if self.pstats else None
+        if collector:
+            collector.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._regions[name] = self._regions.get(name, 0.0) + elapsed
+            if collector:
+                collector.stop()
+
+    def summary(self, top: int = 10) -> list[tuple[str, float, float]]:
+        """(task ou região, média ms, pior ms) no buffer, das mais caras para as mais baratas."""
+        totals: dict[str, list[float]] = {}
+        for frame in self.frames:
+            for name, ms in {**frame["tasks"], **frame["regions"]}.items():
+                totals.setdefault(task_group(name), []).append(ms)
+        rows = [(name, sum(v) / len(self.frames), max(v)) for name, v in totals.items()]
+        return sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+
+    def close(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+        self.app.taskMgr.remove("profiler-frame")
+        for name in ("add", "doMethodLater"):
+            self.app.taskMgr.__dict__.pop(name, None)      # volta ao método da classe
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _collector(self, name: str) -> PStatCollector:
+        if name not in self._collectors:
+            self._collectors[name] = PStatCollector(f"App:Regions:{name}")
+        return self._collectors[name]
+
+    def _wrap_tasks(self) -> None:
+        for task in self.app.taskMgr.mgr.getTasks():
+            self._wrap(task)
+
+    def _wrap(self, task) -> None:
+        fn = getattr(task, "getFunction", None) and task.getFunction()
+        if callable(fn) and not getattr(fn, "_profiled", False):
+            task.setFunction(self._timed(task.getName(), fn))
+
+    def _hook_task_manager(self) -> None:
+        """Tasks novas (prévias, remoção de balões, ...) são envolvidas ao entrar, sem varrer a lista por frame."""
+        task_mgr = self.app.taskMgr
+        for name in ("add", "doMethodLater"):
+            def hooked(*args, _original=getattr(task_mgr, name), **kwargs):
+                task = _original(*args, **kwargs)
+                self._wrap(task)
+                return task
+            setattr(task_mgr, name, hooked)
+
+    def _timed(self, name: str, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                with self._lock:
+                    self._tasks[name] = self._tasks.get(name, 0.0) + elapsed
+        timed._profiled = True
+        return timed
+
+    def _begin_frame(self, task):
+        now = time.perf_counter()
+        with self._lock:
+            tasks, regions = self._tasks, self._regions
+            self._tasks, self._regions = {}, {}
+        record = {
+            "frame": self._frame,
+            "ms": (now - self._frame_start) * 1000,
+            "tasks": tasks,
+            "regions": regions,
+        }
+        self.frames.append(record)
+        if record["ms"] > self.threshold_ms and self._frame > 0:
+            self._on_hitch(record, now)
+
+        self._frame += 1
+        self._frame_start = now
+        return Task.cont
+
+    def _on_hitch(self, record: dict, now: float) -> None:
+        self.hitches += 1
+        worst = max({**record["tasks"], **record["regions"]}.items(), key=lambda kv: kv[1], default=("?", 0.0))
+        print(f"🐢 [Profiler] Frame {record['frame']} levou {record['ms']:.1f} ms "
+              f"(maior: {worst[0]} {worst[1]:.1f} ms)")
+
+        if now - self._last_dump < self.min_dump_interval:
+            return
+        self._last_dump = now
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        path = self.dump_dir / f"hitch-{record['frame']:06d}.json"
+        path.write_text(json.dumps({
+            "threshold_ms": self.threshold_ms,
+            "hitch": record,
+            "recent_frames": list(self.frames),
+        }, indent=1), encoding="utf-8")
+        self.dumps.append(path)
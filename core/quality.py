@@ -0,0 +1,145 @@
+# core/quality.py
+#
+# Qualidade adaptativa: mede o tempo de frame e sobe/desce um nível quando o
+# p90 da janela sai da faixa em volta do alvo. Cada nível ajusta a densidade da
+# decoração, o LOD mínimo das texturas, a distância do balão dos NPCs, o
+# orçamento de triângulos das malhas geradas e quantas salas ficam na cena.
+# Balão e orçamento configurados (npc.speech_distance, mesh.triangle_budget) são
+# o teto: o nível só os reduz.
+#
+#   PROJETAO_QUALITY=auto        auto (padrão) | low | medium | high (fixo) | off
+#   PROJETAO_TARGET_MS=16.7      alvo de tempo de frame
+#   PROJETAO_QUALITY_LOG=...     JSONL com as trocas de nível (padrão profiles/quality.jsonl)
+
+import json
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+from direct.showbase.ShowBaseGlobal import globalClock
+from direct.task import Task
+from panda3d.core import SamplerState, Texture, TexturePool
+
+
+@dataclass(frozen=True)
+class QualityTier:
+    name: str
+    decor_density: float           # fração das cópias de decoração desenhadas
+    texture_lod: int               # nível de mipmap mínimo (0 = resolução cheia)
+    speech_distance: float         # raio do balão dos NPCs (no máximo o configurado)
+    triangle_budget: int           # malhas geradas pelo prompt (no máximo o configurado)
+    resident_rooms: int | None     # salas vizinhas na cena (None = todas)
+
+
+TIERS = (
+    QualityTier("low",    decor_density=.35, texture_lod=2, speech_distance=6.0,
+                triangle_budget=5_000,  resident_rooms=1),
+    QualityTier("medium", decor_density=.7,  texture_lod=1, speech_distance=8.0,
+                triangle_budget=10_000, resident_rooms=2),
+    QualityTier("high",   decor_density=1.0, texture_lod=0, speech_distance=10.0,
+                triangle_budget=20_000, resident_rooms=None),
+)
+
+
+class QualityController:
+    """
+    Janela dos últimos `window` frames; p90 acima de `target_ms × down_ratio`
+    desce um nível, abaixo de `target_ms × up_ratio` sobe um. Depois de cada
+    troca a janela recomeça e há uma espera (maior para subir), para não oscilar
+    entre dois níveis.
+    """
+
+    def __init__(self, app, target_ms: float = 1000 / 60, tier: str = "high", adaptive: bool = True,
+                 window: int = 90, down_ratio: float = 1.2, up_ratio: float = .6,
+                 down_cooldown: float = 2.0, up_cooldown: float = 8.0,
+                 log_path: str | Path | None = "profiles/quality.jsonl",
+                 resident_rooms: dict[str, int | None] | None = None, texture_sweep: float = 1.0):
+        self.app = app
+        # janela de salas residentes por nível pode vir de config/settings.py
+        self.tiers = tuple(replace(t, resident_rooms=resident_rooms.get(t.name, t.resident_rooms))
+                           for t in TIERS) if resident_rooms else TIERS
+        # Valores da configuração, já aplicados nos sistemas: teto para todos os níveis
+        self.max_speech_distance = app.scene_manager.npc_manager.system.speech_distance
+        self.max_triangle_budget = app.mesh_processor.triangle_budget
+        self.target_ms = target_ms
+        self.down_ratio, self.up_ratio = down_ratio, up_ratio
+        self.down_cooldown, self.up_cooldown = down_cooldown, up_cooldown
+        self.log_path = Path(log_path) if log_path else None
+        self.frame_ms: deque[float] = deque(maxlen=window)
+        self.changes: list[dict] = []
+        self._index = [t.name for t in self.tiers].index(tier)
+        self._last_change = time.monotonic()
+        self._start = self._last_change
+
+        self.apply(self.tier)
+        print(f"🎚️ [Quality] Nível inicial: {tier} (alvo {target_ms:.1f} ms"
+              f"{', adaptativo' if adaptive else ''})")
+        self.task = self.app.taskMgr.add(self._update, "quality-controller") if adaptive else None
+        # Texturas carregadas depois da troca (salas novas, decoração, prévias) entram no LOD do nível
+        self.texture_task = self.app.taskMgr.doMethodLater(texture_sweep, self._sweep_textures,
+                                                           "quality-textures")
+
+    @property
+    def tier(self) -> QualityTier:
+        return self.tiers[self._index]
+
+    # ───────────────────────── API ─────────────────────────
+    def apply(self, tier: QualityTier) -> None:
+        app = self.app
+        app.decor.set_density(tier.decor_density)
+        app.scene_manager.npc_manager.system.set_speech_distance(min(tier.speech_distance, self.max_speech_distance))
+        app.scene_manager.set_resident_rooms(tier.resident_rooms)
+        app.mesh_processor.triangle_budget = min(tier.triangle_budget, self.max_triangle_budget)
+        self._apply_texture_lod(tier.texture_lod)
+
+    def p90(self) -> float:
+        ordered = sorted(self.frame_ms)
+        return ordered[int(.9 * (len(ordered) - 1))]
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    @staticmethod
+    def _apply_texture_lod(level: int) -> None:
+        """Sobe o mipmap mínimo das texturas carregadas: menos memória de textura amostrada."""
+        for tex in TexturePool.findAllTextures():
+            if tex.getTextureType() != Texture.TT_2d_texture or tex.getDefaultSampler().getMinLod() == level:
+                continue
+            sampler = SamplerState(tex.getDefaultSampler())
+            if level > 0 and not SamplerState.isMipmap(sampler.getMinfilter()):
+                sampler.setMinfilter(SamplerState.FT_linear_mipmap_linear)
+            sampler.setMinLod(level)
+            tex.setDefaultSampler(sampler)
+
+    def _sweep_textures(self, task):
+        self._apply_texture_lod(self.tier.texture_lod)
+        return Task.again
+
+    def _step(self, delta: int, p90: float) -> None:
+        old = self.tier
+        self._index += delta
+        self.apply(self.tier)
+        self._last_change = time.monotonic()
+        self.frame_ms.clear()
+
+        change = {"t": round(self._last_change - self._start, 2), "from": old.name, "to": self.tier.name,
+                  "p90_ms": round(p90, 2), "target_ms": round(self.target_ms, 2), "tier": asdict(self.tier)}
+        self.changes.append(change)
+        arrow = "⬇️" if delta < 0 else "⬆️"
+        print(f"{arrow} [Quality] {old.name} → {self.tier.name} (p90 {p90:.1f} ms, alvo {self.target_ms:.1f} ms)")
+        if self.log_path is not None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.log_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(change, ensure_ascii=False) + "\n")
+
+    def _update(self, task):
+        self.frame_ms.append(globalClock.getDt() * 1000)
+        if len(self.frame_ms) < self.frame_ms.maxlen:
+            return Task.cont
+
+        p90 = self.p90()
+        since = time.monotonic() - self._last_change
+        if p90 > self.target_ms * self.down_ratio and self._index > 0 and since >= self.down_cooldown:
+            self._step(-1, p90)
+        elif p90 < self.target_ms * self.up_ratio and self._index < len(self.tiers) - 1 and since >= self.up_cooldown:
+            self._step(+1, p90)
+        return Task.cont
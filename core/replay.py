@@ -0,0 +1,130 @@
+# core/replay.py
+#
+# Gravação e reprodução de sessões para benchmarks reproduzíveis.
+#
+#   PROJETAO_RECORD=sessao.jsonl python main.py      grava uma sessão
+#   python -m benchmarks.bench_replay sessao.jsonl   reproduz offscreen e mede
+#
+# Uma linha JSON por evento, com `t` em segundos desde o início da gravação:
+#   {"type": "meta", "seed": 1234}
+#   {"type": "pose", "t": 0.53, "pos": [x, y, z], "h": 90.0, "p": -5.0}
+#   {"type": "prompt", "t": 7.10, "text": "garrafa"}
+#   {"type": "click", "t": 9.82}
+#
+# A pose é gravada no lugar do mouse/teclado: offscreen não há ponteiro, e a
+# posição já vem resolvida pela colisão.
+
+import json
+import time
+from pathlib import Path
+
+from direct.showbase.DirectObject import DirectObject
+from direct.task import Task
+
+
+def load_session(path: str | Path) -> tuple[dict, list[dict]]:
+    """(meta, eventos em ordem de tempo)."""
+    meta, events = {}, []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["type"] == "meta":
+                meta = event
+            else:
+                events.append(event)
+    events.sort(key=lambda e: e["t"])
+    return meta, events
+
+
+class InputRecorder(DirectObject):
+    """Grava pose do jogador (a `rate` Hz), prompts enviados e cliques de confirmação."""
+
+    def __init__(self, app, path: str | Path, seed: int | None = None, rate: float = 30.0):
+        DirectObject.__init__(self)
+        self.app = app
+        self.path = Path(path)
+        self.interval = 1.0 / rate
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._start = time.perf_counter()
+        self._last_pose = -1.0
+
+        self._write({"type": "meta", "seed": seed, "rate": rate})
+        self.accept("prompt-submitted", self._on_prompt)
+        self.accept("mouse1", self._on_click)
+        # Depois do PlayerControllerUpdate (sort 0): grava a pose já resolvida no frame
+        self.app.taskMgr.add(self._sample_pose, "replay-record", sort=10)
+        self.app.finalExitCallbacks.append(self.close)
+        print(f"⏺️ [Replay] Gravando sessão em {self.path}")
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._start
+
+    def _write(self, event: dict) -> None:
+        if not self._file.closed:
+            self._file.write(json.dumps(event) + "\n")
+
+    def _on_prompt(self, text: str):
+        self._write({"type": "prompt", "t": self._now(), "text": text})
+
+    def _on_click(self):
+        self._write({"type": "click", "t": self._now()})
+
+    def _sample_pose(self, task):
+        t = self._now()
+        if t - self._last_pose >= self.interval:
+            self._last_pose = t
+            node = self.app.player_controller.node
+            pos = node.getPos(self.app.render)
+            self._write({"type": "pose", "t": t, "pos": [pos.getX(), pos.getY(), pos.getZ()],
+                         "h": node.getH(), "p": self.app.player_controller.pitch})
+        return Task.cont
+
+    def close(self) -> None:
+        self.ignoreAll()
+        self.app.taskMgr.remove("replay-record")
+        self._file.close()
+
+
+class ReplayDriver:
+    """Aplica os eventos gravados no tempo certo; `finished` depois do último + `tail` segundos."""
+
+    def __init__(self, app, events: list[dict], tail: float = 5.0):
+        self.app = app
+        self.events = events
+        self.tail = tail
+        self.finished = False
+        self._next = 0
+        self._start = None
+        self.end_time = (events[-1]["t"] if events else 0.0) + tail
+
+        self.app.taskMgr.add(self._step, "replay-drive", sort=-20)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start if self._start is not None else 0.0
+
+    def _apply(self, event: dict) -> None:
+        kind = event["type"]
+        if kind == "pose":
+            pc = self.app.player_controller
+            pc.node.setPos(self.app.render, *event["pos"])
+            pc.node.setH(event["h"])
+            pc.pitch = event["p"]
+            self.app.camera.setP(event["p"])
+        elif kind == "prompt":
+            self.app.handle_prompt_submission(event["text"])
+        elif kind == "click":
+            self.app.placer.confirm_preview_under_cursor()
+
+    def _step(self, task):
+        if self._start is None:
+            self._start = time.perf_counter()
+        t = self.elapsed()
+        while self._next < len(self.events) and self.events[self._next]["t"] <= t:
+            self._apply(self.events[self._next])
+            self._next += 1
+        if t >= self.end_time:
+            self.finished = True
+            return Task.done
+        return Task.cont
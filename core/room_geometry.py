@@ -0,0 +1,96 @@
+# core/room_geometry.py
+#
+# Casca da sala (chão, teto, paredes e batentes) escrita direto num
+# GeomVertexData a partir de gabaritos NumPy, com UVs já calculados: sem
+# loadModel("rgbCube") por peça, sem TexGen e sem transformação por nó.
+# O resultado é um GeomNode com um Geom por textura.
+
+from collections import defaultdict
+
+import numpy as np
+from panda3d.core import (Geom, GeomEnums, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat,
+                          RenderState, TextureAttrib)
+
+from core.profiler import region
+
+# Mesma densidade da antiga TexGen (posição no mundo × rotação de 90° × escala 0.2, 0.4)
+UV_SCALE = (0.2, 0.4)
+
+
+def _face_template() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cubo unitário (±0.5): 6 faces × 4 vértices, anti-horário visto de fora."""
+    corners = [(-.5, -.5), (.5, -.5), (.5, .5), (-.5, .5)]
+    positions, axes, signs = [], [], []
+    for axis in range(3):
+        a, b = (axis + 1) % 3, (axis + 2) % 3
+        for sign in (1, -1):
+            quad = corners if sign > 0 else corners[::-1]
+            for ca, cb in quad:
+                p = [0.0, 0.0, 0.0]
+                p[axis], p[a], p[b] = .5 * sign, ca, cb
+                positions.append(p)
+            axes.append(axis)
+            signs.append(sign)
+    return (np.array(positions, np.float32), np.array(axes, np.int8), np.array(signs, np.int8))
+
+
+_FACE_POSITIONS, _FACE_AXES, _FACE_SIGNS = _face_template()
+_VERTEX_AXES = np.repeat(_FACE_AXES, 4)
+_QUAD_INDICES = np.array([0, 1, 2, 0, 2, 3], np.uint32)
+
+
+def _with_uvs(positions: np.ndarray, axes: np.ndarray) -> np.ndarray:
+    """
+    (n, 5): posição + UV. Projeção da TexGen antiga (u = -0.2·y, v = 0.4·x) nas
+    faces horizontais; nas verticais a coordenada da normal é trocada pela altura,
+    para não esticar a textura. Coordenadas locais da sala bastam: CELL × escala
+    é inteiro, então a textura se repete igual em qualquer sala.
+    """
+    x = np.where(axes == 0, positions[:, 2], positions[:, 0])
+    y = np.where(axes == 1, positions[:, 2], positions[:, 1])
+    return np.column_stack([positions, -UV_SCALE[0] * y, UV_SCALE[1] * x])
+
+
+class RoomShellBuilder:
+    """Acumula faces por textura; `build()` escreve tudo de uma vez (um Geom por textura)."""
+
+    def __init__(self):
+        self._faces: dict[str, list[np.ndarray]] = defaultdict(list)     # textura → [(n, 5) pos+uv]
+
+    def add_face(self, texture: str, center, size, axis: int, sign: int) -> None:
+        face = 2 * axis + (0 if sign > 0 else 1)
+        rows = slice(face * 4, face * 4 + 4)
+        positions = _FACE_POSITIONS[rows] * np.asarray(size, np.float32) + np.asarray(center, np.float32)
+        self._faces[texture].append(_with_uvs(positions, _VERTEX_AXES[rows]))
+
+    def add_box(self, texture: str, center, size) -> None:
+        """Caixa alinhada aos eixos; `size` é o tamanho total (a antiga escala do rgbCube)."""
+        positions = _FACE_POSITIONS * np.asarray(size, np.float32) + np.asarray(center, np.float32)
+        self._faces[texture].append(_with_uvs(positions, _VERTEX_AXES))
+
+    def build(self, loader, name: str = "room-shell") -> GeomNode:
+        node = GeomNode(name)
+        for texture_path, faces in self._faces.items():
+            with region("texture-load"):
+                texture = loader.loadTexture(texture_path)
+            node.addGeom(self._geom(np.concatenate(faces), name),
+                         RenderState.make(TextureAttrib.make(texture)))
+        return node
+
+    @staticmethod
+    def _geom(vertices: np.ndarray, name: str) -> Geom:
+        vdata = GeomVertexData(name, GeomVertexFormat.getV3t2(), Geom.UHStatic)
+        vdata.uncleanSetNumRows(len(vertices))
+        memoryview(vdata.modifyArray(0)).cast("B")[:] = vertices.astype(np.float32).tobytes()
+
+        quads = len(vertices) // 4
+        indices = (_QUAD_INDICES[None, :] + 4 * np.arange(quads, dtype=np.uint32)[:, None]).ravel()
+        prim = GeomTriangles(Geom.UHStatic)
+        prim.setIndexType(GeomEnums.NT_uint32)
+        array = prim.modifyVertices()
+        array.uncleanSetNumRows(len(indices))
+        memoryview(array).cast("B")[:] = indices.tobytes()
+
+        geom = Geom(vdata)
+        geom.addPrimitive(prim)
+        return geom
@@ -1,36 +1,41 @@
 # scene_manager.py
 from pathlib import Path
 import random
+import time
 from math import sin, degrees, atan2
 from glob import glob
 
 from direct.interval.LerpInterval import LerpHprInterval
 from panda3d.core import (
     NodePath, LVector3f, CardMaker, CollisionNode, CollisionBox, Point3, Vec3,
-    CollisionPlane, BitMask32, Plane, TextureStage, TexGenAttrib, TransformState,
-    LMatrix4f, LVecBase3f, TextNode, Filename, Texture
+    CollisionPlane, BitMask32, Plane, TextureStage, TexGenAttrib, TextNode, Filename, Texture
 )
 
 from direct.gui.OnscreenText import OnscreenText
 from direct.task import Task
 
-from core.load_wrapper import load_model_with_default_material
+from core.poisson import Capsule, Circle, poisson_disk
+from core.profiler import region
+from core.room_geometry import RoomShellBuilder
 from npc.npc_manager import NPCManager
 
 
 class SceneManager:
-    # ─────────────── CONSTANTES DE SALA ────────────────
-    CELL      = 20      # distância entre salas (grade)
-    WALL_LEN  = 10      # meia-largura da sala
-    WALL_ALT  = 5       # altura da parede
-    WALL_THK  = 2       # espessura da parede
-    DOOR_W    = 2       # largura da abertura da porta
-    DOOR_THK  = .4      # profundidade da porta (porta fina)
-
     # ───────────────────── INIT ────────────────────────
     def __init__(self, app):
         self.app = app
 
+        # ─────────────── CONSTANTES DE SALA ────────────────
+        # (config/settings.py, seção "world")
+        world = app.settings.world
+        self.CELL      = world.cell         # distância entre salas (grade)
+        self.WALL_LEN  = world.wall_len     # meia-largura da sala
+        self.WALL_ALT  = world.wall_alt     # altura da parede
+        self.WALL_THK  = world.wall_thk     # espessura da parede
+        self.DOOR_W    = world.door_w       # largura da abertura da porta
+        self.DOOR_THK  = world.door_thk     # profundidade da porta (porta fina)
+        self.ROOMS     = world.rooms        # salas antes da sala final
+
         self.room_index     = 0
         self.current_room: NodePath | None = None
         self.next_room   : NodePath | None = None
@@ -44,6 +49,9 @@ class SceneManager:
         self._mapa_visivel = False
         self._mapa_textos  : list[OnscreenText] = []
         self._limpeza_feita = False
+        self.build_times: list[float] = []      # segundos por sala montada
+        self._shell: RoomShellBuilder | None = None     # casca da sala em construção
+        self.resident_rooms: int | None = None          # salas vizinhas mantidas na cena (None = todas)
 
         self.npc_manager   = NPCManager(app)
         self.floor_textures = glob("assets/textures/floor/*.jpg") + glob("assets/textures/floor/*.png")
@@ -53,7 +61,7 @@ class SceneManager:
     # ───────────────────────── PUBLIC ─────────────────────────
     def load_first_room(self) -> None:
         """
-        Cria 5 salas.
+        Cria `ROOMS` salas.
         • A primeira tem saída fixa **Norte**.
         • As seguintes seguem a lógica aleatória, sem sobrepor posições.
         """
@@ -61,9 +69,16 @@ class SceneManager:
         self.room_grid_set = {self._vec_to_tuple(current_pos)}
 
         prev_exit_dir = "north"                 # saída fixa da 1ª sala
-        for i in range(6):                      # TOTAL = 5
+        for i in range(self.ROOMS):
             room = NodePath(f"Room-{i}")
             room.setPos(current_pos)
+            room.setPythonTag("room_index", i)
+            self.app.handles.add_room(i, room)
+            # Tudo que a sala criar é liberado junto com ela (ver core/lifecycle.py)
+            owner = self.app.lifecycle.owner(i, root=room)
+            owner.on_release(lambda i=i: self.app.spatial.remove_group(i))
+            owner.on_release(lambda i=i: self.app.decor.remove_group(i))
+            owner.on_release(lambda i=i: self.app.handles.remove_room(i))
 
             if i == 0:
                 # 1ª sala não tem entrada; força saída Norte
@@ -133,38 +148,34 @@ class SceneManager:
         parent.setTag("floor_texture", random.choice(self.floor_textures))
         parent.setTag("ceiling_texture", random.choice(self.ceiling_textures))
 
-        self._generate_floor(parent)
-        self._generate_ceiling(parent)
-        self._generate_walls_and_doors(parent, entry_dir, force_exit_dir, is_first)
+        start = time.perf_counter()
+        with region("room-build"):
+            # chão, teto e paredes vão para um único GeomNode (core/room_geometry.py)
+            self._shell = RoomShellBuilder()
+            self._generate_floor(parent)
+            self._generate_ceiling(parent)
+            self._generate_walls_and_doors(parent, entry_dir, force_exit_dir, is_first)
+            parent.attachNewNode(self._shell.build(self.app.loader))
+            self._shell = None
 
-        self._scatter_decor(parent, entry_dir)
+            self._scatter_decor(parent, entry_dir)
+        self.build_times.append(time.perf_counter() - start)
 
     # ──────────── ESTRUTURAS: CHÃO / TETO ─────────────
     def _generate_floor(self, parent: NodePath) -> None:
-        cm = CardMaker("floor")
-        cm.setFrame(-self.WALL_LEN, self.WALL_LEN, -self.WALL_LEN, self.WALL_LEN)
-        floor_vis = parent.attachNewNode(cm.generate())
-        floor_vis.setHpr(0, -90, 0)
-        floor_vis.setZ(0)
-
-        tex_path = parent.getTag("floor_texture")
-        self._apply_texture(floor_vis, tex_path)
+        size = 2 * self.WALL_LEN
+        self._shell.add_face(parent.getTag("floor_texture"), (0, 0, 0), (size, size, 0), axis=2, sign=1)
 
         plane = Plane(Vec3(0, 0, 1), Point3(0, 0, 0))
         cnode = CollisionNode("floor_collision")
         cnode.addSolid(CollisionPlane(plane))
         cnode.setIntoCollideMask(BitMask32.bit(1))
-        parent.attachNewNode(cnode).setZ(0)
+        self._owner(parent).add_collision(parent.attachNewNode(cnode)).setZ(0)
 
     def _generate_ceiling(self, parent: NodePath) -> None:
-        cm = CardMaker("ceiling")
-        cm.setFrame(-self.WALL_LEN, self.WALL_LEN, -self.WALL_LEN, self.WALL_LEN)
-        ceiling = parent.attachNewNode(cm.generate())
-        ceiling.setPos(0, 0, self.WALL_ALT)
-        ceiling.setHpr(0, 90, 0)
-
-        tex_path = parent.getTag("ceiling_texture")
-        self._apply_texture(ceiling, tex_path)
+        size = 2 * self.WALL_LEN
+        self._shell.add_face(parent.getTag("ceiling_texture"), (0, 0, self.WALL_ALT), (size, size, 0),
+                             axis=2, sign=-1)
 
     # ────────── PAREDES / PORTAS ──────────
     def _generate_walls_and_doors(
@@ -238,47 +249,42 @@ class SceneManager:
         frame_half = self.WALL_LEN - door_half      # metade de cada batente
 
         for side in (-1, 1):
-            piece = self.app.loader.loadModel("models/misc/rgbCube")
             if is_horizontal:
-                piece.setScale(frame_half, self.WALL_THK, self.WALL_ALT + .5)
+                scale = LVector3f(frame_half, self.WALL_THK, self.WALL_ALT + .5)
                 x = side * (self.WALL_LEN - frame_half / 2)
                 pos = (x,
                     self.WALL_LEN + self.WALL_THK / 2 if d == "north"
                     else -self.WALL_LEN - self.WALL_THK / 2,
                     wall_z)
             else:
-                piece.setScale(self.WALL_THK, frame_half, self.WALL_ALT + .5)
+                scale = LVector3f(self.WALL_THK, frame_half, self.WALL_ALT + .5)
                 y = side * (self.WALL_LEN - frame_half / 2)
                 pos = (
                     self.WALL_LEN + self.WALL_THK / 2 if d == "east"
                     else -self.WALL_LEN - self.WALL_THK / 2,
                     y, wall_z)
 
-            piece.setPos(*pos)
-            self._apply_room_texture(parent, piece)
-            piece.reparentTo(parent)
-
-            self._apply_room_texture(parent, piece)
-            piece.reparentTo(parent)
-            piece.setTexScale(TextureStage.getDefault(), 1, 1)
+            self._shell.add_box(parent.getTag("wall_texture"), pos, scale)
 
             # ── Collider corretamente centralizado ──
-            scale = piece.getScale()
-            half_x, half_y, half_z = scale.x / 8, scale.y / 8, scale.z
-            box = CollisionBox((0, 0, 0), 0.5, 0.5, half_z)
+            # (no espaço do antigo bloco escalado, para colidir exatamente como antes)
+            box = CollisionBox((0, 0, 0), 0.5, 0.5, scale.z)
 
             node = CollisionNode(f"wall-col-{d}-{side}")
             node.addSolid(box)
             node.setFromCollideMask(BitMask32.bit(1))
-            piece.attachNewNode(node)
+            col_np = self._owner(parent).add_collision(parent.attachNewNode(node))
+            col_np.setPos(*pos)
+            col_np.setScale(scale)
 
             # col_np = piece.attachNewNode(CollisionNode(f"wall-col-{d}-{side}"))
             # col_np.node.addSolid(box)
             # col_np.node.setIntoCollideMask(BitMask32.bit(1))
 
     def _create_door_only(self, parent: NodePath, d: str) -> NodePath:
-        door = self.app.loader.loadModel("assets/models/porta.obj")
-        door.setName(f"porta_sala_{self.room_index}_{d}")
+        with region("model-load"):
+            door = self.app.loader.loadModel("assets/models/porta.obj")
+        door.setName(f"porta_sala_{parent.getPythonTag('room_index')}_{d}")
 
         pos_map = {
             "north": (0, self.WALL_LEN + self.DOOR_THK / 2, self.WALL_ALT / 2),
@@ -302,53 +308,49 @@ class SceneManager:
         final_pos = LVector3f(*pos_map[d]) + offset_fix
         door.setPos(final_pos)
         door.reparentTo(parent)
+        self.app.spatial.add(door, "door", pos=parent.getPos() + final_pos,
+                             group=parent.getPythonTag("room_index"))
 
         # 🎯 Colisor baseado na escala atual
         scale = door.getScale()
         box = CollisionBox((0, 0, 0), 3, 3, scale.z / 2)
-        col_node = CollisionNode(f"col-door-{self.room_index}-{d}")
+        col_node = CollisionNode(f"col-door-{parent.getPythonTag('room_index')}-{d}")
         col_node.addSolid(box)
         col_node.setIntoCollideMask(BitMask32.bit(1))  # mesma máscara das paredes
-        door.attachNewNode(col_node)
+        col_np = door.attachNewNode(col_node)
+        self._owner(parent).add_collision(col_np)
+        self.app.handles.add_door(parent.getPythonTag("room_index"), door, d, collider=col_np)
 
         if d == self.exit_dir:
             self.door_node = door
-            parent.setPythonTag("door_node", door)
 
         return door
 
     def _create_wall(self, parent: NodePath, d: str) -> None:
         """Parede sólida completa."""
-        wall = self.app.loader.loadModel("models/misc/rgbCube")
-
         positions = {
             "north": (0,  self.WALL_LEN + self.WALL_THK/2, self.WALL_ALT/2),
             "south": (0, -self.WALL_LEN - self.WALL_THK/2, self.WALL_ALT/2),
             "east":  ( self.WALL_LEN + self.WALL_THK/2, 0, self.WALL_ALT/2),
             "west":  (-self.WALL_LEN - self.WALL_THK/2, 0, self.WALL_ALT/2),
         }
-        wall.setPos(*positions[d])
-
         if d in ("north", "south"):
-            wall.setScale(self.CELL, self.WALL_THK, self.WALL_ALT)
+            scale = LVector3f(self.CELL, self.WALL_THK, self.WALL_ALT)
             box = CollisionBox((0, 0, 0),
                                0.5, self.WALL_THK/2, self.WALL_ALT/2)
         else:
-            wall.setScale(self.WALL_THK, self.CELL, self.WALL_ALT)
+            scale = LVector3f(self.WALL_THK, self.CELL, self.WALL_ALT)
             box = CollisionBox((0, 0, 0),
                                self.WALL_THK/2, 0.5, self.WALL_ALT/2)
 
-        self._apply_room_texture(parent, wall)
-        wall.reparentTo(parent)
-
-        self._apply_room_texture(parent, wall)
-        wall.reparentTo(parent)
-        wall.setTexScale(TextureStage.getDefault(), 1, 1)
+        self._shell.add_box(parent.getTag("wall_texture"), positions[d], scale)
 
         wall_cnode = CollisionNode(f"wall-col-{d}")
         wall_cnode.addSolid(box)
         wall_cnode.setIntoCollideMask(BitMask32.bit(1))
-        wall.attachNewNode(wall_cnode)
+        col_np = self._owner(parent).add_collision(parent.attachNewNode(wall_cnode))
+        col_np.setPos(*positions[d])
+        col_np.setScale(scale)
 
         # col_np = wall.attachNewNode(CollisionNode(f"wall-col-{d}"))
         # col_np.node().addSolid(box)
@@ -364,108 +366,150 @@ class SceneManager:
         perp_vec = LVector3f(-dir_vec.getY(), dir_vec.getX(), 0)
 
         npc_pos = porta_pos - dir_vec * 3.5 + perp_vec * 3.5
+        heading_deg = degrees(atan2(-dir_vec.getY(), -dir_vec.getX()))
+        self._add_npc(parent, door_node, npc_pos, heading_deg)
 
+    def _add_npc(self, parent: NodePath, door_node: NodePath | None, pos: LVector3f, heading: float,
+                 model_path: Path | None = None, qa: dict | None = None) -> NodePath:
         npc_scale = 3.0
-        npc = self.npc_manager.spawn_npc(door_node=door_node, npc_scale=npc_scale)
+        npc = self.npc_manager.spawn_npc(door=self.app.handles.of(door_node),
+                                         room_index=parent.getPythonTag("room_index"),
+                                         npc_scale=npc_scale,
+                                         on_model_ready=self._place_npc_on_floor,
+                                         model_path=model_path, qa=qa)
+        npc.setPythonTag("room_index", parent.getPythonTag("room_index"))
+        # posição antes do ajuste ao chão, que só acontece quando o modelo chega
+        npc.setPythonTag("spawn_pose", (LVector3f(pos), heading))
         npc.reparentTo(parent)
-        npc.setPos(npc_pos)
-
-        self.app.graphicsEngine.renderFrame()
-
-        model_node = npc.find("**/model_node")
-        if not model_node.isEmpty():
-            min_bound, max_bound = model_node.getTightBounds()
-            scale_z = model_node.getScale().getZ()
-
-            if min_bound and max_bound:
-                altura_modelo = (max_bound.getZ() - min_bound.getZ()) * scale_z
-                centro_z_local = (min_bound.getZ() + max_bound.getZ()) / 2 * scale_z
-                # move o modelo para que a base fique no chão
-                npc.setZ(npc.getZ() - centro_z_local - altura_modelo / 2 + 0.1)
+        npc.setPos(pos)
+        npc.setH(heading)
+        self.app.spatial.add(npc, "npc", pos=parent.getPos() + pos,
+                             group=parent.getPythonTag("room_index"))
+        return npc
+
+    def _place_npc_on_floor(self, npc: NodePath, model_node: NodePath) -> None:
+        """Chamado quando o modelo do NPC termina de carregar (thread principal)."""
+        min_bound, max_bound = model_node.getTightBounds()
+        if not min_bound or not max_bound:
+            return
 
-            speech_node = npc.find("**/speech_node")
-            if not speech_node.isEmpty():
-                speech_node.setZ(altura_modelo + 1)
+        scale_z = model_node.getScale().getZ()
+        altura_modelo = (max_bound.getZ() - min_bound.getZ()) * scale_z
+        centro_z_local = (min_bound.getZ() + max_bound.getZ()) / 2 * scale_z
+        # move o modelo para que a base fique no chão
+        npc.setZ(npc.getZ() - centro_z_local - altura_modelo / 2 + 0.1)
 
-        heading_deg = degrees(atan2(-dir_vec.getY(), -dir_vec.getX()))
-        npc.setH(heading_deg)
+        handle = self.app.handles.of(npc)
+        if handle is not None and handle.speech is not None and not handle.speech.isEmpty():
+            handle.speech.setZ(altura_modelo + 1)
 
     # ──────────── DECORAÇÃO ────────────
     def _scatter_decor(self, parent: NodePath, entry_dir: str | None) -> None:
-        blocked = {self.exit_dir}
-        if entry_dir:
-            blocked.add(entry_dir)
-        decor_dirs = [d for d in ("north", "south", "west", "east") if d not in blocked]
-
-        pos_map = {
-            "north": (0, self.WALL_LEN - 1.2, 0),
-            "south": (0, -self.WALL_LEN + 1.2, 0),
-            "west": (-self.WALL_LEN + 1.2, 0, 0),
-            "east": (self.WALL_LEN - 1.2, 0, 0),
-        }
-
-        obj_dir = Path("assets/models/objects")
-        obj_paths = list(obj_dir.glob("*.obj"))
+        """
+        Poisson-disk (core/poisson.py) na área livre da sala: fora das paredes,
+        dos corredores porta → centro e dos NPCs. Um gerador próprio por sala,
+        semeado pelo `random` global, mantém tudo reprodutível com PROJETAO_SEED
+        sem depender de quantos sorteios a decoração faz.
+        """
+        obj_paths = sorted(Path("assets/models/objects").glob("*.obj"))
         if not obj_paths:
             print("[SceneManager] Nenhum .obj em assets/models/objects")
             return
 
-        placed: list[LVector3f] = []
-
-        for d in decor_dirs:
-            base_x, base_y, base_z = pos_map[d]
-            dir_vec = LVector3f(-base_x, -base_y, 0).normalized()
-
-            for _ in range(random.randint(1, 3)):
-                model_path = random.choice(obj_paths)
-
-                for _attempt in range(10):
-                    offset = random.uniform(-2.5, 2.5)
-                    pos = (LVector3f(base_x + offset, base_y, base_z + .2)
-                           if d in ("north", "south")
-                           else LVector3f(base_x, base_y + offset, base_z + .2))
-
-                    # Afastar da parede em 1 unidade na direção oposta
-                    pos += dir_vec * 1.0
+        cfg = self.app.settings.decor
+        rng = random.Random(random.getrandbits(32))
+        inner = self.WALL_LEN - cfg.wall_margin
+        keep_out = [Circle(0, 0, cfg.door_clearance)]           # centro: passagem entre as portas
+        for d in {entry_dir, self.exit_dir} - {None}:
+            door = self._direction_to_offset(d) * (self.WALL_LEN / self.CELL)
+            keep_out.append(Capsule(door.getX(), door.getY(), 0, 0, cfg.door_clearance))
+        for npc in self.npcs_in(parent):
+            keep_out.append(Circle(npc.getX(), npc.getY(), cfg.npc_clearance))
+
+        points = poisson_disk(rng, (-inner, -inner, inner, inner), cfg.spacing,
+                              keep_out=keep_out, max_points=cfg.max_per_room)
+        for x, y in points:
+            # de frente para o centro da sala
+            heading = degrees(atan2(-y, -x))
+            # só a âncora fica na sala; a geometria é desenhada por instancing
+            self.app.decor.place(parent, rng.choice(obj_paths), LVector3f(x, y, .2),
+                                 rng.uniform(2.2, 3.2), heading,
+                                 group=parent.getPythonTag("room_index"))
 
-                    if all((pos - p).length() >= 1.5 for p in placed):
-                        model = load_model_with_default_material(self.app.loader, str(model_path))
-                        model.setPos(pos)
-                        model.setScale(random.uniform(2.2, 3.2))
-
-                        heading = degrees(atan2(dir_vec.getY(), dir_vec.getX()))
-                        model.setH(heading)
+    # ────────────── TEXTURAS ──────────────
+    def _apply_random_texture(self, node: NodePath) -> None:
+        texture = self.app.loader.loadTexture(random.choice(self.textures))
+        node.setTexture(texture, 1)
 
-                        min_bound, _ = model.getTightBounds()
-                        if min_bound:
-                            model.setZ(model.getZ() - min_bound.getZ() - .05)
+    # ────────────── SNAPSHOT (core/snapshot.py) ──────────────
+    def room_layout(self, room: NodePath) -> dict:
+        """O que a sala tem além do .bam: índice, porta de saída e NPCs com seus enigmas."""
+        index = room.getPythonTag("room_index")
+        handle = self.app.handles.rooms.get(index)
+        exit_door = handle.exit_door if handle is not None else None
+        door = exit_door.node if exit_door is not None else None
+        npcs = []
+        for npc in self.npcs_in(room):
+            pos, heading = npc.getPythonTag("spawn_pose")
+            npcs.append({
+                "model": str(npc.getPythonTag("model_path")),
+                "pos": [pos.getX(), pos.getY(), pos.getZ()],
+                "h": heading,
+                "qa": npc.getPythonTag("qa"),
+            })
+        return {
+            "index": index,
+            "door": door.getName() if door is not None and not door.isEmpty() else None,
+            "door_dir": exit_door.direction if exit_door is not None else None,
+            "npcs": npcs,
+        }
 
-                        model.reparentTo(parent)
-                        placed.append(pos)
-                        break
+    def npcs_in(self, room: NodePath) -> list[NodePath]:
+        handle = self.app.handles.rooms.get(room.getPythonTag("room_index"))
+        return [] if handle is None else [n.node for n in handle.npcs if not n.node.isEmpty()]
 
-    # ────────────── TEXTURAS ──────────────
-    def _apply_room_texture(self, room: NodePath, node: NodePath) -> None:
-        tex_path = room.getTag("wall_texture")
-        self._apply_texture(node, tex_path)
-
-    def _apply_texture(self, node: NodePath, texture_path: str) -> None:
-        texture = self.app.loader.loadTexture(texture_path)
+    def load_snapshot(self, rooms: list[tuple[NodePath, dict]], exit_dir: str | None) -> None:
+        """
+        Equivalente a `load_first_room` com salas vindas de .bam: só registra de
+        novo o que não é serializado (tags Python, grade espacial, donos e NPCs).
+        """
+        self.room_positions = [LVector3f(0, 0, 0)]
+        self.room_grid_set = set()
+
+        for room, info in rooms:
+            i = info["index"]
+            room.setPythonTag("room_index", i)
+            self.app.handles.add_room(i, room)
+            owner = self.app.lifecycle.owner(i, root=room)
+            owner.on_release(lambda i=i: self.app.spatial.remove_group(i))
+            owner.on_release(lambda i=i: self.app.decor.remove_group(i))
+            owner.on_release(lambda i=i: self.app.handles.remove_room(i))
+            for col in room.findAllMatches("**/+CollisionNode"):
+                owner.add_collision(col)
+            for anchor in room.findAllMatches("=decor_model"):
+                self.app.decor.adopt(anchor, i)
+
+            door = room.find(info["door"]) if info["door"] else None
+            if door is not None and not door.isEmpty():
+                # o colisor é filho direto da porta
+                self.app.handles.add_door(i, door, info["door_dir"], collider=door.find("+CollisionNode"))
+                self.door_node = door
+                self.app.spatial.add(door, "door", pos=room.getPos() + door.getPos(), group=i)
+            else:
+                door = None
 
-        node.setColor(1, 1, 1, 1)
-        ts = TextureStage.getDefault()
-        node.setTexture(ts, texture)
-        node.setTexGen(ts, TexGenAttrib.MWorldPosition)
+            for npc in info["npcs"]:
+                self._add_npc(room, door, LVector3f(*npc["pos"]), npc["h"],
+                              model_path=Path(npc["model"]), qa=npc["qa"])
 
-        scale_x, scale_y = .2, .4
-        rotation = LMatrix4f.rotateMat(90, LVecBase3f(0, 0, 1))
-        scale_mat = LMatrix4f.scaleMat(scale_x, scale_y, 1)
-        matrix = rotation * scale_mat
-        node.setTexTransform(ts, TransformState.makeMat(matrix))
+            self.rooms.append(room)
+            self.room_positions.append(room.getPos())
+            self.room_grid_set.add(self._vec_to_tuple(room.getPos()))
 
-    def _apply_random_texture(self, node: NodePath) -> None:
-        texture = self.app.loader.loadTexture(random.choice(self.textures))
-        node.setTexture(texture, 1)
+        self.exit_dir = exit_dir
+        for room, _ in rooms:
+            room.reparentTo(self.app.render)
+        self.current_room = self.rooms[0]
 
     # ────────────── MAPA RESUMO ──────────────
     def gerar_mapa_resumo(self) -> None:
@@ -509,7 +553,7 @@ class SceneManager:
             self._limpeza_feita = True
             print("[SceneManager] Limpando salas anteriores...")
             for sala in self.rooms[:-1]:
-                sala.detachNode()
+                self.app.lifecycle.release(sala.getPythonTag("room_index"))
 
     def atualizar_sala_baseada_na_posicao(self, player_pos: LVector3f) -> None:
         for i, sala_pos in enumerate(self.room_positions):
@@ -518,6 +562,8 @@ class SceneManager:
 
                 if self.room_index != i:
                     self.room_index = i
+                    self.app.messenger.send("room-changed", [i])
+                    self._apply_residency()
 
                     # Mostra no mapa, se visível
                     if self._mapa_visivel:
@@ -531,11 +577,34 @@ class SceneManager:
 
                         for sala in self.rooms:
                             if sala != self.sala_final_node:
-                                sala.removeNode()
+                                self.app.lifecycle.release(sala.getPythonTag("room_index"))
 
                 return
 
+    def set_resident_rooms(self, radius: int | None) -> None:
+        """Mantém na cena só as salas a até `radius` da atual; as outras ficam "stashed"."""
+        self.resident_rooms = radius
+        self._apply_residency()
+
+    def _apply_residency(self) -> None:
+        resident = set()
+        for j, room in enumerate(self.rooms):
+            if room.isEmpty():
+                continue
+            # room_positions repete a origem: com room_index = i, o jogador está na sala i ou i-1
+            keep = (self.resident_rooms is None
+                    or self.room_index - 1 - self.resident_rooms <= j <= self.room_index + self.resident_rooms)
+            if keep:
+                room.unstash()
+                resident.add(room.getPythonTag("room_index"))
+            else:
+                room.stash()
+        self.app.decor.set_resident_groups(None if self.resident_rooms is None else resident)
+
     # ─────────────── HELPERS ───────────────
+    def _owner(self, parent: NodePath):
+        return self.app.lifecycle.owner(parent.getPythonTag("room_index"))
+
     def _direction_to_offset(self, d: str) -> LVector3f:
         return {
             "north": LVector3f(0,  self.CELL, 0),
@@ -551,16 +620,10 @@ class SceneManager:
     def _opposite(d: str | None) -> str | None:
         return {"north":"south","south":"north","east":"west","west":"east"}.get(d)
 
-    def _criar_sala_final(self):
-        sala_final = NodePath("SalaFinal")
-        offset = self._direction_to_offset(self.exit_dir or "north") * 1.5
-        sala_final.setPos(self.rooms[-1].getPos() + offset)
-        self.sala_final_node = sala_final
-        self.room_positions.append(sala_final.getPos())
-        self.rooms.append(sala_final)
+    def _attach_final_sphere(self, sphere: NodePath | None, sala_final: NodePath) -> None:
+        if sphere is None or sala_final.isEmpty():
+            return
 
-        # Cria uma esfera ao redor
-        sphere = self.app.loader.loadModel("models/misc/sphere")
         sphere.reparentTo(sala_final)
         sphere.setScale(500)
         sphere.setTwoSided(True)
@@ -575,7 +638,19 @@ class SceneManager:
         sphere.setTexGen(ts, TexGenAttrib.MEyeSphereMap)
 
         giro = LerpHprInterval(sphere, duration=60, hpr=(360, 0, 0))
-        giro.loop()
+        self.app.lifecycle.owner("final").add_interval(giro).loop()
+
+    def _criar_sala_final(self):
+        sala_final = NodePath("SalaFinal")
+        offset = self._direction_to_offset(self.exit_dir or "north") * 1.5
+        sala_final.setPos(self.rooms[-1].getPos() + offset)
+        self.sala_final_node = sala_final
+        self.room_positions.append(sala_final.getPos())
+        self.rooms.append(sala_final)
+        owner = self.app.lifecycle.owner("final", root=sala_final, name="sala final")
+
+        # Cria uma esfera ao redor (carregada em segundo plano)
+        self.app.async_loader.load("models/misc/sphere", self._attach_final_sphere, sala_final)
 
         # Chão invisível
         cm = CardMaker("final_floor")
@@ -597,11 +672,8 @@ class SceneManager:
             wordwrap=20,
             bg=(0, 0, 0, 0.8)
         )
-        som_final = self.app.loader.loadSfx("assets/sounds/epilogo.wav")
-        som_final.setLoop(True)
-        som_final.setVolume(0.7)
-        som_final.play()
-        self.som_final = som_final
+        # handle do stream preparado na inicialização: nada é lido do disco aqui
+        self.som_final = owner.add_sound(self.app.audio.play_stream("epilogo", loop=True, volume=0.7))
         texto.reparentTo(sala_final)
         self._tela_final = texto
         self._mensagem_final = OnscreenText(
@@ -622,13 +694,14 @@ class SceneManager:
             mayChange=False,
             bg=(0, 0, 0, 0.8)
         )
+        owner.add_node(self._mensagem_final)
 
         def remover_mensagem(task):
             if self._mensagem_final:
                 self._mensagem_final.destroy()
             return Task.done
 
-        self.app.taskMgr.doMethodLater(20, remover_mensagem, "remover-mensagem-final")
+        owner.add_task(self.app.taskMgr.doMethodLater(20, remover_mensagem, "remover-mensagem-final"))
 
         sala_final.reparentTo(self.app.render)
 
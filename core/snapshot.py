@@ -0,0 +1,171 @@
+# core/snapshot.py
+#
+# Snapshot binário da masmorra gerada, por semente, para reiniciar sem gerar
+# tudo de novo:
+#
+#   snapshots/<seed>/layout.json     salas, porta de saída, NPCs e seus enigmas
+#   snapshots/<seed>/room-N.bam      subgrafo da sala N: chão, teto, paredes, porta,
+#                                    decoração e colisores, já com as texturas escolhidas
+#   snapshots/<seed>/session.json    portas abertas e objetos colocados pelo jogador
+#   snapshots/<seed>/object-K.bam    malha de cada objeto colocado
+#   snapshots/latest                 última semente usada (sem PROJETAO_SEED, é ela que volta)
+#
+#   PROJETAO_SNAPSHOT=1 PROJETAO_SEED=42 python main.py
+#
+# Na primeira vez a masmorra é gerada normalmente e as salas são gravadas (uma
+# por frame) assim que a decoração termina de carregar; a sessão é gravada ao
+# sair. Nas seguintes,
+# tudo vem do snapshot. Os NPCs ficam fora do .bam (dependem de tags Python e do
+# NPCSystem) e são recriados a partir do layout, com o mesmo modelo e enigma.
+
+import json
+import time
+from pathlib import Path
+
+from direct.showbase.DirectObject import DirectObject
+from direct.task import Task
+from panda3d.core import Filename, NodePath
+
+FORMAT_VERSION = 2          # 2: direção da porta no layout
+LATEST = "latest"
+_DONE = object()
+
+
+class SnapshotStore(DirectObject):
+    def __init__(self, app, seed: int, root: str | Path = "snapshots"):
+        DirectObject.__init__(self)
+        self.app = app
+        self.seed = seed
+        self.dir = Path(root) / str(seed)
+        self.opened_doors: list[str] = []
+        self.restored_objects: list[tuple[NodePath, dict]] = []
+        self.stats: dict = {}          # write_ms / load_ms / bytes da última operação
+        self.accept("door-opened", self.opened_doors.append)
+        Path(root).mkdir(parents=True, exist_ok=True)
+        (Path(root) / LATEST).write_text(str(seed), encoding="utf-8")
+
+    @staticmethod
+    def last_seed(root: str | Path = "snapshots") -> int | None:
+        """Semente do último jogo com snapshot, para retomar sem PROJETAO_SEED."""
+        try:
+            return int((Path(root) / LATEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    # ───────────────────────── ESTADO ─────────────────────────
+    def exists(self) -> bool:
+        """Snapshot completo e no formato atual; um antigo é gerado e gravado de novo."""
+        try:
+            layout = json.loads((self.dir / "layout.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return layout.get("version") == FORMAT_VERSION
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.dir.glob("*") if p.is_file())
+
+    # ───────────────────────── GRAVAÇÃO ─────────────────────────
+    def save_rooms_when_idle(self) -> None:
+        """Grava as salas, uma por frame, quando não houver mais cargas pendentes (decoração e NPCs)."""
+        steps = self._save_rooms_steps(wait_for_loads=True)
+
+        def step(task):
+            return Task.done if next(steps, _DONE) is _DONE else Task.cont
+
+        self.app.taskMgr.add(step, "snapshot-save-rooms")
+
+    def save_rooms(self) -> dict:
+        """Tudo de uma vez, no mesmo frame."""
+        for _ in self._save_rooms_steps():
+            pass
+        return self.stats
+
+    def _save_rooms_steps(self, wait_for_loads: bool = False):
+        """Gerador: uma sala por passo. O layout.json vai por último, então gravação pela metade não conta."""
+        while wait_for_loads and self.app.async_loader.pending:
+            yield
+        sm = self.app.scene_manager
+        self.dir.mkdir(parents=True, exist_ok=True)
+        write_s, worst_s = 0.0, 0.0
+
+        rooms = []
+        for room in list(sm.rooms):
+            if room.isEmpty() or not room.hasPythonTag("room_index"):
+                continue
+            start = time.perf_counter()
+            info = sm.room_layout(room)
+            # NPCs saem do grafo só durante a escrita
+            npcs = sm.npcs_in(room)
+            for npc in npcs:
+                npc.detachNode()
+            room.writeBamFile(Filename.fromOsSpecific(str(self.dir / f"room-{info['index']}.bam")))
+            for npc in npcs:
+                npc.reparentTo(room)
+            rooms.append(info)
+            elapsed = time.perf_counter() - start
+            write_s, worst_s = write_s + elapsed, max(worst_s, elapsed)
+            yield
+
+        layout = {"version": FORMAT_VERSION, "seed": self.seed, "exit_dir": sm.exit_dir, "rooms": rooms}
+        (self.dir / "layout.json").write_text(json.dumps(layout, indent=1, ensure_ascii=False), encoding="utf-8")
+
+        self.stats.update(write_ms=write_s * 1000, worst_room_ms=worst_s * 1000, bytes=self.size_bytes())
+        print(f"💾 [Snapshot] {len(rooms)} salas gravadas em {self.dir} "
+              f"({self.stats['write_ms']:.0f} ms em {len(rooms)} frames, pior {self.stats['worst_room_ms']:.0f} ms; "
+              f"{self.stats['bytes'] / 1024:.0f} KiB)")
+
+    def save_session(self) -> None:
+        """Portas abertas e objetos colocados; chamado ao sair."""
+        if not self.exists():
+            return
+        for old in self.dir.glob("object-*.bam"):
+            old.unlink()
+
+        objects = [(node, meta) for node, meta in self.restored_objects if not node.isEmpty()]
+        for obj in self.app.placer.pending_objects:
+            if obj.placed and obj.final_model_node is not None and not obj.final_model_node.isEmpty():
+                objects.append((obj.final_model_node, {"prompt": obj.prompt, "room": obj.placed_room}))
+
+        entries = []
+        for k, (node, meta) in enumerate(objects):
+            name = f"object-{k}.bam"
+            node.writeBamFile(Filename.fromOsSpecific(str(self.dir / name)))
+            entries.append({**meta, "file": name})
+
+        session = {"opened_doors": self.opened_doors, "objects": entries}
+        (self.dir / "session.json").write_text(json.dumps(session, indent=1, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 [Snapshot] Sessão gravada: {len(self.opened_doors)} portas abertas, {len(entries)} objetos")
+
+    # ───────────────────────── CARGA ─────────────────────────
+    def load(self) -> dict:
+        """Monta a masmorra a partir do snapshot no lugar de `load_first_room`."""
+        start = time.perf_counter()
+        layout = json.loads((self.dir / "layout.json").read_text(encoding="utf-8"))
+        session_path = self.dir / "session.json"
+        session = json.loads(session_path.read_text(encoding="utf-8")) if session_path.exists() else {}
+        self.opened_doors = list(session.get("opened_doors", []))
+
+        rooms = []
+        for info in layout["rooms"]:
+            room = self._load_bam(f"room-{info['index']}.bam")
+            if info["door"] in self.opened_doors:
+                room.find(info["door"]).removeNode()
+                info = {**info, "door": None}
+            rooms.append((room, info))
+        self.app.scene_manager.load_snapshot(rooms, layout["exit_dir"])
+
+        for meta in session.get("objects", []):
+            node = self._load_bam(meta["file"])
+            node.reparentTo(self.app.render)
+            self.app.spatial.add(node, "object", group=meta["room"])
+            self.app.lifecycle.owner(meta["room"]).child(f"objeto '{meta['prompt']}'", node)
+            self.restored_objects.append((node, {"prompt": meta["prompt"], "room": meta["room"]}))
+
+        self.stats.update(load_ms=(time.perf_counter() - start) * 1000, bytes=self.size_bytes())
+        print(f"📂 [Snapshot] Masmorra da semente {self.seed} carregada em {self.stats['load_ms']:.0f} ms "
+              f"({len(rooms)} salas, {len(self.restored_objects)} objetos)")
+        return self.stats
+
+    def _load_bam(self, name: str) -> NodePath:
+        # noCache: cada sala é única, não há por que guardá-la no ModelPool
+        return self.app.loader.loadModel(Filename.fromOsSpecific(str(self.dir / name)), noCache=True)
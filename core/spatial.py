@@ -0,0 +1,206 @@
+# core/spatial.py
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import count
+
+from direct.task import Task
+from panda3d.core import NodePath, LVecBase3f
+
+
+@dataclass(eq=False)
+class SpatialEntry:
+    handle: int
+    node: NodePath
+    kind: str                   # "npc" | "door" | "object" | ...
+    x: float
+    y: float
+    group: object = None        # normalmente o índice da sala
+    cell: tuple[int, int] = (0, 0)
+
+
+@dataclass(eq=False)
+class _Watch:
+    name: str
+    kind: str | None
+    radius: float
+    inside: set[SpatialEntry] = field(default_factory=set)
+
+
+class SpatialRegistry:
+    """
+    Grade uniforme no plano XY com as entidades do jogo (NPCs, portas, objetos
+    colocados). Consultas por raio e de vizinho mais próximo só olham as células
+    ao redor do ponto, e os "watches" geram eventos de entrada/saída em relação
+    ao jogador:
+
+        registry.watch("npc-speech", "npc", 10.0)
+        → messenger "npc-speech-enter" / "npc-speech-leave" com [node]
+    """
+
+    def __init__(self, app, cell_size: float = 10.0):
+        self.app = app
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[SpatialEntry]] = defaultdict(set)
+        self._entries: dict[int, SpatialEntry] = {}
+        self._ids = count(1)
+        self._watches: list[_Watch] = []
+
+        # Antes das tasks que reagem aos eventos (sort padrão 0)
+        self.task = self.app.taskMgr.add(self._update, "spatial-proximity", sort=-5)
+
+    # ───────────────────────── REGISTRO ─────────────────────────
+    def add(self, node: NodePath, kind: str, pos: LVecBase3f | None = None, group=None) -> SpatialEntry:
+        """Registra `node`; sem `pos`, usa a posição atual no render."""
+        if pos is None:
+            pos = node.getPos(self.app.render)
+        entry = SpatialEntry(next(self._ids), node, kind, pos.getX(), pos.getY(), group)
+        entry.cell = self._cell_of(entry.x, entry.y)
+        self._cells[entry.cell].add(entry)
+        self._entries[entry.handle] = entry
+        node.setPythonTag("spatial_handle", entry.handle)
+        return entry
+
+    def update(self, node: NodePath, pos: LVecBase3f | None = None) -> None:
+        """Chamar depois de mover uma entidade registrada."""
+        entry = self.entry_for(node)
+        if entry is None:
+            return
+        if pos is None:
+            pos = node.getPos(self.app.render)
+        entry.x, entry.y = pos.getX(), pos.getY()
+        cell = self._cell_of(entry.x, entry.y)
+        if cell != entry.cell:
+            self._discard_from_cell(entry)
+            entry.cell = cell
+            self._cells[cell].add(entry)
+
+    def remove(self, node: NodePath) -> None:
+        entry = self.entry_for(node)
+        if entry is not None:
+            self._remove_entry(entry)
+
+    def remove_group(self, group) -> int:
+        """Remove tudo que foi registrado com `group` (ex.: uma sala descarregada)."""
+        doomed = [e for e in self._entries.values() if e.group == group]
+        for entry in doomed:
+            self._remove_entry(entry)
+        return len(doomed)
+
+    def entry_for(self, node: NodePath) -> SpatialEntry | None:
+        if node.isEmpty() or not node.hasPythonTag("spatial_handle"):
+            return None
+        return self._entries.get(node.getPythonTag("spatial_handle"))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ───────────────────────── CONSULTAS ─────────────────────────
+    def query_radius(self, pos: LVecBase3f, radius: float,
+                     kind: str | None = None) -> list[tuple[float, SpatialEntry]]:
+        """(distância, entrada) a até `radius` de `pos` no plano XY, da mais próxima à mais distante."""
+        px, py = pos.getX(), pos.getY()
+        cx0, cy0 = self._cell_of(px - radius, py - radius)
+        cx1, cy1 = self._cell_of(px + radius, py + radius)
+        r2 = radius * radius
+
+        hits = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for entry in self._cells.get((cx, cy), ()):
+                    if kind is not None and entry.kind != kind:
+                        continue
+                    d2 = (entry.x - px) ** 2 + (entry.y - py) ** 2
+                    if d2 <= r2 and not entry.node.isEmpty():
+                        hits.append((math.sqrt(d2), entry))
+        hits.sort(key=lambda hit: hit[0])
+        return hits
+
+    def nearest(self, pos: LVecBase3f, kind: str | None = None,
+                max_radius: float | None = None) -> SpatialEntry | None:
+        """Busca em anéis de células a partir da célula de `pos`."""
+        if not self._entries:
+            return None
+        px, py = pos.getX(), pos.getY()
+        cx, cy = self._cell_of(px, py)
+        max_ring = self._max_ring(cx, cy, max_radius)
+
+        best, best_d2 = None, math.inf
+        for ring in range(max_ring + 1):
+            # Nenhuma célula do anel `ring` fica a menos de (ring - 1)·cell_size do ponto
+            if best is not None and ((ring - 1) * self.cell_size) ** 2 > best_d2:
+                break
+            for cell in self._ring_cells(cx, cy, ring):
+                for entry in self._cells.get(cell, ()):
+                    if (kind is not None and entry.kind != kind) or entry.node.isEmpty():
+                        continue
+                    d2 = (entry.x - px) ** 2 + (entry.y - py) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = entry, d2
+
+        if max_radius is not None and best_d2 > max_radius ** 2:
+            return None
+        return best
+
+    # ───────────────────────── EVENTOS ─────────────────────────
+    def watch(self, name: str, kind: str | None, radius: float) -> None:
+        """Eventos "<name>-enter"/"<name>-leave" quando entidades de `kind` entram/saem do raio do jogador."""
+        self._watches.append(_Watch(name, kind, radius))
+
+    def set_watch_radius(self, name: str, radius: float) -> None:
+        """Novo raio; quem ficou de fora recebe "-leave" na próxima atualização."""
+        for w in self._watches:
+            if w.name == name:
+                w.radius = radius
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _ring_cells(self, cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    def _max_ring(self, cx: int, cy: int, max_radius: float | None) -> int:
+        if max_radius is not None:
+            return math.ceil(max_radius / self.cell_size) + 1
+        # Sem limite: até cobrir a célula ocupada mais distante
+        return max(max(abs(x - cx), abs(y - cy)) for x, y in self._cells)
+
+    def _discard_from_cell(self, entry: SpatialEntry) -> None:
+        bucket = self._cells.get(entry.cell)
+        if bucket is not None:
+            bucket.discard(entry)
+            if not bucket:
+                del self._cells[entry.cell]
+
+    def _remove_entry(self, entry: SpatialEntry) -> None:
+        self._discard_from_cell(entry)
+        self._entries.pop(entry.handle, None)
+        for w in self._watches:
+            if entry in w.inside:
+                w.inside.discard(entry)
+                self.app.messenger.send(f"{w.name}-leave", [entry.node])
+
+    def _update(self, task):
+        player_node = getattr(getattr(self.app, "player_controller", None), "node", None)
+        if not self._watches or player_node is None:
+            return Task.cont
+
+        pos = player_node.getPos(self.app.render)
+        for w in self._watches:
+            now = {entry for _, entry in self.query_radius(pos, w.radius, w.kind)}
+            for entry in w.inside - now:
+                self.app.messenger.send(f"{w.name}-leave", [entry.node])
+            for entry in now - w.inside:
+                self.app.messenger.send(f"{w.name}-enter", [entry.node])
+            w.inside = now
+        return Task.cont
@@ -0,0 +1,71 @@
+# core/threads.py
+#
+# Modo multithread (perfil "threaded" em config/settings.py):
+#
+#   PROJETAO_THREADING=Cull/Draw   pipeline de render do Panda3D: App | Cull | Draw
+#                                  em threads separadas ("/Draw" junta App e Cull;
+#                                  "" deixa tudo na thread principal, o padrão)
+#   PROJETAO_TASK_CHAINS=1         task chains com thread própria para o que não é
+#                                  render: "npc" (respiração dos NPCs) e "io" (loop
+#                                  asyncio: scheduler de geração, downloads, polling)
+#
+# Regras para quem roda fora da thread principal:
+#   • mexer em nós já existentes (setScale, setPos) pode: o grafo de cena do
+#     Panda3D tem trava própria com threads de verdade;
+#   • criar/destruir coisas do jogo (OnscreenText, tasks, loader, picking) vai
+#     para a thread principal com `app.main_thread.call(fn, ...)`;
+#   • entrar no loop asyncio (scheduler, tickets) vem com `app.asyncio_pump.call/spawn`.
+
+import threading
+from collections import deque
+
+from direct.task import Task
+from panda3d.core import Thread, loadPrcFileData
+
+TASK_CHAINS = ("npc", "io")
+
+
+def configure_pipeline(threading_model: str) -> None:
+    """Tem de rodar antes do ShowBase: o modelo de threads vale ao abrir a janela."""
+    if threading_model and not Thread.isThreadingSupported():
+        print("⚠️ [Threads] Panda3D compilado sem threads; pipeline fica na thread principal")
+        return
+    loadPrcFileData("threading", f"threading-model {threading_model}")
+
+
+def setup_task_chains(app, names=TASK_CHAINS) -> None:
+    """
+    Uma thread por chain. `frameSync` prende cada chain ao frame da principal:
+    a task roda uma vez por frame, em paralelo com as tasks da thread principal.
+    """
+    for name in names:
+        app.taskMgr.setupTaskChain(name, numThreads=1, frameSync=True)
+
+
+class MainThreadQueue:
+    """
+    `call(fn, *args)` roda `fn` na thread principal: na hora, se já estamos nela;
+    senão no próximo frame, antes das tasks de jogo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.thread_id = threading.get_ident()
+        self._queue: deque = deque()          # append/popleft são atômicos
+        self.task = self.app.taskMgr.add(self._drain, "main-thread-queue", sort=-45)
+
+    def on_main_thread(self) -> bool:
+        return threading.get_ident() == self.thread_id
+
+    def call(self, fn, *args) -> None:
+        if self.on_main_thread():
+            fn(*args)
+        else:
+            self._queue.append((fn, args))
+
+    def _drain(self, task):
+        queue = self._queue
+        while queue:
+            fn, args = queue.popleft()
+            fn(*args)
+        return Task.cont
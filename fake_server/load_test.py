@@ -0,0 +1,104 @@
+# fake_server/load_test.py
+#
+# Gerador de carga para o fake_server (ou para o servidor real):
+#   uvicorn fake_server.test_endpoint:app --port 8000
+#   python -m fake_server.load_test --clients 50 --jobs 4
+#
+# Cada cliente repete o fluxo do jogo: POST /generate → polling em /result →
+# download do .obj pelo mesmo downloader usado em PendingObject.
+
+import argparse
+import asyncio
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import aiohttp
+
+from prompt.downloader import stream_download
+
+
+@dataclass
+class LoadStats:
+    latencies: list[float] = field(default_factory=list)     # submit → arquivo em disco
+    downloads: list[float] = field(default_factory=list)     # só a transferência
+    finished: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+async def run_job(session: aiohttp.ClientSession, url: str, prompt: str, stats: LoadStats,
+                  poll_interval: float, timeout: float, out_dir: Path) -> None:
+    start = time.perf_counter()
+
+    async with session.post(f"{url}/generate", json={"prompt": prompt}) as resp:
+        if resp.status != 200:
+            stats.rejected += 1
+            return
+        job_id = (await resp.json())["job_id"]
+
+    while time.perf_counter() - start < timeout:
+        await asyncio.sleep(poll_interval)
+        async with session.get(f"{url}/result/{job_id}") as resp:
+            data = await resp.json()
+
+        if data["status"] == "failed":
+            stats.failed += 1
+            return
+        if data["status"] == "finished":
+            dl_start = time.perf_counter()
+            await stream_download(session, f"{url}{data['obj']}", out_dir / f"{job_id}.obj",
+                                  expected_sha256=data.get("sha256"))
+            now = time.perf_counter()
+            stats.downloads.append(now - dl_start)
+            stats.latencies.append(now - start)
+            stats.finished += 1
+            return
+
+    stats.timeouts += 1
+
+
+async def client(idx: int, args, stats: LoadStats, out_dir: Path) -> None:
+    async with aiohttp.ClientSession() as session:
+        for n in range(args.jobs):
+            await run_job(session, args.url, f"{args.prompt} {idx}-{n}", stats,
+                          args.poll_interval, args.timeout, out_dir)
+
+
+async def main(args) -> None:
+    stats = LoadStats()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(i, args, stats, Path(tmp)) for i in range(args.clients)))
+        wall = time.perf_counter() - start
+
+    total = args.clients * args.jobs
+    print(f"\n📊 {args.clients} clientes × {args.jobs} jobs = {total} em {wall:.1f}s")
+    print(f"   concluídos {stats.finished} · falhas {stats.failed} · "
+          f"recusados (503) {stats.rejected} · timeouts {stats.timeouts}")
+    print(f"   throughput: {stats.finished / wall:.2f} jobs/s")
+    for name, values in (("latência", stats.latencies), ("download", stats.downloads)):
+        print(f"   {name:9s} p50 {percentile(values, 50):6.2f}s · p90 {percentile(values, 90):6.2f}s · "
+              f"p99 {percentile(values, 99):6.2f}s · máx {max(values, default=0):6.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço de geração")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=10, help="clientes concorrentes")
+    parser.add_argument("--jobs", type=int, default=1, help="jobs sequenciais por cliente")
+    parser.add_argument("--prompt", default="cadeira")
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=120.0, help="limite por job (s)")
+    asyncio.run(main(parser.parse_args()))
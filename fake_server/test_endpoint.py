@@ -1,13 +1,33 @@
-
 # Assim que roda:
 # .\.venv\Scripts\uvicorn.exe fake_server.test_endpoint:app --host 0.0.0.0 --port 8000
+#
+# Simulação configurável por variáveis de ambiente:
+#   FAKE_WORKERS=4              jobs processados em paralelo
+#   FAKE_QUEUE_DEPTH=32         jobs aguardando na fila (além disso → 503)
+#   FAKE_LATENCY=fixed:10       fixed:S | uniform:A,B | normal:MU,SIGMA | lognormal:MU,SIGMA
+#   FAKE_FAILURE_RATE=0.0       probabilidade de um job terminar em "failed"
+#   FAKE_JOB_TTL=300            segundos que um job concluído fica consultável
+#   FAKE_SEED=                  semente opcional para latências/falhas reproduzíveis
+#   FAKE_PREVIEW_AFTER=0.3      segundos de processamento até publicar a prévia (-1 desliga)
+#   FAKE_PREVIEW_TRIS=2000      orçamento de triângulos da prévia
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from pathlib import Path
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from collections import deque
+from contextlib import asynccontextmanager
+import hashlib
+import os
+import random
+import time
+import uuid
+
+from core.mesh_codec import encode_mesh
+from core.mesh_processing import read_obj, weld_vertices, drop_degenerate_faces, decimate
 
 # ─── Diretórios ──────────────────────────────────────────────────────────────
 BASE_DIR   = Path(__file__).resolve().parent
@@ -15,11 +35,163 @@ STATIC_DIR = BASE_DIR / "static"
 TEST_DIR   = STATIC_DIR / "testjob"
 FIXED_JOB_ID = "testjob"
 
-# ─── Armazena tempo de criação dos jobs ──────────────────────────────────────
-job_start_times = {}
+# ─── Configuração da simulação ───────────────────────────────────────────────
+WORKERS      = int(os.environ.get("FAKE_WORKERS", 4))
+QUEUE_DEPTH  = int(os.environ.get("FAKE_QUEUE_DEPTH", 32))
+LATENCY      = os.environ.get("FAKE_LATENCY", "fixed:10")
+FAILURE_RATE = float(os.environ.get("FAKE_FAILURE_RATE", 0.0))
+JOB_TTL      = float(os.environ.get("FAKE_JOB_TTL", 300))
+# Prévia grosseira publicada durante o processamento (exibição progressiva)
+PREVIEW_AFTER = float(os.environ.get("FAKE_PREVIEW_AFTER", 0.3))
+PREVIEW_TRIS  = int(os.environ.get("FAKE_PREVIEW_TRIS", 2000))
+
+_rng = random.Random(os.environ.get("FAKE_SEED") or None)
+
+
+def parse_latency(spec: str):
+    """Converte "uniform:5,15" em uma função que sorteia a duração de um job."""
+    kind, _, args = spec.partition(":")
+    params = [float(a) for a in args.split(",") if a]
+    samplers = {
+        "fixed":     lambda: params[0],
+        "uniform":   lambda: _rng.uniform(params[0], params[1]),
+        "normal":    lambda: max(0.0, _rng.gauss(params[0], params[1])),
+        "lognormal": lambda: _rng.lognormvariate(params[0], params[1]),
+    }
+    if kind not in samplers:
+        raise ValueError(f"FAKE_LATENCY inválido: {spec}")
+    return samplers[kind]
+
+
+sample_latency = parse_latency(LATENCY)
+
+
+# ─── Tabela de jobs ──────────────────────────────────────────────────────────
+@dataclass
+class Job:
+    job_id: str
+    prompt: str
+    created_at: float
+    duration: float
+    will_fail: bool
+    started_at: float | None = None
+    finished_at: float | None = None
+    status: str = "queued"          # queued | processing | finished | failed | cancelled
+
+
+jobs: dict[str, Job] = {}
+queue: deque[str] = deque()
+running: set[str] = set()
+
+
+def _advance(now: float) -> None:
+    """
+    Avança a simulação até `now`: conclui jobs cujo tempo acabou, promove a fila
+    para os workers livres (no instante exato em que cada worker liberou) e
+    descarta jobs concluídos há mais de JOB_TTL segundos.
+    """
+    while True:
+        done = [jobs[j] for j in running if jobs[j].started_at + jobs[j].duration <= now]
+        if not done and (len(running) >= WORKERS or not queue):
+            break
+
+        if done:
+            job = min(done, key=lambda j: j.started_at + j.duration)
+            job.finished_at = job.started_at + job.duration
+            job.status = "failed" if job.will_fail else "finished"
+            running.discard(job.job_id)
+            freed_at = job.finished_at
+        else:
+            freed_at = now
+
+        while queue and len(running) < WORKERS:
+            nxt = jobs[queue.popleft()]
+            nxt.started_at = max(freed_at, nxt.created_at)
+            nxt.status = "processing"
+            running.add(nxt.job_id)
+
+    expired = [j.job_id for j in jobs.values()
+               if j.finished_at is not None and now - j.finished_at > JOB_TTL]
+    for job_id in expired:
+        del jobs[job_id]
+
+
+# ─── Formato binário (.pjm) gerado a partir do .obj de teste ─────────────────
+def ensure_binary(obj_path: Path) -> dict[str, Path]:
+    """Gera mesh.pjm (cru) e mesh.pjmz (zlib) ao lado do .obj, se estiverem velhos."""
+    outputs = {"pjm": obj_path.with_suffix(".pjm"), "pjmz": obj_path.with_suffix(".pjmz")}
+    mtime = obj_path.stat().st_mtime
+    if all(p.exists() and p.stat().st_mtime >= mtime for p in outputs.values()):
+        return outputs
+
+    positions, colors, faces = read_obj(obj_path)
+    outputs["pjm"].write_bytes(encode_mesh(positions, faces, colors, compress=False))
+    outputs["pjmz"].write_bytes(encode_mesh(positions, faces, colors, compress=True))
+    return outputs
+
+
+def ensure_preview(obj_path: Path) -> Path:
+    """Versão decimada (~PREVIEW_TRIS triângulos) da malha, em mesh.preview.pjmz."""
+    out = obj_path.with_name(f"{obj_path.stem}.preview.pjmz")
+    if out.exists() and out.stat().st_mtime >= obj_path.stat().st_mtime:
+        return out
+
+    positions, colors, faces = read_obj(obj_path)
+    positions, colors, faces = weld_vertices(positions, colors, faces)
+    faces = drop_degenerate_faces(positions, faces)
+    positions, colors, faces = decimate(positions, colors, faces, PREVIEW_TRIS)
+    out.write_bytes(encode_mesh(positions, faces, colors, compress=True))
+    return out
+
+
+# ─── Checksums (cache por mtime para não reler o arquivo a cada poll) ─────────
+_checksums: dict[Path, tuple[float, str]] = {}
+
+
+def file_sha256(path: Path) -> str:
+    mtime = path.stat().st_mtime
+    cached = _checksums.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            h.update(chunk)
+    _checksums[path] = (mtime, h.hexdigest())
+    return h.hexdigest()
+
+
+# ─── Artefatos da malha de teste (gerados uma vez, na subida) ─────────────────
+TEST_OBJ = TEST_DIR / "mesh.obj"
+_formats: dict[str, Path] = {}          # "obj" | "pjm" | "pjmz" → arquivo servido
+_preview: Path | None = None            # mesh.preview.pjmz (None com FAKE_PREVIEW_AFTER < 0)
+
+
+def build_artifacts() -> None:
+    """Codifica os formatos, a prévia e os checksums antes de aceitar requisições."""
+    global _preview
+    if not TEST_OBJ.exists():
+        print(f"⚠️ [FakeServer] {TEST_OBJ} não encontrado; jobs concluídos vão responder 500")
+        return
+    _formats.update({"obj": TEST_OBJ, **ensure_binary(TEST_OBJ)})
+    if PREVIEW_AFTER >= 0:
+        _preview = ensure_preview(TEST_OBJ)
+    for path in [*_formats.values(), _preview]:
+        if path is not None:
+            file_sha256(path)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fora do loop: codificar e decimar a malha leva segundos e travaria os primeiros polls
+    await run_in_threadpool(build_artifacts)
+    yield
+
 
 # ─── App FastAPI ─────────────────────────────────────────────────────────────
-app = FastAPI(title="TripoSR Fake Service")
+app = FastAPI(title="TripoSR Fake Service", lifespan=lifespan)
+# StaticFiles responde a "Range: bytes=N-" com 206, o que permite retomar downloads
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 app.add_middleware(
@@ -35,40 +207,115 @@ class Prompt(BaseModel):
 
 # ─── Endpoints Fake ──────────────────────────────────────────────────────────
 @app.post("/generate")
-async def generate(_: Prompt):
+async def generate(body: Prompt):
     """
-    Cria um job fake com job_id fixo e armazena o tempo de criação.
+    Enfileira um job com id único e latência sorteada. Fila cheia → 503.
     """
-    job_start_times[FIXED_JOB_ID] = datetime.utcnow()
-    return {"job_id": FIXED_JOB_ID}
+    now = time.monotonic()
+    _advance(now)
+
+    if len(queue) >= QUEUE_DEPTH:
+        raise HTTPException(503, "Fila cheia")
+
+    job = Job(
+        job_id=uuid.uuid4().hex,
+        prompt=body.prompt,
+        created_at=now,
+        duration=sample_latency(),
+        will_fail=_rng.random() < FAILURE_RATE,
+    )
+    jobs[job.job_id] = job
+    queue.append(job.job_id)
+    _advance(now)
+
+    return {"job_id": job.job_id}
 
 
 @app.get("/result/{job_id}")
 async def result(job_id: str):
     """
-    Após 10s retorna os arquivos. Antes disso, simula progresso.
+    Enquanto o job roda, simula progresso; ao terminar retorna os arquivos.
     """
-    if job_id != FIXED_JOB_ID:
+    now = time.monotonic()
+    _advance(now)
+
+    job = jobs.get(job_id)
+    if not job:
         raise HTTPException(404, "Job inexistente")
 
-    start_time = job_start_times.get(FIXED_JOB_ID)
-    if not start_time:
-        raise HTTPException(404, "Job não iniciado")
+    if job.status == "queued":
+        return {"status": "queued", "progress": 0, "position": list(queue).index(job_id)}
 
-    elapsed = (datetime.utcnow() - start_time).total_seconds()
+    if job.status == "processing":
+        elapsed = now - job.started_at
+        progress = int((elapsed / job.duration) * 100) if job.duration else 100
+        data = {"status": "processing", "progress": min(progress, 99)}
 
-    if elapsed < 10:
-        progress = int((elapsed / 10) * 100)
-        return {"status": "processing", "progress": progress}
+        # Depois de PREVIEW_AFTER segundos o "modelo" já tem uma versão grosseira para mostrar
+        preview = _preview
+        if preview is not None and elapsed >= PREVIEW_AFTER:
+            data["preview"] = {"url": f"/static/{FIXED_JOB_ID}/{preview.name}",
+                               "size": preview.stat().st_size, "sha256": file_sha256(preview)}
+        return data
 
-    # Arquivos prontos após 10s
-    test_obj = TEST_DIR / "mesh.obj"
+    if job.status == "failed":
+        return {"status": "failed", "error": "Falha simulada na geração"}
 
-    if not test_obj.exists() :
+    if job.status == "cancelled":
+        return {"status": "cancelled"}
+
+    # Arquivos prontos (gerados no lifespan)
+    if not _formats:
         raise HTTPException(500, "Arquivos de teste não encontrados.")
 
     base = f"/static/{FIXED_JOB_ID}"
     return {
         "status": "finished",
         "obj":   f"{base}/mesh.obj",
+        "size":  TEST_OBJ.stat().st_size,
+        "sha256": file_sha256(TEST_OBJ),
+        # Mesma malha em outros formatos; o cliente escolhe o que preferir
+        "formats": {
+            name: {"url": f"{base}/{path.name}", "size": path.stat().st_size, "sha256": file_sha256(path)}
+            for name, path in _formats.items()
+        },
+    }
+
+
+@app.post("/cancel/{job_id}")
+async def cancel(job_id: str):
+    """
+    Cancela um job: sai da fila ou libera o worker imediatamente.
+    """
+    now = time.monotonic()
+    _advance(now)
+
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job inexistente")
+
+    if job.status in ("queued", "processing"):
+        if job.status == "queued":
+            queue.remove(job_id)
+        running.discard(job_id)
+        job.status = "cancelled"
+        job.finished_at = now
+        _advance(now)
+
+    return {"job_id": job_id, "status": job.status}
+
+
+@app.get("/stats")
+async def stats():
+    """Estado da simulação, usado pelo gerador de carga."""
+    _advance(time.monotonic())
+    by_status: dict[str, int] = {}
+    for job in jobs.values():
+        by_status[job.status] = by_status.get(job.status, 0) + 1
+    return {
+        "workers": WORKERS,
+        "queue_depth": QUEUE_DEPTH,
+        "queued": len(queue),
+        "running": len(running),
+        "jobs": by_status,
     }
@@ -1,13 +1,31 @@
 # main.py
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import LVector3f, CollisionTraverser, loadPrcFileData, CollisionHandlerPusher
+from config.settings import get_settings
 from core.engine import Engine
 from core.scene_manager import SceneManager
 from player.controller import PlayerController
 from ui.hud import HUD
 from prompt.prompt_manager import PromptManager
 from player.object_placer import ObjectPlacer
+from prompt.scheduler import GenerationScheduler
+from npc.speculative import SpeculativePregenerator
+from core.mesh_processing import MeshProcessor
+from core.async_loader import AsyncModelLoader
+from core.picking import PickingService
+from core.spatial import SpatialRegistry
+from core.asyncio_pump import AsyncioPump
+from core.audio import AudioSystem
+from core.handles import HandleRegistry
+from core.instancing import InstancedProps
+from core.lifecycle import LifecycleManager
+from core.profiler import FrameProfiler
+from core.quality import QualityController
+from core.replay import InputRecorder
+from core.snapshot import SnapshotStore
+from core.threads import MainThreadQueue, configure_pipeline, setup_task_chains, TASK_CHAINS
 import asyncio
+import random
 
 loadPrcFileData('', 'win-size 1600 900')
 loadPrcFileData('', 'window-title PROJETAO')
@@ -15,7 +33,42 @@ loadPrcFileData('', 'window-title PROJETAO')
 
 class Game(ShowBase):
     def __init__(self):
+        # perfil + arquivo + PROJETAO_* (ver config/settings.py)
+        self.settings = settings = get_settings()
+        # PROJETAO_THREADING=Cull/Draw: cull e draw em threads próprias (vale ao abrir a janela)
+        configure_pipeline(settings.frame.threading_model)
         ShowBase.__init__(self)
+        print(f"⚙️ [Settings] Perfil: {settings.profile}")
+
+        # ───── Threads ─────
+        # PROJETAO_TASK_CHAINS=1: NPCs e loop asyncio em task chains com thread própria
+        if settings.frame.task_chains:
+            setup_task_chains(self)
+        self.main_thread = MainThreadQueue(self)    # volta para a thread principal o que mexe no jogo
+        if settings.frame.threading_model or settings.frame.task_chains:
+            print(f"🧵 [Threads] Pipeline: {settings.frame.threading_model or 'thread única'} · "
+                  f"task chains: {', '.join(TASK_CHAINS) if settings.frame.task_chains else 'não'}")
+
+        # PROJETAO_SEED fixa o layout das salas, decoração e enigmas (replays)
+        self.seed = settings.run.seed
+        use_snapshot = settings.run.snapshot
+        if self.seed is None and use_snapshot:
+            self.seed = SnapshotStore.last_seed(settings.run.snapshot_dir)   # retoma a última masmorra
+        if self.seed is None and (settings.run.record or use_snapshot):
+            self.seed = random.randrange(2 ** 31)     # replay e snapshot precisam recriar as mesmas salas
+        if self.seed is not None:
+            random.seed(self.seed)
+
+        # PROJETAO_PROFILE=1 cronometra tasks/regiões e grava os frames engasgados em profiles/
+        self.profiler = None
+        if settings.profiling.enabled:
+            self.profiler = FrameProfiler(
+                self,
+                threshold_ms=settings.profiling.hitch_ms,
+                history=settings.profiling.history,
+                pstats=settings.profiling.pstats,
+            )
+            self.finalExitCallbacks.append(self._print_profile)
 
         # ───── Colisão ─────
         self.cTrav = CollisionTraverser()
@@ -23,25 +76,82 @@ class Game(ShowBase):
 
         # sistemas centrais
         self.engine  = Engine(self)            # usado por outras partes do jogo
+        self.async_loader = AsyncModelLoader(self, mesh_threads=settings.mesh.loader_threads)   # cargas em runtime fora do frame
+        self.audio   = AudioSystem(self, max_voices=settings.frame.max_voices)   # efeitos pré-carregados, um ouvinte 3D
+        self.lifecycle = LifecycleManager(self)     # tasks/intervals/sons de cada sala
+        self.handles = HandleRegistry(self)         # sala ↔ porta ↔ NPC sem buscas no grafo
+        self.spatial = SpatialRegistry(self, cell_size=settings.frame.spatial_cell)   # NPCs, portas e objetos por célula de grade
+        self.decor   = InstancedProps(self)    # decoração: uma chamada de desenho por modelo
         self.scene_manager = SceneManager(self)
         self.player_controller = PlayerController(self)
+        self.picking = PickingService(self)    # raio da mira, compartilhado
         self.hud     = HUD(self)
-        self.placer  = ObjectPlacer(self)
-        self.prompt_manager = PromptManager()  # acessado dentro de ObjectPlacer / HUD
-
+        # malhas geradas são decimadas em processos separados antes do loadModel
+        self.mesh_processor = MeshProcessor(triangle_budget=settings.mesh.triangle_budget,
+                                            max_workers=settings.mesh.workers)
+        self.finalExitCallbacks.append(self.mesh_processor.shutdown)
+        # asyncio com um orçamento por frame (4 ms no perfil padrão), na thread principal ou na chain "io"
         self.loop = asyncio.get_event_loop()
+        self.asyncio_pump = AsyncioPump(self, self.loop, budget_ms=settings.frame.asyncio_budget_ms,
+                                        task_chain="io" if settings.frame.task_chains else None)
+        gen, net = settings.generation, settings.network
+        self.generation_scheduler = GenerationScheduler(
+            api_url=net.api_url, max_in_flight=gen.max_in_flight,
+            poll_interval=net.poll_interval, max_polls=net.max_polls,
+            background_slots=gen.background_slots, max_cached_results=gen.max_cached_results,
+            processor=self.mesh_processor, prefer_binary=gen.prefer_binary,
+            cache_dir=net.download_cache_dir, chunk_size=net.download_chunk_size,
+            retries=net.download_retries,
+        )
+        # PROJETAO_SPECULATIVE=1 pré-gera as respostas dos enigmas próximos
+        self.speculative = SpeculativePregenerator(
+            self, self.generation_scheduler,
+            lookahead=gen.speculative_lookahead, enabled=gen.speculative,
+        )
+        self.placer  = ObjectPlacer(self)
+        self.prompt_manager = PromptManager(api_url=net.api_url, cache_dir=net.download_cache_dir)  # acessado dentro de ObjectPlacer / HUD
 
         # primeira sala
         self.scene_manager.force_doors_open = False
-        self.scene_manager.load_first_room()
+        # PROJETAO_SNAPSHOT=1 reaproveita a masmorra já gerada com esta semente (snapshots/<seed>/)
+        self.snapshots = None
+        if use_snapshot:
+            self.snapshots = SnapshotStore(self, self.seed, settings.run.snapshot_dir)
+        if self.snapshots and self.snapshots.exists():
+            self.snapshots.load()
+        else:
+            self.scene_manager.load_first_room()
+            if self.snapshots:
+                print(f"🎲 [Snapshot] Semente {self.seed}: gerando a masmorra pela primeira vez")
+                self.snapshots.save_rooms_when_idle()
+        if self.snapshots:
+            self.finalExitCallbacks.append(self.snapshots.save_session)
+        self.speculative.refresh(self.scene_manager.room_index)
+
+        # PROJETAO_QUALITY=auto ajusta decoração/texturas/balões/salas pelo tempo de frame
+        quality = settings.quality
+        self.quality = None
+        if quality.mode != "off":
+            self.quality = QualityController(
+                self,
+                target_ms=quality.target_ms,
+                tier="high" if quality.mode == "auto" else quality.mode,
+                adaptive=quality.mode == "auto",
+                log_path=quality.log_path,
+                resident_rooms=quality.resident_rooms,
+            )
 
         # tasks
         self.taskMgr.add(self.update, "update")
-        self.taskMgr.add(self._poll_asyncio, "asyncioPump")
 
         # input
         self.accept("mouse1", self.placer.confirm_preview_under_cursor)
         self.accept("alt", self.scene_manager.toggle_mapa_resumo)
+        self.accept("f9", self.lifecycle.print_report)
+
+        # PROJETAO_RECORD=sessao.jsonl grava a sessão para benchmarks/bench_replay.py
+        if settings.run.record:
+            self.recorder = InputRecorder(self, settings.run.record, seed=self.seed)
 
         # self.cTrav.showCollisions(self.render)
 
@@ -53,16 +163,16 @@ class Game(ShowBase):
 
         return task.cont
 
-    def _poll_asyncio(self, task):
-        # mantém o loop asyncio vivo sem bloquear o Panda3D
-        self.loop.call_soon(self.loop.stop)
-        self.loop.run_forever()
-        return task.cont
+    def _print_profile(self):
+        print(f"📊 [Profiler] {self.profiler.hitches} frames acima de {self.profiler.threshold_ms:.0f} ms")
+        for name, avg, worst in self.profiler.summary():
+            print(f"   {name:32s} média {avg:6.2f} ms   pior {worst:7.2f} ms")
 
     # camada de integração Prompt ↔ Placer
     def handle_prompt_submission(self, prompt: str):
         print("📨 [Game] Enviando prompt:", prompt)
-        self.loop.create_task(self.placer.handle_prompt_submission(prompt))
+        self.messenger.send("prompt-submitted", [prompt])
+        self.asyncio_pump.spawn(self.placer.handle_prompt_submission(prompt))
 
 
 if __name__ == "__main__":
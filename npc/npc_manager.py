@@ -2,9 +2,10 @@ from panda3d.core import NodePath, LVector3f, Filename, TextNode, BitMask32, Tra
 from pathlib import Path
 from direct.task import Task
 import random
-from math import sin
-from direct.showbase.Audio3DManager import Audio3DManager
-from core.load_wrapper import load_model_with_default_material
+from core.handles import DoorHandle
+from core.load_wrapper import load_model_with_default_material_async
+from npc.npc_system import NPCSystem
+from core.profiler import region
 from prompt.quiz_system import QuizSystem
 from sentence_transformers import util
 from direct.interval.LerpInterval import LerpColorScaleInterval, LerpPosInterval
@@ -18,10 +19,13 @@ class NPCManager:
         self.npc_dir = Path("assets/models/npcs")
         self.npc_models = list(self.npc_dir.glob("*.obj"))
         self.spawned_models = set()
-        self.quiz_system = QuizSystem()
+        settings = app.settings
+        self.quiz_system = QuizSystem(settings.inference.quiz_model, device=settings.inference.device)
         self.npcs: list[NodePath] = []
-        self.audio3d = Audio3DManager(self.app.sfxManagerList[0], self.app.camera)
-        self.som_porta = self.audio3d.loadSfx("assets/sounds/porta-abrindo.wav")
+        # balões e respiração de todos os NPCs em uma única task (na chain "npc" no modo multithread)
+        self.system = NPCSystem(app, speech_distance=settings.npc.speech_distance,
+                                breathing_distance=settings.npc.breathing_distance,
+                                task_chain="npc" if settings.frame.task_chains else None)
 
         self.qa_triples = [
             {
@@ -73,40 +77,41 @@ class NPCManager:
 
         self.perguntas_restantes = self.qa_triples.copy()
 
-    def spawn_npc(self, *, door_node=None, npc_scale=3.0) -> NodePath:
+    def spawn_npc(self, *, door: DoorHandle | None = None, room_index: int | None = None,
+                  npc_scale=3.0, on_model_ready=None,
+                  model_path: Path | None = None, qa: dict | None = None) -> NodePath:
+        """
+        `door` é a porta que o NPC guarda; `model_path` e `qa` fixam o modelo e o
+        enigma (restauração de snapshot).
+        """
         if not self.npc_models:
             print("Nenhum modelo .obj encontrado em assets/models/npcs")
             return None
 
-        available_models = [m for m in self.npc_models if m not in self.spawned_models]
-        if not available_models:
-            self.spawned_models.clear()
-            available_models = list(self.npc_models)
-
-        model_path = random.choice(available_models)
+        if model_path is None:
+            available_models = [m for m in self.npc_models if m not in self.spawned_models]
+            if not available_models:
+                self.spawned_models.clear()
+                available_models = list(self.npc_models)
+            model_path = random.choice(available_models)
         self.spawned_models.add(model_path)
 
         npc = NodePath("npc")
         npc.reparentTo(self.app.render)
 
-        model_node = load_model_with_default_material(self.app.loader, str(model_path))
-        model_node.setName("model_node")
-        model_node.reparentTo(npc)
-
-        def breathing_task(task, node=model_node):
-            amplitude = 0.01 * npc_scale
-            scale = npc_scale + amplitude * sin(task.time * 2)
-            node.setScale(scale)
-            return Task.cont
-
-        self.app.taskMgr.add(breathing_task, f"breathing-task-{id(npc)}")
+        # O modelo chega depois (loader assíncrono); o NPC já existe e recebe o enigma agora
+        load_model_with_default_material_async(
+            self.app.async_loader, str(model_path),
+            self._attach_model, npc, npc_scale, on_model_ready,
+        )
 
         if not self.perguntas_restantes:
             print("[NPCManager] Todas as perguntas foram usadas. Reiniciando ciclo.")
             self.perguntas_restantes = self.qa_triples.copy()
 
-        qa = random.choice(self.perguntas_restantes)
-        self.perguntas_restantes.remove(qa)
+        if qa is None:
+            qa = random.choice(self.perguntas_restantes)
+        self.perguntas_restantes = [q for q in self.perguntas_restantes if q["question"] != qa["question"]]
 
         self.quiz_system.definir_enigma(qa["question"], qa["answers"])
         npc.setPythonTag("threshold", qa["threshold"])
@@ -125,25 +130,37 @@ class NPCManager:
         speech_node_path.setDepthWrite(False)
         speech_node_path.setDepthTest(False)
         speech_node_path.reparentTo(npc)
-        speech_node_path.setName("speech_node")  # identificável no .find()
+        speech_node_path.setName("speech_node")
         speech_node_path.hide()
-
-        def update_speech(task, node=speech_node_path):
-            player_node = getattr(self.app.player_controller, "node", None)
-            if player_node:
-                distance = (npc.getPos(self.app.render) - player_node.getPos(self.app.render)).length()
-                node.show() if distance < 10.0 else node.hide()
-            return Task.cont
-
-        self.app.taskMgr.add(update_speech, f"text-follow-{id(npc)}")
-
-        npc.setPythonTag("door_node", door_node)
+        self.system.register(npc, speech_node_path)
+        if room_index is not None:
+            # Sai da respiração antes de a sala remover o nó (a chain "npc" pode estar no meio de um frame)
+            self.app.lifecycle.owner(room_index).on_release(lambda: self.system.forget(npc))
+        self.app.handles.add_npc(room_index, npc, door=door, speech=speech_node_path)
+
+        npc.setPythonTag("model_path", model_path)
+        npc.setPythonTag("qa", qa)
         npc.setPythonTag("answers", qa["answers"])
         npc.setPythonTag("threshold", qa["threshold"])
 
         self.npcs.append(npc)
         return npc
 
+    def _attach_model(self, model_node, npc: NodePath, npc_scale: float, on_model_ready):
+        if model_node is None or npc.isEmpty():
+            return
+
+        model_node.setName("model_node")
+        model_node.reparentTo(npc)
+        handle = self.app.handles.of(npc)
+        if handle is not None:
+            handle.model = model_node
+
+        if on_model_ready:
+            on_model_ready(npc, model_node)
+        # a escala de repouso entra depois do alinhamento, como na antiga task de respiração
+        self.system.set_model(npc, model_node, npc_scale)
+
     def on_correct_response(self, door_node: NodePath):
         print("✅ Resposta correta! Procurando portas para remoção...")
 
@@ -152,14 +169,14 @@ class NPCManager:
             return
 
 
+        door = self.app.handles.of(door_node)
         door_name = door_node.getName()
         print(f"🟨 Encontrada porta: {door_name}")
+        owner = self.app.lifecycle.owner_of(door_node)     # sala dona da porta
 
         door_node.setTransparency(TransparencyAttrib.MAlpha)
         door_node.setColorScale(1, 1, 1, 1)
-        if self.som_porta:
-            self.audio3d.attachSoundToObject(self.som_porta, door_node)
-            self.som_porta.play()
+        self.app.audio.play("porta", node=door_node)
 
         fade = LerpColorScaleInterval(
             door_node,
@@ -172,69 +189,74 @@ class NPCManager:
             print(f"🚪 Fade-out concluído. Tentando remover {door_name}")
             if not door_node.isEmpty():
                 # ❌ remover o colisor explicitamente
-                col_np = door_node.find("**/+CollisionNode")
-                if not col_np.isEmpty():
+                col_np = door.collider if door is not None else None
+                if col_np is not None and not col_np.isEmpty():
                     print(f"🗑️ Removendo colisor: {col_np.getName()}")
                     col_np.removeNode()
 
                 door_node.hide()
 
-                # Mostra frase de parabéns no NPC correspondente
-                for npc in self.npcs:
-                    if npc.getPythonTag("door_node") == door_node:
-                        speech_node = npc.find("**/speech_node")
-                        if not speech_node.isEmpty():
-                            frase = random.choice(self.frases_parabens)
-                            text_node = TextNode("npc-text")
-                            text_node.setText(frase)
-                            text_node.setAlign(TextNode.ACenter)
-                            text_node.setTextColor(1, 1, 0.5, 1)
-                            text_node.setCardColor(0, 0, 0, 1)
-                            text_node.setCardAsMargin(0.3, 0.3, 0.2, 0.2)
-
-                            new_node = NodePath(text_node.generate())
-                            new_node.setScale(0.2)
-                            new_node.setBillboardAxis()
-                            new_node.setLightOff()
-                            new_node.setDepthWrite(False)
-                            new_node.setDepthTest(False)
-                            new_node.setZ(2)  # ⬆️ sobe 2 unidades
-
-                            speech_node.removeNode()
-                            new_node.setName("speech_node")
-                            new_node.reparentTo(npc)
-
-                            # ⏳ remove depois de 3 segundos
-                            def hide_text(task, node=new_node):
-                                if not node.isEmpty():
-                                    node.removeNode()
-                                return Task.done
-
-                            self.app.taskMgr.doMethodLater(3, hide_text, f"remove-speech-{id(new_node)}")
-                        break
-
+                # Mostra frase de parabéns no NPC que guarda a porta
+                npc_handle = door.npc if door is not None else None
+                if npc_handle is not None and not npc_handle.node.isEmpty():
+                    npc = npc_handle.node
+                    speech_node = npc_handle.speech
+                    if speech_node is not None and not speech_node.isEmpty():
+                        frase = random.choice(self.frases_parabens)
+                        text_node = TextNode("npc-text")
+                        text_node.setText(frase)
+                        text_node.setAlign(TextNode.ACenter)
+                        text_node.setTextColor(1, 1, 0.5, 1)
+                        text_node.setCardColor(0, 0, 0, 1)
+                        text_node.setCardAsMargin(0.3, 0.3, 0.2, 0.2)
+
+                        new_node = NodePath(text_node.generate())
+                        new_node.setScale(0.2)
+                        new_node.setBillboardAxis()
+                        new_node.setLightOff()
+                        new_node.setDepthWrite(False)
+                        new_node.setDepthTest(False)
+                        new_node.setZ(2)  # ⬆️ sobe 2 unidades
+
+                        speech_node.removeNode()
+                        new_node.setName("speech_node")
+                        new_node.reparentTo(npc)
+                        npc_handle.speech = new_node
+                        # a frase de parabéns aparece independente da distância
+                        self.system.set_speech_node(npc, None)
+
+                        # ⏳ remove depois de 3 segundos
+                        def hide_text(task, node=new_node):
+                            if not node.isEmpty():
+                                node.removeNode()
+                            return Task.done
+
+                        task = self.app.taskMgr.doMethodLater(3, hide_text, f"remove-speech-{id(new_node)}")
+                        if owner:
+                            owner.add_task(task)
+
+                if door is not None:
+                    self.app.handles.remove_door(door)
+                self.app.spatial.remove(door_node)
                 door_node.removeNode()
                 print("🚪 Porta removida com sucesso.")
+                self.app.messenger.send("door-opened", [door_name])
             else:
                 print("⚠️ door_node já estava vazio.")
 
-            restantes = self.app.render.find_all_matches("**/porta_sala*")
+            restantes = self.app.handles.doors
             if restantes:
-                print(f"❌ Ainda existem {restantes.get_num_paths()} portas com prefixo 'porta_sala':")
-                for path in restantes:
-                    print("↪️", path)
-
-        # Detecta direção da porta com segurança
-        parts = door_name.split("_")
-        direction = parts[-1] if len(parts) >= 4 else "north"
+                print(f"❌ Ainda há {len(restantes)} portas fechadas no registro:")
+                for restante in restantes:
+                    print("↪️", restante.name)
 
-        # Vetor de deslizamento perpendicular à parede
+        # Vetor de deslizamento perpendicular à parede; porta fora do registro só some
         slide_offset = {
             "north": LVector3f(2.5, 0, 0),
             "south": LVector3f(-2.5, 0, 0),
             "east": LVector3f(0, -2.5, 0),
             "west": LVector3f(0, 2.5, 0),
-        }.get(direction, LVector3f(2.5, 0, 0))
+        }.get(door.direction if door is not None else None, LVector3f(0, 0, 0))
 
         # Slide
         slide = LerpPosInterval(
@@ -252,28 +274,31 @@ class NPCManager:
         )
 
         # Executa em paralelo (ao mesmo tempo)
-        Sequence(
+        sequence = Sequence(
             Parallel(fade, slide),
             Func(finalizar)
-        ).start()
+        )
+        if owner:
+            owner.add_interval(sequence)
+        sequence.start()
 
     def try_prompt_nearby(self, prompt: str, obj_pos, radius: float = 5) -> bool:
         model = self.quiz_system.model
-        for npc in self.npcs:
-            if (npc.getPos(self.app.render).getXy() - obj_pos.getXy()).length() > radius:
-                continue
-
+        for _, entry in self.app.spatial.query_radius(obj_pos, radius, kind="npc"):
+            npc = entry.node
             answers = npc.getPythonTag("answers")
             threshold = npc.getPythonTag("threshold")
 
-            emb_p = model.encode(prompt, convert_to_tensor=True)
-            emb_a = model.encode(answers, convert_to_tensor=True)
+            with region("embedding-encode"):
+                emb_p = model.encode(prompt, convert_to_tensor=True)
+                emb_a = model.encode(answers, convert_to_tensor=True)
             score = util.cos_sim(emb_p, emb_a).max().item()
 
             if score >= threshold:
-                door = npc.getPythonTag("door_node")
-                if door and not door.isEmpty():
-                    self.on_correct_response(door)
+                handle = self.app.handles.of(npc)
+                door = handle.door if handle is not None else None
+                if door is not None and not door.node.isEmpty():
+                    self.on_correct_response(door.node)
                     print(f"✅ Porta da sala aberta! (score {score:.2f})")
                 return True
         return False
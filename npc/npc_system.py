@@ -0,0 +1,132 @@
+# npc/npc_system.py
+
+import random
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from direct.showbase.DirectObject import DirectObject
+from direct.task import Task
+from panda3d.core import NodePath
+
+BREATH_AMPLITUDE = 0.01     # fração da escala base
+BREATH_SPEED     = 2.0      # rad/s
+
+
+@dataclass(eq=False)
+class NPCState:
+    npc: NodePath
+    speech_node: NodePath | None = None
+    model: NodePath | None = None
+    base_scale: float = 1.0
+    phase: float = 0.0
+
+
+class NPCSystem(DirectObject):
+    """
+    Uma única task para todos os NPCs. Quem está perto do jogador vem dos eventos
+    de proximidade do SpatialRegistry (`app.spatial`), então nada aqui percorre a
+    lista inteira de NPCs:
+
+    • "npc-speech-enter/leave" mostram e escondem o balão;
+    • "npc-breath-enter/leave" mantêm o conjunto que respira. A respiração usa uma
+      fase compartilhada (com deslocamento por NPC), calculada de uma vez com NumPy;
+      de longe 1% de escala não aparece.
+
+    Com `task_chain` a respiração roda na thread da chain; os eventos continuam
+    na principal, e `_lock` impede que um NPC volte à escala de repouso e em
+    seguida receba a escala de um frame de respiração já calculado, ou que a
+    chain mexa num NPC cuja sala está sendo liberada (`forget`).
+    """
+
+    def __init__(self, app, speech_distance: float = 10.0, breathing_distance: float = 25.0,
+                 task_chain: str | None = None):
+        DirectObject.__init__(self)
+        self.app = app
+        self.speech_distance = speech_distance
+        self.breathing_distance = breathing_distance
+        self._breathing: dict[int, NPCState] = {}
+        self._lock = threading.Lock()
+        # derivado do `random` global, para seguir PROJETAO_SEED nos replays
+        self._rng = np.random.default_rng(random.getrandbits(32))
+
+        self.app.spatial.watch("npc-speech", "npc", speech_distance)
+        self.app.spatial.watch("npc-breath", "npc", breathing_distance)
+        self.accept("npc-speech-enter", self._on_speech, [True])
+        self.accept("npc-speech-leave", self._on_speech, [False])
+        self.accept("npc-breath-enter", self._on_breath_enter)
+        self.accept("npc-breath-leave", self._on_breath_leave)
+
+        self.task = self.app.taskMgr.add(self._update, "npc-system", taskChain=task_chain)
+
+    # ───────────────────────── API ─────────────────────────
+    def register(self, npc: NodePath, speech_node: NodePath | None = None) -> NPCState:
+        """O NPC só passa a receber eventos depois de entrar no `app.spatial` como "npc"."""
+        state = NPCState(npc, speech_node, phase=float(self._rng.uniform(0, 2 * np.pi)))
+        npc.setPythonTag("npc_state", state)
+        return state
+
+    def set_model(self, npc: NodePath, model_node: NodePath, scale: float) -> None:
+        """Modelo que respira; `scale` é a escala de repouso."""
+        model_node.setScale(scale)
+        state = self.state_for(npc)
+        if state is not None:
+            state.model = model_node
+            state.base_scale = scale
+
+    def set_speech_node(self, npc: NodePath, speech_node: NodePath | None) -> None:
+        """Troca (ou desliga, com None) o balão controlado pela distância."""
+        state = self.state_for(npc)
+        if state is not None:
+            state.speech_node = speech_node
+
+    def forget(self, npc: NodePath) -> None:
+        """NPC que vai sair da cena: o `app.spatial` descarta a sala sem eventos de saída."""
+        state = self.state_for(npc)
+        if state is not None:
+            with self._lock:
+                self._breathing.pop(id(state), None)
+
+    def set_speech_distance(self, distance: float) -> None:
+        self.speech_distance = distance
+        self.app.spatial.set_watch_radius("npc-speech", distance)
+
+    @staticmethod
+    def state_for(npc: NodePath) -> NPCState | None:
+        if npc.isEmpty() or not npc.hasPythonTag("npc_state"):
+            return None
+        return npc.getPythonTag("npc_state")
+
+    # ─────────────────────── EVENTOS ───────────────────────
+    def _on_speech(self, visible: bool, npc: NodePath):
+        state = self.state_for(npc)
+        node = state.speech_node if state else None
+        if node is not None and not node.isEmpty():
+            node.show() if visible else node.hide()
+
+    def _on_breath_enter(self, npc: NodePath):
+        state = self.state_for(npc)
+        if state is not None:
+            with self._lock:
+                self._breathing[id(state)] = state
+
+    def _on_breath_leave(self, npc: NodePath):
+        with self._lock:
+            state = self._breathing.pop(id(self.state_for(npc)), None)
+            # Quem saiu do raio volta à escala de repouso
+            if state is not None and state.model is not None and not state.model.isEmpty():
+                state.model.setScale(state.base_scale)
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _update(self, task):
+        with self._lock:
+            states = [s for s in self._breathing.values() if s.model is not None and not s.model.isEmpty()]
+            if not states:
+                return Task.cont
+
+            phases = np.fromiter((s.phase for s in states), np.float32, len(states))
+            bases = np.fromiter((s.base_scale for s in states), np.float32, len(states))
+            scales = bases * (1.0 + BREATH_AMPLITUDE * np.sin(task.time * BREATH_SPEED + phases))
+            for state, scale in zip(states, scales.tolist()):
+                state.model.setScale(scale)
+        return Task.cont
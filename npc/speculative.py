@@ -0,0 +1,106 @@
+# npc/speculative.py
+
+from direct.showbase.DirectObject import DirectObject
+from panda3d.core import NodePath
+
+from prompt.scheduler import (GenerationScheduler, GenerationTicket, normalize_prompt,
+                              PRIORITY_BACKGROUND, PRIORITY_PLAYER)
+
+
+class SpeculativePregenerator(DirectObject):
+    """
+    Gera em segundo plano (prioridade baixa) o modelo da resposta canônica dos
+    enigmas da sala atual e das `lookahead` seguintes. Quando o jogador digita uma
+    das respostas aceitas, o job especulativo é reaproveitado e o objeto aparece
+    quase na hora.
+
+    Métricas:
+    • hit rate  → prompts do jogador atendidos por um job especulativo / prompts consultados
+    • wasted    → gerações especulativas concluídas que ninguém usou
+    """
+
+    def __init__(self, app, scheduler: GenerationScheduler, lookahead: int = 1, enabled: bool = False):
+        self.app = app
+        self.scheduler = scheduler
+        self.lookahead = lookahead
+        self.enabled = enabled
+
+        self._tickets: dict[NodePath, GenerationTicket] = {}   # npc → job especulativo
+        self.lookups = 0
+        self.hits = 0
+        self.wasted = 0
+        self.cancelled = 0
+
+        if enabled:
+            self.accept("room-changed", self.refresh)
+
+    # ───────────────────────── API ─────────────────────────
+    def refresh(self, room_index: int) -> None:
+        """Ajusta os jobs especulativos à janela [sala atual, sala atual + lookahead]."""
+        if not self.enabled:
+            return
+
+        window = range(room_index, room_index + self.lookahead + 1)
+        wanted = [handle.node for handle in self.app.handles.npcs(window) if not handle.solved]
+        # Os handles são da thread principal; tickets e scheduler, do loop asyncio
+        self.app.asyncio_pump.call(self._sync, wanted)
+
+    def claim(self, prompt: str) -> GenerationTicket | None:
+        """
+        Se `prompt` for uma das respostas aceitas de um NPC especulado, devolve um
+        ticket (já com prioridade de jogador) para o mesmo job; senão None.
+        """
+        if not self.enabled:
+            return None
+
+        self.lookups += 1
+        key = normalize_prompt(prompt)
+        for npc, spec_ticket in self._tickets.items():
+            answers = {normalize_prompt(a) for a in npc.getPythonTag("answers")}
+            if key not in answers:
+                continue
+
+            # Inscreve o jogador no mesmo job (promovendo-o) antes de soltar o especulativo
+            ticket = self.scheduler.submit(spec_ticket.job.prompt, PRIORITY_PLAYER)
+            spec_ticket.cancel()
+            del self._tickets[npc]
+            self.hits += 1
+            print(f"⚡ [Speculative] Hit para '{prompt}' ({spec_ticket.job.status}) · {self.summary()}")
+            return ticket
+
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "wasted": self.wasted,
+            "cancelled": self.cancelled,
+            "in_progress": len(self._tickets),
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"hit rate {s['hit_rate']:.0%} ({s['hits']}/{s['lookups']}) · "
+                f"desperdiçadas {s['wasted']} · canceladas {s['cancelled']}")
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _sync(self, wanted: list[NodePath]) -> None:
+        for npc in list(self._tickets):
+            if npc not in wanted:
+                self._drop(npc)
+
+        for npc in wanted:
+            if npc not in self._tickets:
+                canonical = npc.getPythonTag("answers")[0]
+                self._tickets[npc] = self.scheduler.submit(canonical, PRIORITY_BACKGROUND)
+
+    def _drop(self, npc: NodePath) -> None:
+        ticket = self._tickets.pop(npc)
+        if ticket.job.status == "finished":
+            self.wasted += 1
+        else:
+            self.cancelled += 1
+        ticket.cancel()
+        print(f"🗑️ [Speculative] Descartando '{ticket.job.prompt}' · {self.summary()}")
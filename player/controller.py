@@ -1,7 +1,6 @@
 from direct.showbase.ShowBaseGlobal import globalClock
-from panda3d.core import Vec3, WindowProperties
+from panda3d.core import GraphicsWindow, Vec3, WindowProperties
 from panda3d.core import CollisionTraverser, CollisionHandlerPusher, CollisionNode, CollisionSphere, BitMask32, CollisionCapsule
-from direct.showbase.Audio3DManager import Audio3DManager
 import random, time
 
 class PlayerController:
@@ -56,7 +55,6 @@ class PlayerController:
         # ── Loop de atualização ───────────────────────────────
         self.app.taskMgr.add(self.update, "PlayerControllerUpdate")
 
-        self.audio3d = Audio3DManager(self.app.sfxManagerList[0], self.app.camera)
         self.ultimo_passo = 0.0
         self.intervalo_passo = 0.65  # bem espaçados
 
@@ -77,7 +75,13 @@ class PlayerController:
             self.app.hud.show_prompt()
             self.moving = False
 
+    def has_pointer(self) -> bool:
+        """Offscreen (replays, benchmarks) não há janela de verdade nem mouse."""
+        return isinstance(self.app.win, GraphicsWindow) and self.app.mouseWatcherNode is not None
+
     def lock_mouse(self):
+        if not self.has_pointer():
+            return
         props = WindowProperties()
         props.setCursorHidden(True)
         props.setMouseMode(WindowProperties.M_relative)
@@ -85,21 +89,25 @@ class PlayerController:
 
     def update(self, task):
         dt = globalClock.getDt()
-        if not self.moving or not self.app.mouseWatcherNode.hasMouse():
+        if not self.moving:
             return task.cont
 
         # ── MOUSE LOOK ──────────────────────────────
-        mpos = self.app.win.getPointer(0)
-        win_cx = self.app.win.getXSize() // 2
-        win_cy = self.app.win.getYSize() // 2
-        dx = mpos.getX() - win_cx
-        dy = mpos.getY() - win_cy
-
-        self.node.setH(self.node.getH() - dx * self.mouse_sensitivity)
-        self.pitch -= dy * self.mouse_sensitivity
-        self.pitch = max(-89, min(89, self.pitch))
-        self.app.camera.setP(self.pitch)
-        self.app.win.movePointer(0, win_cx, win_cy)
+        # Offscreen a pose vem de fora (ReplayDriver); só movimento e colisão rodam
+        if self.has_pointer():
+            if not self.app.mouseWatcherNode.hasMouse():
+                return task.cont
+            mpos = self.app.win.getPointer(0)
+            win_cx = self.app.win.getXSize() // 2
+            win_cy = self.app.win.getYSize() // 2
+            dx = mpos.getX() - win_cx
+            dy = mpos.getY() - win_cy
+
+            self.node.setH(self.node.getH() - dx * self.mouse_sensitivity)
+            self.pitch -= dy * self.mouse_sensitivity
+            self.pitch = max(-89, min(89, self.pitch))
+            self.app.camera.setP(self.pitch)
+            self.app.win.movePointer(0, win_cx, win_cy)
 
         # ── MOVIMENTO ───────────────────────────────
         direction = Vec3(0, 0, 0)
@@ -115,9 +123,7 @@ class PlayerController:
             self.node.setFluidPos(self.node.getPos() + world_dir * self.speed * dt)
             agora = time.time()
             if agora - self.ultimo_passo > self.intervalo_passo:
-                som = self.app.loader.loadSfx("assets/sounds/passo.wav")
-                som.setVolume(1.0)
-                som.play()
+                self.app.audio.play("passo", volume=1.0)
                 self.ultimo_passo = agora
 
         self.node.setZ(2)
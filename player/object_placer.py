@@ -1,19 +1,48 @@
+from direct.showbase.DirectObject import DirectObject
+
 from .pending_object import PendingObject
 
+# Prévias não posicionadas são abandonadas quando o jogador se afasta este número de salas
+ABANDON_ROOM_DISTANCE = 2
+
 
-class ObjectPlacer:
+class ObjectPlacer(DirectObject):
     def __init__(self, app):
         self.app = app
         self.pending_objects = []
+        self.accept("room-changed", self._on_room_changed)
 
     async def handle_prompt_submission(self, prompt: str):
-        obj = PendingObject(self.app, prompt)
-        self.pending_objects.append(obj)
+        # Roda no loop asyncio (chain "io" no modo multithread); a lista de prévias
+        # e a cena são da thread principal
+        self.app.main_thread.call(self._cancel_unplaced)
+
+        # Modo especulativo: a resposta pode já estar sendo (ou ter sido) gerada
+        ticket = self.app.speculative.claim(prompt) or self.app.generation_scheduler.submit(prompt)
+        obj = PendingObject(self.app, prompt, ticket)
+        self.app.main_thread.call(self._track, obj)
         await obj.start()
 
+    def _cancel_unplaced(self):
+        # Um novo prompt substitui as prévias que ainda não foram posicionadas
+        for old in self.pending_objects:
+            if not old.placed:
+                old.cancel()
+        self.pending_objects = [o for o in self.pending_objects if o.placed]
+
+    def _track(self, obj: PendingObject):
+        self.pending_objects.append(obj)
+
     def confirm_preview_under_cursor(self):
-        # Confirma o último modelo não posicionado e pronto
+        # Confirma o último modelo não posicionado e pronto, no ponto sob a mira
         for obj in reversed(self.pending_objects):
             if obj.ready and not obj.placed:
-                obj.confirm()
-                break
\ No newline at end of file
+                obj.confirm(self.app.picking.pick_now())
+                break
+
+    def _on_room_changed(self, room_index: int):
+        for obj in self.pending_objects:
+            if not obj.placed and abs(room_index - obj.origin_room) >= ABANDON_ROOM_DISTANCE:
+                print(f"🚶 [ObjectPlacer] Prévia '{obj.prompt}' abandonada, cancelando.")
+                obj.cancel()
+        self.pending_objects = [o for o in self.pending_objects if not o.cancelled]
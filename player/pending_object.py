@@ -1,17 +1,18 @@
-import asyncio, aiohttp, aiofiles, tempfile, uuid
+import time
 from math import degrees, atan2
 from pathlib import Path
 from direct.task import Task
 from direct.gui.OnscreenText import OnscreenText
-from panda3d.core import (NodePath, Filename, CollisionRay, CollisionNode, CollisionHandlerQueue,
-                          CollisionTraverser, BitMask32, Point3)
+from panda3d.core import NodePath, Point3
+from prompt.scheduler import GenerationTicket
 
-API_URL = "http://127.0.0.1:8000"
 
 class PendingObject:
-    def __init__(self, app, prompt: str):
+    def __init__(self, app, prompt: str, ticket: GenerationTicket):
         self.app = app
         self.prompt = prompt
+        self.ticket = ticket
+        self.origin_room = app.scene_manager.room_index
         self.placeholder = None
         self.final_model_path = None
         self.final_model_node = None
@@ -20,102 +21,179 @@ class PendingObject:
         self.task = None
         self.ready = False
         self.placed = False
+        self.cancelled = False
+        self._final_loading = False
+        self._preview_loading = False
+        self.showing_preview = False
         self.position = None
 
+        # Medição do tempo até a primeira geometria de verdade (prévia grosseira ou final)
+        self.submitted_at = time.perf_counter()
+        self.first_geometry_at = None
+
     async def start(self):
-        self.placeholder = self.app.loader.loadModel("assets/models/placeholder.obj")
+        # A corrotina pode estar na chain "io": a cena é montada na thread principal
+        self.app.main_thread.call(self._show_progress)
+
+        path = await self.ticket.wait()
+        if path and not self.cancelled:
+            self.final_model_path = path
+            self.ready = True
+
+    def _show_progress(self):
+        if self.cancelled:
+            return
+        self.app.async_loader.load("assets/models/placeholder.obj", self._on_placeholder_loaded)
+
+        self.progress_text = OnscreenText(text="0%", pos=(0, 0.7), scale=0.07, fg=(1, 1, 1, 1), mayChange=True)
+        self.task = self.app.taskMgr.add(self.update_task, f"progress-task-{id(self)}")
+        self.app.picking.subscribe(self._on_pick)
+
+    def _on_placeholder_loaded(self, model: NodePath | None):
+        if model is None:
+            return
+        if self.cancelled or self.final_model_node or self.placeholder:
+            model.removeNode()
+            return
+        self._show_standin(model)
+
+    def _on_preview_loaded(self, model: NodePath | None):
+        """Malha grosseira enviada pelo servidor enquanto a final ainda é gerada."""
+        self._preview_loading = False
+        if model is None:
+            return
+        if self.cancelled or self.final_model_node:
+            model.removeNode()
+            return
+        self.showing_preview = True
+        self._show_standin(model)
+        self._mark_first_geometry("prévia")
+
+    def _show_standin(self, model: NodePath):
+        """Mostra `model` girando no lugar do marcador atual (engrenagem ou prévia)."""
+        pos = None
+        if self.placeholder:
+            pos = self.placeholder.getPos()
+            self.placeholder.removeNode()
+        if self.rotation:
+            self.rotation.finish()
+
+        self.placeholder = model
         self._normalize_scale(self.placeholder)
         self.placeholder.reparentTo(self.app.render)
         self.placeholder.setTransparency(True)
         self.placeholder.setColorScale(1.5, 1.5, 1.5, 0.5)
-        self.placeholder.setPos(0, 5, -1)
+        if pos is not None:
+            self.placeholder.setPos(pos)
+        else:
+            self.placeholder.setPos(0, 5, -1)
         self.rotation = self.placeholder.hprInterval(2, (360, 0, 0))
         self.rotation.loop()
 
-        self.progress_text = OnscreenText(text="0%", pos=(0, 0.7), scale=0.07, fg=(1, 1, 1, 1))
-        self.task = self.app.taskMgr.add(self.update_task, f"progress-task-{id(self)}")
+    def _mark_first_geometry(self, kind: str):
+        if self.first_geometry_at is None:
+            self.first_geometry_at = time.perf_counter()
+            print(f"👁️ [PendingObject] Primeira geometria ({kind}) de '{self.prompt}' "
+                  f"em {self.first_geometry_at - self.submitted_at:.2f}s")
 
-        asyncio.create_task(self._request_and_download_obj())
-
-    async def _request_and_download_obj(self):
-        async with aiohttp.ClientSession() as session:
-            async with session.post(f"{API_URL}/generate", json={"prompt": self.prompt}) as resp:
-                job_id = (await resp.json())["job_id"]
-
-        for _ in range(300):
-            await asyncio.sleep(0.1)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{API_URL}/result/{job_id}") as resp:
-                    data = await resp.json()
-                    if self.progress_text:
-                        self.progress_text.setText(f"{data.get('progress', 0)}%")
-                    if data["status"] == "finished":
-                        path = await self._download_model(f"{API_URL}{data['obj']}")
-                        self.final_model_path = path
-                        self.ready = True
-                        break
-
-    async def _download_model(self, url: str) -> str:
-        filename = Path(tempfile.gettempdir()) / f"{uuid.uuid4().hex}.obj"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                async with aiofiles.open(filename, "wb") as f:
-                    await f.write(await resp.read())
-        return str(filename)
+    def _on_final_loaded(self, model: NodePath | None):
+        self._final_loading = False
+        if model is None:
+            if self.progress_text:
+                self.progress_text.setText("Falha ao carregar o modelo")
+            return
+        if self.cancelled:
+            model.removeNode()
+            return
+
+        pos = self.placeholder.getPos() if self.placeholder else None
+        if self.placeholder:
+            self.placeholder.removeNode()
+            self.placeholder = None
+        if self.rotation:
+            self.rotation.finish()
+        if self.progress_text:
+            self.progress_text.setText("Pronto!")
+
+        self.final_model_node = model
+        self._normalize_scale(self.final_model_node)
+        self.final_model_node.setTransparency(True)
+        self.final_model_node.setColorScale(1.5, 1.5, 1.5, 0.5)
+        self.final_model_node.reparentTo(self.app.render)
+        if pos is not None:
+            self.final_model_node.setPos(pos)
+        self.rotation = self.final_model_node.hprInterval(2, (360, 0, 0))
+        self.rotation.loop()
+        self.showing_preview = False
+        self._mark_first_geometry("final")
+
+    def cancel(self):
+        """Descarta a prévia (substituída ou abandonada) e libera o job no scheduler."""
+        if self.placed or self.cancelled:
+            return
+        self.cancelled = True
+        self.app.asyncio_pump.call(self.ticket.cancel)     # o scheduler é do loop asyncio
+        self.app.picking.unsubscribe(self._on_pick)
+
+        if self.task:
+            self.app.taskMgr.remove(self.task)
+            self.task = None
+        if self.rotation:
+            self.rotation.finish()
+        for node in (self.placeholder, self.final_model_node):
+            if node and not node.isEmpty():
+                node.removeNode()
+        if self.progress_text:
+            self.progress_text.destroy()
+            self.progress_text = None
+
+    def _update_progress_text(self):
+        if not self.progress_text or self.ready:
+            return
+        job = self.ticket.job
+        if job.status == "queued":
+            position = self.ticket.scheduler.queue_position(job)
+            text = f"Na fila (posição {position + 1})"
+        else:
+            text = job.message
+        if self.progress_text.getText() != text:
+            self.progress_text.setText(text)
 
     def update_task(self, task):
         if self.placed:
-            return Task.cont
-
-        model_to_move = self.final_model_node if self.final_model_node else self.placeholder
-        if not model_to_move:
             return Task.done
 
-        # Atualiza posição
-        picker = CollisionTraverser()
-        queue = CollisionHandlerQueue()
-        ray = CollisionRay()
-        ray.setFromLens(self.app.camNode, 0, 0)
-        ray_node = CollisionNode('preview_ray')
-        ray_node.addSolid(ray)
-        ray_node.setFromCollideMask(BitMask32.bit(1))
-        ray_path = self.app.camera.attachNewNode(ray_node)
-        picker.addCollider(ray_path, queue)
-        picker.traverse(self.app.render)
-
-        if queue.getNumEntries() > 0:
-            queue.sortEntries()
-            hit = queue.getEntry(0).getSurfacePoint(self.app.render)
-            model_to_move.setPos(hit)
-            self._align_to_ground(model_to_move, hit)
-
-        ray_path.removeNode()
-
-        # Substitui engrenagem se pronto
-        if self.ready and not self.final_model_node:
-            pos = self.placeholder.getPos()
-            self.placeholder.removeNode()
-            self.rotation.finish()
-            if self.progress_text:
-                self.progress_text.setText("Pronto!")
+        self._update_progress_text()
 
-            self.final_model_node = self.app.loader.loadModel(Filename.fromOsSpecific(self.final_model_path).getFullpath())
-            self._normalize_scale(self.final_model_node)
-            self.final_model_node.setTransparency(True)
-            self.final_model_node.setColorScale(1.5, 1.5, 1.5, 0.5)
-            self.final_model_node.reparentTo(self.app.render)
-            self.final_model_node.setPos(pos)
-            self.rotation = self.final_model_node.hprInterval(2, (360, 0, 0))
-            self.rotation.loop()
+        # Prévia grosseira: substitui a engrenagem enquanto a malha final não chega
+        job = self.ticket.job
+        if (job.preview_path and not self.showing_preview and not self._preview_loading
+                and not self.ready and not self.final_model_node):
+            self._preview_loading = True
+            self.app.async_loader.load(job.preview_path, self._on_preview_loaded)
+
+        # Troca a engrenagem pelo modelo final quando o arquivo estiver pronto (carga assíncrona)
+        if self.ready and not self.final_model_node and not self._final_loading:
+            self._final_loading = True
+            self.app.async_loader.load(self.final_model_path, self._on_final_loaded)
 
         return Task.cont
 
-    def confirm(self):
+    def _on_pick(self, hit: Point3 | None):
+        """Recebe o ponto sob a mira do PickingService (uma vez por frame)."""
+        model_to_move = self.final_model_node if self.final_model_node else self.placeholder
+        if not model_to_move or hit is None:
+            return
+        model_to_move.setPos(hit)
+        self._align_to_ground(model_to_move, hit)
+
+    def confirm(self, hit: Point3 | None = None):
         if self.placed or not self.ready or not self.final_model_node:
             return
 
-        hit = self._raycast_to_ground()
-        if not hit:
+        if hit is None:
+            hit = self._raycast_to_ground()
+        if hit is None:
             return
 
         self.final_model_node.setPos(hit)
@@ -138,6 +216,14 @@ class PendingObject:
 
         self.placed = True
         self.position = hit
+        self.app.picking.unsubscribe(self._on_pick)
+        room_index = self.placed_room = self.app.scene_manager.room_index
+        self.app.spatial.add(self.final_model_node, "object", pos=hit, group=room_index)
+        # Sai de cena junto com a sala em que foi colocado
+        self.app.lifecycle.owner(room_index).child(f"objeto '{self.prompt}'", self.final_model_node)
+        if self.task:
+            self.app.taskMgr.remove(self.task)
+            self.task = None
 
         from panda3d.core import CollisionNode, CollisionSphere, BitMask32
         bounds = self.final_model_node.getTightBounds()
@@ -167,19 +253,4 @@ class PendingObject:
             node.setZ(final_z)
 
     def _raycast_to_ground(self):
-        ray = CollisionRay()
-        ray.setOrigin(self.app.camera.getPos(self.app.render))
-        ray.setDirection(self.app.camera.getQuat(self.app.render).getForward())
-        cnode = CollisionNode('confirm_ray')
-        cnode.addSolid(ray)
-        cnode.setFromCollideMask(BitMask32.bit(1))
-        ray_np = self.app.render.attachNewNode(cnode)
-        handler = CollisionHandlerQueue()
-        self.app.cTrav.addCollider(ray_np, handler)
-        self.app.cTrav.traverse(self.app.render)
-        self.app.cTrav.removeCollider(ray_np)
-        ray_np.removeNode()
-        if handler.getNumEntries() > 0:
-            handler.sortEntries()
-            return handler.getEntry(0).getSurfacePoint(self.app.render)
-        return None
+        return self.app.picking.pick_now()
@@ -0,0 +1,147 @@
+# prompt/downloader.py
+
+import asyncio
+import hashlib
+import os
+import weakref
+from pathlib import Path
+from typing import Callable
+
+import aiofiles
+import aiohttp
+
+from config.settings import NetworkSettings
+
+# Padrões da seção "network"; o jogo passa os valores configurados (ver GenerationScheduler)
+_DEFAULTS   = NetworkSettings()
+CHUNK_SIZE  = _DEFAULTS.download_chunk_size   # bytes lidos por iteração do stream
+MAX_RETRIES = _DEFAULTS.download_retries      # tentativas de retomar uma transferência interrompida
+CACHE_DIR   = Path(_DEFAULTS.download_cache_dir)
+
+ProgressCallback = Callable[[int, int | None], None]
+
+# Uma trava por arquivo de destino: jobs com o mesmo conteúdo (mesmo sha256)
+# caem no mesmo `dest.part`, e dois escritores nele se atropelam
+_dest_locks: "weakref.WeakValueDictionary[Path, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+class DownloadError(Exception):
+    """Falha definitiva no download (status inesperado ou checksum inválido)."""
+
+
+def cache_path_for(url: str, sha256: str | None = None, suffix: str = ".obj",
+                   cache_dir: str | Path = CACHE_DIR) -> Path:
+    """Caminho estável no cache: pelo checksum, se conhecido, senão pela URL."""
+    key = sha256 or hashlib.sha1(url.encode()).hexdigest()
+    return Path(cache_dir) / f"{key}{suffix}"
+
+
+def _sha256_of(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+async def _sha256_async(path: Path) -> str:
+    """Hash fora do loop: arquivos de dezenas de MB travariam o frame."""
+    return await asyncio.get_running_loop().run_in_executor(None, _sha256_of, path)
+
+
+def _total_from_headers(resp: aiohttp.ClientResponse, offset: int) -> int | None:
+    # "Content-Range: bytes 100-199/200" → 200
+    content_range = resp.headers.get("Content-Range")
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    if resp.content_length is not None:
+        return offset + resp.content_length
+    return None
+
+
+async def stream_download(
+        session: aiohttp.ClientSession,
+        url: str,
+        dest: Path,
+        *,
+        expected_sha256: str | None = None,
+        on_progress: ProgressCallback | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        retries: int = MAX_RETRIES,
+) -> Path:
+    """
+    Baixa `url` em blocos de `chunk_size` direto para `dest`.
+
+    • Escreve em `dest.part` e só renomeia no fim, então `dest` nunca fica pela metade.
+    • Se já existir um `.part`, pede o restante com `Range: bytes=N-` (até `retries` vezes).
+    • Se `expected_sha256` for informado, valida o arquivo e reaproveita o cache.
+    • Downloads simultâneos para o mesmo `dest` são serializados: o segundo
+      encontra o arquivo pronto no cache em vez de escrever no mesmo `.part`.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    lock = _dest_locks.get(dest)
+    if lock is None:
+        lock = _dest_locks[dest] = asyncio.Lock()
+    async with lock:
+        return await _download_locked(session, url, dest, expected_sha256, on_progress, chunk_size, retries)
+
+
+async def _download_locked(session: aiohttp.ClientSession, url: str, dest: Path,
+                           expected_sha256: str | None, on_progress: ProgressCallback | None,
+                           chunk_size: int, retries: int) -> Path:
+    if dest.exists() and expected_sha256 and await _sha256_async(dest) == expected_sha256:
+        if on_progress:
+            size = dest.stat().st_size
+            on_progress(size, size)
+        return dest
+
+    part = dest.with_name(dest.name + ".part")
+
+    for attempt in range(retries + 1):
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            async with session.get(url, headers=headers) as resp:
+                if resp.status == 416:
+                    # O .part já contém o arquivo inteiro
+                    break
+                if resp.status == 200:
+                    # Servidor ignorou o Range: recomeça do zero
+                    offset = 0
+                elif resp.status != 206:
+                    raise DownloadError(f"HTTP {resp.status} ao baixar {url}")
+
+                total = _total_from_headers(resp, offset)
+                done = offset
+                async with aiofiles.open(part, "ab" if offset else "wb") as f:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        await f.write(chunk)
+                        done += len(chunk)
+                        if on_progress:
+                            on_progress(done, total)
+            break
+        except (aiohttp.ClientPayloadError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == retries:
+                raise DownloadError(f"Download interrompido: {url}") from e
+            print(f"⚠️ [Downloader] Conexão caiu em {url}, retomando ({attempt + 1}/{retries})")
+
+    if expected_sha256:
+        digest = await _sha256_async(part)
+        if digest != expected_sha256:
+            part.unlink(missing_ok=True)
+            raise DownloadError(f"Checksum inválido para {url}: {digest} != {expected_sha256}")
+
+    os.replace(part, dest)
+    return dest
+
+
+def format_progress(done: int, total: int | None) -> str:
+    """Texto curto para o `progress_text` do HUD."""
+    mb = done / (1024 * 1024)
+    if total:
+        return f"Baixando {int(done * 100 / total)}% ({mb:.1f}/{total / (1024 * 1024):.1f} MB)"
+    return f"Baixando {mb:.1f} MB"
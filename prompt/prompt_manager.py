@@ -3,32 +3,36 @@
 import aiohttp
 import asyncio
 import pathlib
-import tempfile
 
-API_URL = "http://127.0.0.1:8000"
+from config.settings import DEFAULT_API_URL
+from prompt.downloader import CACHE_DIR, stream_download, cache_path_for
 
 class PromptManager:
-    def __init__(self):
+    def __init__(self, api_url: str = DEFAULT_API_URL, cache_dir: str | pathlib.Path = CACHE_DIR):
         self.loop = asyncio.get_event_loop()
+        self.api_url = api_url
+        self.cache_dir = cache_dir
 
     async def request_model(self, prompt: str) -> pathlib.Path:
         async with aiohttp.ClientSession() as s:
             # Envia o prompt
             print(f"🛰️ Enviando prompt: {prompt}")
-            resp = await s.post(f"{API_URL}/generate", json={"prompt": prompt})
+            resp = await s.post(f"{self.api_url}/generate", json={"prompt": prompt})
+            if resp.status != 200:
+                raise RuntimeError(f"Servidor recusou o prompt (HTTP {resp.status})")
             jid = (await resp.json())["job_id"]
             print(f"🆔 Job ID recebido: {jid}")
 
             # Espera o modelo ser gerado
             while True:
-                result = await (await s.get(f"{API_URL}/result/{jid}")).json()
+                result = await (await s.get(f"{self.api_url}/result/{jid}")).json()
                 if result["status"] == "finished":
                     break
+                if result["status"] == "failed":
+                    raise RuntimeError(result.get("error", "Falha na geração"))
                 await asyncio.sleep(1)
 
-            # Baixa o arquivo .obj
-            tmp_dir = pathlib.Path(tempfile.mkdtemp())
-            obj_path = tmp_dir / "mesh.obj"
-            obj_path.write_bytes(await (await s.get(API_URL + result["obj"])).read())
-
-            return obj_path
+            # Baixa o arquivo .obj em blocos direto para o cache
+            url = self.api_url + result["obj"]
+            sha256 = result.get("sha256")
+            return await stream_download(s, url, cache_path_for(url, sha256, cache_dir=self.cache_dir), expected_sha256=sha256)
@@ -2,11 +2,13 @@
 
 from sentence_transformers import SentenceTransformer, util
 
+from config.settings import InferenceSettings
+
 
 class QuizSystem:
-    def __init__(self):
-        # Você pode trocar por outro modelo mais robusto, se desejar
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, model_name: str = InferenceSettings.quiz_model, device: str | None = None):
+        # Troque o modelo/backend em config/settings.py (seção "inference")
+        self.model = SentenceTransformer(model_name, device=device)
         self.enigma_atual = None
         self.respostas_validas = []
 
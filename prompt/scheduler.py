@@ -0,0 +1,318 @@
+# prompt/scheduler.py
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import aiohttp
+
+from config.settings import DEFAULT_API_URL
+from core.mesh_codec import SUFFIX
+from core.mesh_processing import MeshProcessor
+from prompt.downloader import CACHE_DIR, CHUNK_SIZE, MAX_RETRIES, cache_path_for, format_progress, stream_download
+
+
+PRIORITY_PLAYER     = 0      # prompt digitado pelo jogador
+PRIORITY_BACKGROUND = 10     # trabalho especulativo / pré-carregamento
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Chave de deduplicação: prompts iguais a menos de caixa/espaços viram um job só."""
+    return " ".join(prompt.lower().split())
+
+
+@dataclass
+class GenerationJob:
+    key: str
+    prompt: str
+    priority: int
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+    status: str = "queued"              # queued | running | finished | failed | cancelled
+    message: str = "Na fila"
+    server_job_id: str | None = None
+    result_path: str | None = None
+    preview_path: str | None = None        # malha grosseira, se o servidor mandar uma
+    subscribers: int = 0
+    task: asyncio.Task | None = None
+    future: asyncio.Future | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("finished", "failed", "cancelled")
+
+    @property
+    def wait_time(self) -> float:
+        """Tempo na fila do cliente antes de ir ao servidor."""
+        end = self.started_at if self.started_at is not None else time.monotonic()
+        return end - self.submitted_at
+
+
+class GenerationTicket:
+    """Inscrição de um consumidor (ex.: um PendingObject) em um job possivelmente compartilhado."""
+
+    def __init__(self, scheduler: "GenerationScheduler", job: GenerationJob):
+        self.scheduler = scheduler
+        self.job = job
+        self.cancelled = False
+
+    async def wait(self) -> str | None:
+        """Caminho local do modelo, ou None se o job falhou/foi cancelado."""
+        return await asyncio.shield(self.job.future)
+
+    def cancel(self) -> None:
+        self.scheduler.cancel(self)
+
+
+class GenerationScheduler:
+    """
+    Fica entre o ObjectPlacer e o servidor de geração:
+    • no máximo `max_in_flight` jobs no servidor ao mesmo tempo;
+    • fila de prioridade (menor número sai primeiro, FIFO no empate);
+    • prompts idênticos em andamento compartilham o mesmo job;
+    • prompts já gerados são servidos do cache local sem ir ao servidor;
+    • jobs de fundo nunca ocupam mais que `background_slots` vagas;
+    • jobs sem nenhum consumidor são cancelados, inclusive no servidor;
+    • baixa o formato binário (.pjm) quando o servidor oferece, senão o .obj;
+    • repassa a prévia grosseira que o servidor publica durante a geração;
+    • se houver `processor`, a malha baixada é simplificada antes de ser entregue.
+    """
+
+    def __init__(self, api_url: str = DEFAULT_API_URL, max_in_flight: int = 2,
+                 poll_interval: float = 0.1, max_polls: int = 300,
+                 background_slots: int = 1, max_cached_results: int = 64,
+                 processor: MeshProcessor | None = None, prefer_binary: bool = True,
+                 cache_dir: str | Path = CACHE_DIR, chunk_size: int = CHUNK_SIZE, retries: int = MAX_RETRIES):
+        self.api_url = api_url
+        self.cache_dir = Path(cache_dir)
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.prefer_binary = prefer_binary
+        self.processor = processor
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.max_polls = max_polls
+        self.background_slots = min(background_slots, max_in_flight)
+        self.max_cached_results = max_cached_results
+
+        self._heap: list[tuple[int, int, GenerationJob]] = []
+        self._seq = itertools.count()
+        self._active: dict[str, GenerationJob] = {}     # key → job ainda não concluído
+        self._in_flight = 0
+        self._background_in_flight = 0
+        self._results: OrderedDict[str, str] = OrderedDict()   # key → caminho (LRU)
+        self._session: aiohttp.ClientSession | None = None
+
+        self.completed = 0
+        self.cancelled = 0
+        self.cache_hits = 0
+        self._wait_times: list[float] = []
+
+    # ───────────────────────── API ─────────────────────────
+    def submit(self, prompt: str, priority: int = PRIORITY_PLAYER) -> GenerationTicket:
+        key = normalize_prompt(prompt)
+        job = self._active.get(key)
+
+        cached = self._results.get(key)
+        if job is None and cached and Path(cached).exists():
+            self._results.move_to_end(key)
+            self.cache_hits += 1
+            job = GenerationJob(key=key, prompt=prompt, priority=priority, status="finished",
+                                message="Pronto!", result_path=cached,
+                                future=asyncio.get_event_loop().create_future())
+            job.started_at = job.finished_at = job.submitted_at
+            job.future.set_result(cached)
+        elif job is None:
+            job = GenerationJob(key=key, prompt=prompt, priority=priority,
+                                future=asyncio.get_event_loop().create_future())
+            self._active[key] = job
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+        elif priority < job.priority and job.status == "queued":
+            # Promove o job já enfileirado; a entrada antiga é ignorada ao sair do heap
+            job.priority = priority
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+
+        job.subscribers += 1
+        self._pump()
+        return GenerationTicket(self, job)
+
+    def cancel(self, ticket: GenerationTicket) -> None:
+        if ticket.cancelled:
+            return
+        ticket.cancelled = True
+
+        job = ticket.job
+        job.subscribers -= 1
+        if job.subscribers > 0 or job.done:
+            return
+
+        print(f"🛑 [Scheduler] Cancelando '{job.prompt}' ({job.status})")
+        was_running = job.status == "running"
+        self._finish(job, "cancelled", None)
+        self.cancelled += 1
+
+        if was_running:
+            if job.task:
+                job.task.cancel()
+            if job.server_job_id:
+                asyncio.ensure_future(self._cancel_on_server(job.server_job_id))
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for job in self._active.values() if job.status == "queued")
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def queue_position(self, job: GenerationJob) -> int:
+        queued = sorted((j for j in self._active.values() if j.status == "queued"),
+                        key=lambda j: (j.priority, j.submitted_at))
+        return queued.index(job) if job in queued else 0
+
+    def stats(self) -> dict:
+        waits = self._wait_times or [0.0]
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "cache_hits": self.cache_hits,
+            "avg_wait": sum(waits) / len(waits),
+            "max_wait": max(waits),
+        }
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    # ─────────────────────── INTERNOS ───────────────────────
+    def _pump(self) -> None:
+        while self._in_flight < self.max_in_flight and self._heap:
+            priority, seq, job = heapq.heappop(self._heap)
+            if job.status != "queued" or priority != job.priority:
+                continue                        # cancelado ou promovido (entrada obsoleta)
+
+            if self._is_background(job):
+                if self._background_in_flight >= self.background_slots:
+                    # O topo do heap já é de fundo: o resto também é, então espera
+                    heapq.heappush(self._heap, (priority, seq, job))
+                    break
+                self._background_in_flight += 1
+
+            job.status = "running"
+            job.message = "0%"
+            job.started_at = time.monotonic()
+            self._wait_times.append(job.wait_time)
+            self._in_flight += 1
+            job.task = asyncio.ensure_future(self._run(job))
+
+    @staticmethod
+    def _is_background(job: GenerationJob) -> bool:
+        return job.priority >= PRIORITY_BACKGROUND
+
+    def _finish(self, job: GenerationJob, status: str, path: str | None) -> None:
+        if job.status == "running":
+            self._in_flight -= 1
+            if self._is_background(job):
+                self._background_in_flight -= 1
+        if status == "finished" and path:
+            self._results[job.key] = path
+            self._results.move_to_end(job.key)
+            while len(self._results) > self.max_cached_results:
+                self._results.popitem(last=False)
+        job.status = status
+        job.finished_at = time.monotonic()
+        job.result_path = path
+        if self._active.get(job.key) is job:
+            del self._active[job.key]
+        if not job.future.done():
+            job.future.set_result(path)
+        self._pump()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def _run(self, job: GenerationJob) -> None:
+        session = self._get_session()
+        try:
+            async with session.post(f"{self.api_url}/generate", json={"prompt": job.prompt}) as resp:
+                if resp.status != 200:
+                    job.message = "Servidor ocupado, tente de novo"
+                    self._finish(job, "failed", None)
+                    return
+                job.server_job_id = (await resp.json())["job_id"]
+
+            for _ in range(self.max_polls):
+                await asyncio.sleep(self.poll_interval)
+                async with session.get(f"{self.api_url}/result/{job.server_job_id}") as resp:
+                    data = await resp.json()
+
+                if data["status"] in ("failed", "cancelled"):
+                    job.message = "Falha na geração"
+                    self._finish(job, "failed", None)
+                    return
+                if data["status"] == "finished":
+                    url, sha256, suffix = self._pick_format(data)
+                    path = await self._download(session, url, sha256, suffix,
+                                                on_progress=lambda d, t: setattr(job, "message", format_progress(d, t)))
+                    if self.processor:
+                        job.message = "Otimizando malha..."
+                        path = await self.processor.process(path)
+                    job.message = "Pronto!"
+                    self.completed += 1
+                    self._finish(job, "finished", str(path))
+                    return
+
+                job.message = f"{data.get('progress', 0)}%"
+                if data.get("preview") and job.preview_path is None:
+                    job.preview_path = await self._fetch_preview(session, data["preview"])
+
+            job.message = "Tempo esgotado"
+            self._finish(job, "failed", None)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"⚠️ [Scheduler] Erro em '{job.prompt}': {e}")
+            job.message = "Erro de conexão"
+            self._finish(job, "failed", None)
+
+    async def _fetch_preview(self, session: aiohttp.ClientSession, preview: dict) -> str:
+        """Baixa a prévia grosseira (poucos KB); falha vira "" para não tentar de novo."""
+        url = f"{self.api_url}{preview['url']}"
+        sha256 = preview.get("sha256")
+        try:
+            path = await self._download(session, url, sha256, SUFFIX)
+        except Exception as e:
+            print(f"⚠️ [Scheduler] Prévia indisponível: {e}")
+            return ""
+        return str(path)
+
+    async def _download(self, session: aiohttp.ClientSession, url: str, sha256: str | None, suffix: str,
+                        on_progress=None) -> Path:
+        return await stream_download(session, url, cache_path_for(url, sha256, suffix, self.cache_dir),
+                                     expected_sha256=sha256, on_progress=on_progress,
+                                     chunk_size=self.chunk_size, retries=self.retries)
+
+    def _pick_format(self, data: dict) -> tuple[str, str | None, str]:
+        """URL, checksum e extensão do arquivo a baixar: .pjm comprimido se disponível."""
+        formats = data.get("formats", {})
+        if self.prefer_binary and "pjmz" in formats:
+            fmt = formats["pjmz"]
+            return f"{self.api_url}{fmt['url']}", fmt.get("sha256"), SUFFIX
+        return f"{self.api_url}{data['obj']}", data.get("sha256"), ".obj"
+
+    async def _cancel_on_server(self, server_job_id: str) -> None:
+        try:
+            async with self._get_session().post(f"{self.api_url}/cancel/{server_job_id}") as resp:
+                await resp.read()
+        except aiohttp.ClientError as e:
+            print(f"⚠️ [Scheduler] Falha ao cancelar {server_job_id}: {e}")
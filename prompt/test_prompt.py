@@ -4,6 +4,7 @@ from direct.task.TaskManagerGlobal import taskMgr
 from panda3d.core import Filename, ModelPool, TexturePool
 import math, sys, asyncio
 
+from core.asyncio_pump import AsyncioPump
 from prompt.prompt_manager import PromptManager
 
 class OrbitViewer(ShowBase):
@@ -19,7 +20,7 @@ class OrbitViewer(ShowBase):
         )
 
         self.loop = asyncio.get_event_loop()
-        taskMgr.add(self._poll_asyncio, "asyncio")
+        self.asyncio_pump = AsyncioPump(self, self.loop)
 
         self.model_node = None
         self.orbit_radius = 4
@@ -28,11 +29,6 @@ class OrbitViewer(ShowBase):
 
         self.prompt_manager = PromptManager()
 
-    def _poll_asyncio(self, task):
-        self.loop.stop()
-        self.loop.run_forever()
-        return task.cont
-
     def on_submit(self, text):
         prompt = text.strip()
         if not prompt:
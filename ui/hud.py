@@ -77,7 +77,7 @@ class HUD:
     def submit_prompt(self, text):
         print("📨 [HUD] submit_prompt chamado com:", text)
         self.close_prompt()
-        self.app.loop.create_task(self.app.placer.handle_prompt_submission(text))
+        self.app.handle_prompt_submission(text)
 
     def is_prompt_visible(self):
         return self.entry is not None